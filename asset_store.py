@@ -0,0 +1,152 @@
+# asset_store.py
+# Lazy asset decoding backed by an on-disk cache of converted / pre-scaled bitmaps
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+_MAGIC = b"CQRGBA1\0"
+_HEADER = struct.Struct("<II")
+
+
+def _asset_key(name: str) -> str:
+    # the whole relative path: themes/x/app_background.png and app_background.png
+    # share a stem, and one's stale sweep must not delete the other's variants
+    return hashlib.sha1(Path(name).as_posix().encode()).hexdigest()[:16]
+
+
+class AssetStore:
+    """Decodes PNGs only when asked, and keeps RGBA variants on disk.
+
+    Cached variants are raw RGBA (no zlib), so reading one back is a plain
+    file read + Image.frombytes instead of a PNG decode + convert + resize.
+    Variant names carry a signature of the source's mtime and size, so
+    editing an asset invalidates its old variants. Safe to call from worker
+    threads.
+    """
+
+    def __init__(self, assets_dir: Path, cache_dir: Path | None = None):
+        self.assets_dir = Path(assets_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._sources: dict[str, Image.Image] = {}
+        self._sigs: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                self.cache_dir = None  # read-only home etc. -> just decode every time
+
+    # ---------- sources ----------
+    def path(self, name: str) -> Path:
+        return self.assets_dir / name
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._sources
+
+    def source(self, name: str) -> Image.Image | None:
+        """Full-resolution RGBA image, decoded on first use."""
+        with self._lock:
+            img = self._sources.get(name)
+            if img is None:
+                p = self.path(name)
+                if not p.exists():
+                    return None
+                img = self._read_variant(name, 0, 0, None)
+                if img is None:
+                    img = Image.open(p).convert("RGBA")
+                    self._write_variant(name, 0, 0, None, img)
+                self._sources[name] = img
+            return img
+
+    # ---------- scaled variants ----------
+    def cached(self, name: str, w: int, h: int, resample=Image.BILINEAR) -> Image.Image | None:
+        """Only the on-disk variant (no decode); None on a cold cache."""
+        return self._read_variant(name, w, h, resample)
+
+    def scaled(self, name: str, w: int, h: int, resample=Image.BILINEAR) -> Image.Image | None:
+        img = self._read_variant(name, w, h, resample)
+        if img is not None:
+            return img
+
+        src = self.source(name)
+        if src is None:
+            return None
+        img = src if src.size == (w, h) else src.resize((w, h), resample)
+        self._write_variant(name, w, h, resample, img)
+        return img
+
+    # ---------- disk cache ----------
+    def _signature(self, name: str) -> str | None:
+        sig = self._sigs.get(name)
+        if sig is None:
+            try:
+                st = self.path(name).stat()
+            except OSError:
+                return None
+            raw = f"{name}:{st.st_mtime_ns}:{st.st_size}".encode()
+            sig = hashlib.sha1(raw).hexdigest()[:12]
+            self._sigs[name] = sig
+        return sig
+
+    def _variant_path(self, name: str, w: int, h: int, resample) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        sig = self._signature(name)
+        if sig is None:
+            return None
+        flt = "src" if resample is None else int(resample)
+        return self.cache_dir / f"{_asset_key(name)}@{sig}@{w}x{h}@{flt}.rgba"
+
+    def _read_variant(self, name, w, h, resample) -> Image.Image | None:
+        p = self._variant_path(name, w, h, resample)
+        if p is None:
+            return None
+        try:
+            data = p.read_bytes()
+        except OSError:
+            return None
+        if not data.startswith(_MAGIC):
+            return None
+        vw, vh = _HEADER.unpack_from(data, len(_MAGIC))
+        offset = len(_MAGIC) + _HEADER.size
+        if len(data) - offset != vw * vh * 4:
+            return None  # truncated, will be rewritten
+        return Image.frombytes("RGBA", (vw, vh), data[offset:])
+
+    def _write_variant(self, name, w, h, resample, img: Image.Image):
+        p = self._variant_path(name, w, h, resample)
+        if p is None:
+            return
+        tmp = None
+        try:
+            # temp file + rename so a reader never sees half a bitmap
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(_MAGIC)
+                f.write(_HEADER.pack(*img.size))
+                f.write(img.tobytes())
+            os.replace(tmp, p)
+        except OSError:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+            return
+        self._drop_stale(name, p.name.split("@")[1])
+
+    def _drop_stale(self, name: str, sig: str):
+        # variants made from an older version of this asset
+        for old in self.cache_dir.glob(f"{_asset_key(name)}@*.rgba"):
+            if old.name.split("@")[1] != sig:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
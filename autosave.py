@@ -0,0 +1,131 @@
+# autosave.py
+# Background autosave: edits are coalesced on the Tk thread, disk I/O happens on a writer thread
+
+import queue
+import threading
+
+from config import AUTOSAVE_INTERVAL_MS
+
+
+class Autosave:
+    """Saves the FileManager's list a little while after it changes.
+
+    Bursts of edits arm a single root.after timer. When it fires, the
+    FileManager hands over a SavePlan (cheap) and a writer thread does the
+    actual write. Plans that queue up while a write is in progress are
+    merged, so they share one write and one fsync. Nothing runs while the
+    list is idle.
+    """
+
+    def __init__(self, root, files, interval_ms: int = AUTOSAVE_INTERVAL_MS):
+        self.root = root
+        self.files = files
+        self.interval_ms = interval_ms
+        self.enabled = True
+        self.last_error: Exception | None = None
+
+        self._after_id = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self.attach(files)
+
+    def attach(self, files):
+        # switching storage backends (e.g. Save As into a database)
+        if self.files is not files:
+            self.files.on_change = None
+        self.files = files
+        files.on_change = self.touch
+
+    # ---------- Tk thread ----------
+    def touch(self):
+        # only lists that already have a file autosave (no surprise dialogs)
+        if not self.enabled or self.files.path is None:
+            return
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._fire)
+
+    def flush(self, path=None):
+        """Write everything now and wait for it (Save, Exit, close). Raises the write error, if any."""
+        self._cancel_timer()
+        if path is not None or self.files.path is not None:
+            self._submit(self.files.checkpoint(path))
+        self._queue.join()
+
+        err, self.last_error = self.last_error, None
+        if err is not None:
+            raise err
+
+    def write_later(self, writer, plan):
+        """Queue a plan of another writer (anything with write(plan)) behind the list's saves."""
+        self._submit(plan, writer)
+
+    def stop(self):
+        self._cancel_timer()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _fire(self):
+        self._after_id = None
+        if self.files.path is None:
+            return
+        try:
+            self._submit(self.files.checkpoint())
+        except ValueError:
+            pass
+
+    def _cancel_timer(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _submit(self, plan, writer=None):
+        if plan is None:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+        # the manager that took the plan writes it, even if Save As or a list
+        # switch attaches another one before the writer gets to it
+        self._queue.put((writer or self.files, plan))
+
+    # ---------- writer thread ----------
+    def _run(self):
+        while True:
+            plans = [self._queue.get()]
+            # grab whatever else piled up so it shares this write
+            while True:
+                try:
+                    plans.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in plans
+            try:
+                for files, plan in self._merge([p for p in plans if p is not None]):
+                    files.write(plan)
+            except Exception as e:
+                self.last_error = e
+            finally:
+                for _ in plans:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    @staticmethod
+    def _merge(plans):
+        # a snapshot already contains everything queued before it for that file;
+        # consecutive journal plans for the same file become one append
+        merged = []
+        for files, plan in plans:
+            if plan.kind == "snapshot":
+                merged = [(f, p) for f, p in merged
+                          if not (f is files and p.path == plan.path and p.list_id == plan.list_id)]
+            last = merged[-1][1] if merged and merged[-1][0] is files else None
+            if (last is not None and last.kind == "journal" and plan.kind == "journal"
+                    and last.path == plan.path and last.gen == plan.gen):
+                last.ops = last.ops + plan.ops
+            else:
+                merged.append((files, plan))
+        return merged
@@ -0,0 +1,354 @@
+# batch.py
+# Headless maintenance of saved lists (no Tk, no PIL): stats, merge, dedupe, filter, convert
+#
+#   python batch.py stats archive/                    per-list counts, then a total line
+#   python batch.py stats archive/ --json             the same as JSON lines
+#   python batch.py dedupe archive/ -o cleaned/       drop repeated tasks (in place without -o)
+#   python batch.py filter archive/ --drop completed  clear completed tasks, like Tools -> Clear Completed
+#   python batch.py convert archive/ --to markdown -o md/
+#   python batch.py merge a.cql b.md notes.txt -o all.cql --dedupe
+#
+# Directories are walked for --glob (default *.cql) and the files are spread
+# over a process pool (-j, default one per core). Each file is read and
+# written as a stream; results are printed as they come in.
+
+import argparse
+import csv
+import json
+import os
+import secrets
+import sqlite3
+import sys
+from itertools import chain
+from multiprocessing import Pool
+from pathlib import Path
+
+from exporter import export_rows
+from file_manager import FileManager, JOURNAL_SUFFIX, LIST_EXT, SavePlan
+from importer import guess_format, iter_tasks
+from sqlite_store import DB_EXT, SqliteFileManager
+
+# output formats by extension; .cql is our own list file
+OUTPUT_FORMATS = {
+    LIST_EXT: "cql",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".txt": "text",
+}
+FORMAT_EXTS = {"cql": LIST_EXT, "markdown": ".md", "csv": ".csv", "jsonl": ".jsonl", "text": ".txt"}
+CHUNKSIZE = 8  # files handed to a worker at a time
+SIDECARS = (JOURNAL_SUFFIX, "-wal", "-shm", "-journal")  # live next to a list, never lists themselves
+
+
+# ---------- reading / writing ----------
+def read_lists(path: Path):
+    """(title, rows) per list in the file; rows is an iterator of (text, done).
+
+    A .cql file is one list (snapshot + journal, so it goes through
+    FileManager.load); a database holds any number; anything else is
+    streamed through the importer's parsers.
+    """
+    suffix = path.suffix.lower()
+    if suffix == LIST_EXT:
+        tasks, _, _ = FileManager.load(path)
+        yield tasks.title, ((t.text, t.done) for t in tasks)
+    elif suffix == DB_EXT:
+        db = SqliteFileManager()
+        for list_id, title, *_ in db.lists(path):
+            pages = db.pages(path, list_id)
+            yield title, ((text, bool(done)) for page in pages for _, text, done in page)
+    else:
+        yield read_title(path), iter_tasks(path)
+
+
+def read_title(path: Path) -> str:
+    """Title from the header our exporter writes (first two lines), else the file name."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            first, second = f.readline().rstrip("\r\n"), f.readline().rstrip("\r\n")
+    except OSError:
+        return path.stem
+    fmt = guess_format(path)
+    if fmt == "markdown" and first.startswith("# "):
+        return first[2:].strip()
+    if fmt == "text" and first.strip() and second and set(second) == {"="}:
+        return first.strip()
+    if fmt == "csv" and second:
+        return next(csv.reader([second]), [""])[0] or path.stem
+    if fmt == "jsonl":
+        try:
+            header = json.loads(first)
+        except ValueError:
+            header = None
+        if isinstance(header, dict) and isinstance(header.get("list"), str):
+            return header["list"]
+    return path.stem
+
+
+def write_list(path: Path, title: str, rows, fmt: str):
+    """Stream rows into path in fmt; .cql output is a fresh snapshot with an empty journal."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "cql":
+        plan = SavePlan(
+            "snapshot", path, secrets.token_hex(4), title=title,
+            rows=((slot, text, done) for slot, (text, done) in enumerate(rows)),
+        )
+        FileManager().write(plan, fsync=False)
+    else:
+        export_rows(path, rows, title, fmt)
+
+
+def dedupe_key(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def deduped(rows, seen: dict | None = None):
+    """First copy of each task, in order; it counts as done if any copy was."""
+    seen = {} if seen is None else seen
+    for text, done in rows:
+        key = dedupe_key(text)
+        row = seen.get(key)
+        if row is None:
+            seen[key] = [text, done]
+        elif done:
+            row[1] = True
+    return ((text, done) for text, done in seen.values())
+
+
+class _Counter:
+    """Passes rows through, counting what went in."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.n = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.n += 1
+            yield row
+
+
+# ---------- per-file workers (run in the pool) ----------
+def stats_one(job):
+    path, _ = job
+    out = []
+    try:
+        if path.suffix.lower() == DB_EXT:
+            # counts straight from the database, no rows read
+            for _, title, _, n, done in SqliteFileManager().lists(path):
+                out.append({"path": str(path), "title": title, "tasks": n, "done": done})
+        else:
+            for title, rows in read_lists(path):
+                n = done = 0
+                for _, d in rows:
+                    n += 1
+                    done += d
+                out.append({"path": str(path), "title": title, "tasks": n, "done": done})
+    except (OSError, ValueError, sqlite3.Error) as e:
+        return [{"path": str(path), "error": str(e)}]
+    return out
+
+
+def output_format(path: Path, op: str, arg) -> str | None:
+    return arg if op == "convert" else OUTPUT_FORMATS.get(path.suffix.lower())
+
+
+def output_path(rel, out_dir, fmt: str, n: int | None = None) -> Path:
+    """Where -o puts rel; n numbers the lists of a database (one file each)."""
+    rel = Path(rel)
+    name = f"{rel.stem}.{n}" if n is not None else rel.stem
+    return Path(out_dir) / rel.parent / (name + FORMAT_EXTS[fmt])
+
+
+def rewrite_one(job):
+    """dedupe / filter / convert one file; job = (path, rel, op, arg, out_dir, clash).
+
+    clash is the earlier input that already writes this file's output, if any.
+    """
+    path, rel, op, arg, out_dir, clash = job
+    try:
+        if clash is not None:
+            raise ValueError(f"output {output_path(rel, out_dir, output_format(path, op, arg) or 'cql')}"
+                             f" is already written for {clash}")
+        multi = path.suffix.lower() == DB_EXT
+        results = []
+        for i, (title, rows) in enumerate(read_lists(path)):
+            counted = _Counter(rows)
+            if op == "dedupe":
+                rows = deduped(counted)
+            elif op == "filter":
+                drop = arg == "completed"
+                rows = ((t, d) for t, d in counted if d != drop)
+            else:
+                rows = counted
+
+            fmt = output_format(path, op, arg)
+            if out_dir is None:
+                if fmt is None or multi:
+                    raise ValueError(f"can't rewrite {path.suffix} files in place, use -o")
+                target = path
+            else:
+                fmt = fmt or "cql"
+                target = output_path(rel, out_dir, fmt, i + 1 if multi else None)
+
+            kept = _Counter(rows)
+            write_list(target, title, kept, fmt)
+            results.append({"path": str(path), "out": str(target), "title": title,
+                            "read": counted.n, "written": kept.n})
+        return results
+    except (OSError, ValueError, sqlite3.Error) as e:
+        return [{"path": str(path), "error": str(e)}]
+
+
+def read_one(job):
+    """merge: one file's rows, materialized to send back to the parent."""
+    path, _ = job
+    try:
+        return [(title, list(rows)) for title, rows in read_lists(path)], None
+    except (OSError, ValueError, sqlite3.Error) as e:
+        return [], f"{path}: {e}"
+
+
+# ---------- driver ----------
+def expand(paths, pattern: str):
+    """(file, path relative to the argument it came from), walking directories lazily."""
+    for arg in paths:
+        arg = Path(arg)
+        if arg.is_dir():
+            for path in sorted(arg.rglob(pattern)):
+                if path.is_file() and not path.name.endswith(SIDECARS):
+                    yield path, path.relative_to(arg)
+        else:
+            yield arg, Path(arg.name)
+
+
+def run_pool(fn, jobs, workers: int):
+    """fn over jobs in input order, streamed; inline when one worker is enough."""
+    if workers <= 1:
+        yield from map(fn, jobs)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(fn, jobs, chunksize=CHUNKSIZE)
+
+
+def cmd_stats(args) -> int:
+    errors = 0
+    total = {"files": 0, "lists": 0, "tasks": 0, "done": 0}
+    for results in run_pool(stats_one, expand(args.paths, args.glob), args.jobs):
+        total["files"] += 1
+        for r in results:
+            if "error" in r:
+                errors += 1
+                print(f"{r['path']}: {r['error']}", file=sys.stderr)
+                continue
+            total["lists"] += 1
+            total["tasks"] += r["tasks"]
+            total["done"] += r["done"]
+            if args.json:
+                print(json.dumps(dict(r, pending=r["tasks"] - r["done"]), ensure_ascii=False))
+            else:
+                print(f"{r['tasks']:>8} {r['done']:>8} {r['tasks'] - r['done']:>8}  {r['path']}  {r['title']}")
+    total["pending"] = total["tasks"] - total["done"]
+    if args.json:
+        print(json.dumps(dict(total, total=True)))
+    else:
+        print(f"{total['tasks']:>8} {total['done']:>8} {total['pending']:>8}  "
+              f"total ({total['lists']} lists in {total['files']} files)")
+    return 1 if errors else 0
+
+
+def cmd_rewrite(args, op: str, arg) -> int:
+    out_dir = args.out
+    claimed = {}  # output file -> input writing it; r.md and r.txt both convert to r.csv
+
+    def jobs():
+        for path, rel in expand(args.paths, args.glob):
+            clash = None
+            if out_dir is not None and path.suffix.lower() != DB_EXT:
+                target = output_path(rel, out_dir, output_format(path, op, arg) or "cql")
+                clash = claimed.setdefault(target, str(path))
+                clash = clash if clash != str(path) else None
+            yield path, rel, op, arg, out_dir, clash
+
+    errors = 0
+    for results in run_pool(rewrite_one, jobs(), args.jobs):
+        for r in results:
+            if "error" in r:
+                errors += 1
+                print(f"{r['path']}: {r['error']}", file=sys.stderr)
+            elif not args.quiet:
+                print(f"{r['read']:>8} -> {r['written']:<8} {r['out']}")
+    return 1 if errors else 0
+
+
+def cmd_merge(args) -> int:
+    out = Path(args.out)
+    fmt = args.to or OUTPUT_FORMATS.get(out.suffix.lower(), "cql")
+    errors = []
+    titles = []
+
+    def rows():
+        # pool workers parse; rows stream into the output in argument order
+        for lists, error in run_pool(read_one, expand(args.paths, args.glob), args.jobs):
+            if error:
+                errors.append(error)
+                print(error, file=sys.stderr)
+            for title, list_rows in lists:
+                titles.append(title)
+                yield from list_rows
+
+    merged = iter(deduped(rows()) if args.dedupe else rows())
+    first = next(merged, None)  # reads the first list, so its title is known
+    title = args.title or (titles[0] if titles else out.stem)
+    write_list(out, title, chain([first] if first else [], merged), fmt)
+    if not args.quiet:
+        print(f"{len(titles)} lists -> {out}")
+    return 1 if errors else 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Checklist Quest batch tools (no GUI)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", type=Path, help="list files or directories")
+    common.add_argument("--glob", default="*" + LIST_EXT, help="files to pick up inside directories")
+    common.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    common.add_argument("-q", "--quiet", action="store_true")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stats", parents=[common], help="task / done / pending counts")
+    p.add_argument("--json", action="store_true", help="JSON lines instead of a table")
+
+    p = sub.add_parser("dedupe", parents=[common], help="drop repeated tasks")
+    p.add_argument("-o", "--out", type=Path, help="write here instead of in place")
+
+    p = sub.add_parser("filter", parents=[common], help="drop completed (or pending) tasks")
+    p.add_argument("--drop", choices=("completed", "pending"), default="completed")
+    p.add_argument("-o", "--out", type=Path, help="write here instead of in place")
+
+    p = sub.add_parser("convert", parents=[common], help="convert between list formats")
+    p.add_argument("--to", choices=tuple(FORMAT_EXTS), required=True)
+    p.add_argument("-o", "--out", type=Path, required=True, help="output directory")
+
+    p = sub.add_parser("merge", parents=[common], help="merge lists into one file")
+    p.add_argument("-o", "--out", type=Path, required=True, help="output file")
+    p.add_argument("--to", choices=tuple(FORMAT_EXTS), help="output format (default: by extension)")
+    p.add_argument("--title")
+    p.add_argument("--dedupe", action="store_true")
+
+    args = ap.parse_args(argv)
+    if args.command == "stats":
+        return cmd_stats(args)
+    if args.command == "merge":
+        return cmd_merge(args)
+    if args.command == "dedupe":
+        return cmd_rewrite(args, "dedupe", None)
+    if args.command == "filter":
+        return cmd_rewrite(args, "filter", args.drop)
+    return cmd_rewrite(args, "convert", args.to)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+# bench.py
+# Drives ChecklistUI through its hot paths and reports timings as JSON
+#
+#   python bench.py                      run, print JSON, compare to bench_baseline.json if present
+#   python bench.py --save-baseline      run and store the result as the new baseline
+#   python bench.py --tasks 20000 --out result.json
+#
+# Needs a display. On Linux without $DISPLAY it starts Xvfb if it is installed.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+BASELINE = Path(__file__).parent / "bench_baseline.json"
+TOLERANCE = 0.25   # flag anything more than 25% slower / bigger than the baseline
+NOISE_MS = 0.05    # ignore differences below this, timer noise on tiny ops
+
+
+# ---------- display ----------
+def ensure_display():
+    """Returns an Xvfb process we started (or None if a display is already there)."""
+    if os.name == "nt" or sys.platform == "darwin" or os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        sys.exit("bench: no $DISPLAY and Xvfb is not installed")
+    display = ":%d" % (90 + os.getpid() % 100)
+    proc = subprocess.Popen(
+        [xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.environ["DISPLAY"] = display
+    # wait for the server socket instead of sleeping a fixed time
+    sock = Path("/tmp/.X11-unix") / ("X" + display[1:])
+    deadline = time.monotonic() + 10
+    while not sock.exists():
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            sys.exit("bench: Xvfb did not start")
+        time.sleep(0.05)
+    return proc
+
+
+# ---------- stats ----------
+def percentile(sorted_ms, p):
+    if not sorted_ms:
+        return 0.0
+    k = (len(sorted_ms) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_ms) - 1)
+    return sorted_ms[lo] + (sorted_ms[hi] - sorted_ms[lo]) * (k - lo)
+
+
+def summarize(samples_s):
+    ms = sorted(s * 1000.0 for s in samples_s)
+    return {
+        "n": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 4) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+        "max_ms": round(ms[-1], 4) if ms else 0.0,
+    }
+
+
+class Case:
+    """Collects samples for one scenario plus its Python heap peak."""
+
+    def __init__(self, name):
+        self.name = name
+        self.ops = []
+        self.frames = []
+
+    def __enter__(self):
+        gc.collect()
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        _, self.peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return False
+
+    def result(self):
+        out = {"ops": summarize(self.ops), "mem_peak_kb": round(self.peak / 1024)}
+        if self.frames:
+            out["frames"] = summarize(self.frames)
+        return out
+
+
+def timed(samples, fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    samples.append(time.perf_counter() - t0)
+
+
+# ---------- harness ----------
+def make_ui():
+    import tkinter as tk
+    from ui_main import ChecklistUI
+
+    root = tk.Tk()
+    ui = ChecklistUI(root)
+    settle(root, ui)
+    return root, ui
+
+
+def settle(root, ui):
+    root.update_idletasks()
+    ui.scheduler.flush()
+    root.update()
+
+
+def frame(root, ui, samples):
+    """Times one scheduler flush, i.e. the frame the previous events asked for."""
+    root.update_idletasks()  # apply geometry so winfo_* sees the new size
+    timed(samples, ui.scheduler.flush)
+
+
+def close(root, ui):
+    ui._close()
+
+
+def fill(ui, n):
+    ui.files.begin_bulk()
+    try:
+        for i in range(n):
+            ui.tasks.add(f"benchmark task {i}")
+    finally:
+        ui.files.end_bulk()
+    ui._invalidate_rows()
+    ui.scheduler.mark("list")
+
+
+def bench_startup(runs):
+    cold, warm = Case("cold_start"), Case("warm_start")
+    # the first construction decodes art into an empty asset cache, later ones hit it
+    for i in range(runs):
+        case = cold if i == 0 else warm
+        with case:
+            t0 = time.perf_counter()
+            root, ui = make_ui()
+            case.ops.append(time.perf_counter() - t0)
+        close(root, ui)
+    return [cold, warm]
+
+
+def bench_resize(frames, events_per_frame):
+    root, ui = make_ui()
+    case = Case("resize_storm")
+    with case:
+        for f in range(frames):
+            w = 600 + (f * 37) % 400
+            h = 800 + (f * 23) % 200
+            root.geometry(f"{w}x{h}")
+            for _ in range(events_per_frame):
+                ev = SimpleNamespace(widget=root, width=w, height=h)
+                timed(case.ops, ui._on_resize, ev)
+                ev = SimpleNamespace(widget=ui.canvas, width=w, height=h - ui.title_height)
+                timed(case.ops, ui._on_canvas_resize, ev)
+            frame(root, ui, case.frames)
+    close(root, ui)
+    return [case]
+
+
+def bench_add(n):
+    root, ui = make_ui()
+    case = Case("bulk_add")
+    with case:
+        for i in range(n):
+            ui.new_item_var.set(f"added task {i}")
+            timed(case.ops, ui._add_item_from_bar)
+            if i % 50 == 49:
+                frame(root, ui, case.frames)
+    close(root, ui)
+    return [case]
+
+
+def bench_toggle(n, tasks):
+    root, ui = make_ui()
+    fill(ui, tasks)
+    settle(root, ui)
+    visible = max(1, ui._rows_fit())
+    case = Case("toggle_storm")
+    with case:
+        for i in range(n):
+            timed(case.ops, ui._toggle_item, i % visible)
+            if i % 20 == 19:
+                frame(root, ui, case.frames)
+    close(root, ui)
+    return [case]
+
+
+def bench_edit(n, tasks):
+    root, ui = make_ui()
+    fill(ui, tasks)
+    settle(root, ui)
+    visible = max(1, ui._rows_fit())
+    case = Case("edit_commit")
+    with case:
+        for i in range(n):
+            slot = i % visible
+            ui._start_edit_item(slot)
+            ui._editor.delete(0, "end")
+            ui._editor.insert(0, f"edited task {i}")
+            timed(case.ops, ui._finish_edit_item, slot)
+            frame(root, ui, case.frames)
+    close(root, ui)
+    return [case]
+
+
+def run(args):
+    cases = []
+    cases += bench_startup(args.starts)
+    cases += bench_resize(args.frames, args.events)
+    cases += bench_add(args.adds)
+    cases += bench_toggle(args.toggles, args.tasks)
+    cases += bench_edit(args.edits, args.tasks)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tasks": args.tasks,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": {c.name: c.result() for c in cases},
+    }
+
+
+# ---------- baseline ----------
+def compare(result, baseline, tolerance=TOLERANCE):
+    """Lists metrics that got worse than baseline by more than tolerance."""
+    worse = []
+    for name, case in result["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        for group in ("ops", "frames"):
+            if group not in case or group not in base:
+                continue
+            for key in ("p50_ms", "p95_ms"):
+                new, old = case[group][key], base[group][key]
+                if new - old > NOISE_MS and new > old * (1 + tolerance):
+                    worse.append(f"{name}.{group}.{key}: {old:.3f} -> {new:.3f}")
+        new, old = case["mem_peak_kb"], base.get("mem_peak_kb", 0)
+        if old and new > old * (1 + tolerance):
+            worse.append(f"{name}.mem_peak_kb: {old} -> {new}")
+    return worse
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Checklist Quest UI benchmarks")
+    ap.add_argument("--tasks", type=int, default=10000, help="list size for toggle/edit runs")
+    ap.add_argument("--starts", type=int, default=5)
+    ap.add_argument("--frames", type=int, default=60)
+    ap.add_argument("--events", type=int, default=20, help="resize events per frame")
+    ap.add_argument("--adds", type=int, default=2000)
+    ap.add_argument("--toggles", type=int, default=2000)
+    ap.add_argument("--edits", type=int, default=300)
+    ap.add_argument("--out", type=Path, help="also write the JSON here")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = ap.parse_args(argv)
+
+    xvfb = ensure_display()
+    # start from an empty asset cache so cold_start really is cold
+    cache = tempfile.mkdtemp(prefix="cq-bench-")
+    os.environ["CHECKLIST_QUEST_CACHE"] = cache
+    # and keep benchmark check-offs out of the real XP / timer files
+    os.environ["CHECKLIST_QUEST_DATA"] = os.path.join(cache, "data")
+    try:
+        result = run(args)
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+        if xvfb is not None:
+            xvfb.terminate()
+
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if args.baseline.exists():
+        worse = compare(result, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in worse:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if worse else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
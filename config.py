@@ -0,0 +1,44 @@
+# config.py
+# constants, paths, defaults
+
+import os
+from pathlib import Path
+
+APP_NAME = "Checklist Quest"
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+DEFAULT_WIDTH = 600
+DEFAULT_HEIGHT = 800
+
+
+def _user_cache_dir() -> Path:
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "checklist_quest"
+
+
+def _user_data_dir() -> Path:
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming"
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "checklist_quest"
+
+
+# pre-converted / pre-scaled asset variants live here (safe to delete)
+CACHE_DIR = Path(os.environ.get("CHECKLIST_QUEST_CACHE", _user_cache_dir()))
+ASSET_CACHE_DIR = CACHE_DIR / "assets"
+
+# app state that is not part of a list file (running timers, ...)
+DATA_DIR = Path(os.environ.get("CHECKLIST_QUEST_DATA", _user_data_dir()))
+TIMERS_PATH = DATA_DIR / "timers.json"
+WORKSPACE_PATH = DATA_DIR / "workspace.json"
+
+# autosave: wait this long after the last edit before writing
+AUTOSAVE_INTERVAL_MS = 2000
+
+# set CHECKLIST_QUEST_PROFILE=1 to instrument hot paths from startup (see perf.py)
+PROFILE = os.environ.get("CHECKLIST_QUEST_PROFILE", "") not in ("", "0")
@@ -0,0 +1,194 @@
+# exporter.py
+# Streaming export: rows are handed over in chunks and written by a worker thread
+
+import csv
+import io
+import json
+import queue
+import threading
+from pathlib import Path
+
+from file_manager import atomic_write
+
+CHUNK_ROWS = 5000
+QUEUE_CHUNKS = 4
+
+FORMATS = ("markdown", "csv", "jsonl", "text")
+_EXT_FORMATS = {
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".txt": "text",
+}
+EXPORT_FORMAT_TAG = "checklist-quest-export"
+
+WHICH = ("all", "completed", "pending")
+
+
+def guess_format(path) -> str:
+    return _EXT_FORMATS.get(Path(path).suffix.lower(), "text")
+
+
+def wanted(done: bool, which: str) -> bool:
+    if which == "completed":
+        return done
+    if which == "pending":
+        return not done
+    return True
+
+
+# ---------- formatters: header(title) -> str, chunk(rows) -> str ----------
+def markdown_header(title: str) -> str:
+    return f"# {title}\n\n"
+
+
+def markdown_chunk(rows) -> str:
+    return "".join(f"- [{'x' if done else ' '}] {text}\n" for text, done in rows)
+
+
+def csv_header(title: str) -> str:
+    return _csv_rows([("list", "task", "done")])
+
+
+def csv_chunk(rows, title: str = "") -> str:
+    return _csv_rows((title, text, "x" if done else "") for text, done in rows)
+
+
+def _csv_rows(rows) -> str:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue()
+
+
+def jsonl_header(title: str) -> str:
+    return json.dumps({"format": EXPORT_FORMAT_TAG, "list": title}, ensure_ascii=False) + "\n"
+
+
+def jsonl_chunk(rows) -> str:
+    # only the text needs escaping; skip building a dict per row
+    dumps = json.dumps
+    return "".join(
+        f'{{"text": {dumps(text, ensure_ascii=False)}, "done": {"true" if done else "false"}}}\n'
+        for text, done in rows
+    )
+
+
+def text_header(title: str) -> str:
+    return f"{title}\n{'=' * len(title)}\n\n"
+
+
+def text_chunk(rows) -> str:
+    return "".join(f"[{'x' if done else ' '}] {text}\n" for text, done in rows)
+
+
+def formatter(fmt: str, title: str):
+    """(header str, chunk fn) for a format."""
+    if fmt == "markdown":
+        return markdown_header(title), markdown_chunk
+    if fmt == "csv":
+        return csv_header(title), lambda rows: csv_chunk(rows, title)
+    if fmt == "jsonl":
+        return jsonl_header(title), jsonl_chunk
+    if fmt == "text":
+        return text_header(title), text_chunk
+    raise ValueError(f"unknown export format {fmt!r}")
+
+
+def export_rows(path, rows, title: str, fmt: str | None = None, which: str = "all"):
+    """Write an iterable of (text, done) straight to path (no threads; CLI / tests)."""
+    header, chunk = formatter(fmt or guess_format(path), title)
+
+    def chunks():
+        yield header
+        buf = []
+        for text, done in rows:
+            if wanted(done, which):
+                buf.append((text, done))
+                if len(buf) >= CHUNK_ROWS:
+                    yield chunk(buf)
+                    buf = []
+        if buf:
+            yield chunk(buf)
+
+    atomic_write(path, chunks(), fsync=False)
+
+
+# ---------- background job ----------
+class ExportJob:
+    """Writer thread for one export.
+
+    The Tk side walks the list a chunk at a time (TaskList.rows) and offers
+    each chunk; the queue only holds a few, so memory stays flat however
+    long the list is. Output goes to a temp file that replaces the target
+    only when the export completes.
+    """
+
+    def __init__(self, path, title: str, fmt: str | None = None, which: str = "all"):
+        self.path = Path(path)
+        self.fmt = fmt or guess_format(path)
+        self.which = which
+        self.exported = 0
+        self.error: Exception | None = None
+        self.done = False
+
+        self._header, self._chunk = formatter(self.fmt, title)
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+        self.offer(None)  # wake the writer if it is waiting for rows
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def offer(self, rows) -> bool:
+        """Hand over a chunk of (text, done) rows, or None at the end. False = full, retry later."""
+        try:
+            self._queue.put_nowait(rows)
+            return True
+        except queue.Full:
+            return False
+
+    def _chunks(self):
+        yield self._header
+        while True:
+            rows = self._queue.get()
+            # before the end check: cancel() sends None too, and ending
+            # normally would rename the partial file over the target
+            if self._cancel.is_set():
+                raise _Cancelled()
+            if rows is None:
+                return
+            rows = [r for r in rows if wanted(r[1], self.which)]
+            if rows:
+                self.exported += len(rows)
+                yield self._chunk(rows)
+
+    def _run(self):
+        try:
+            atomic_write(self.path, self._chunks(), fsync=False)
+        except _Cancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            # unblock the Tk side if it is still offering
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+
+class _Cancelled(Exception):
+    pass
@@ -0,0 +1,359 @@
+# file_manager.py
+# save/open logic: snapshot + append-only journal, so saving costs what changed
+
+import json
+import os
+import secrets
+import tempfile
+from pathlib import Path
+
+from tasks import TaskList
+
+FORMAT = "checklist-quest"
+VERSION = 1
+LIST_EXT = ".cql"
+JOURNAL_SUFFIX = ".journal"
+
+# compact once the journal holds this many ops per live task (plus a floor)
+COMPACT_RATIO = 1.0
+COMPACT_MIN_OPS = 2000
+
+
+class FileFormatError(ValueError):
+    pass
+
+
+def journal_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+def atomic_write(path, chunks, fsync: bool = True):
+    """Write an iterable of str chunks to path via temp file + rename."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def read_json(path) -> dict | None:
+    """A small JSON state file as a dict; None if it is missing or damaged."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_json(path, data: dict):
+    """Replace a small JSON state file atomically (no fsync: losing it is harmless)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, [json.dumps(data, separators=(",", ":"))], fsync=False)
+
+
+def _is_slot(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _valid_op(op) -> bool:
+    """A journal line with the fields apply() needs for its kind."""
+    if not isinstance(op, dict):
+        return False
+    kind = op.get("op")
+    if kind in ("add", "edit"):
+        return _is_slot(op.get("slot")) and isinstance(op.get("text"), str)
+    if kind == "done":
+        return _is_slot(op.get("slot")) and "value" in op
+    if kind == "del":
+        return _is_slot(op.get("slot"))
+    if kind == "title":
+        return isinstance(op.get("text"), str)
+    return kind in ("clear_done", "compact", "reset")
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class SavePlan:
+    """Everything a write needs, captured on the Tk thread so the I/O can run anywhere."""
+
+    __slots__ = ("kind", "path", "gen", "ops", "title", "rows", "list_id")
+
+    def __init__(self, kind: str, path: Path, gen: str, ops=None, title=None, rows=None,
+                 list_id=None):
+        self.kind = kind      # "snapshot" or "journal"
+        self.path = path
+        self.gen = gen        # plans only merge when path + gen match
+        self.ops = ops        # journal: list of op dicts
+        self.title = title    # snapshot: title + (slot, text, done) rows
+        self.rows = rows
+        self.list_id = list_id  # database backends: which list in the file
+
+
+class FileManager:
+    """Storage engine for one open list.
+
+    A list on disk is a snapshot (<name>.cql, JSON lines: header + one line
+    per task) plus a journal (<name>.cql.journal) of ops since that snapshot.
+    The manager subscribes to the TaskList and buffers ops; save() appends
+    only the buffer to the journal. When the journal grows past the list
+    size it is folded into a fresh snapshot. Every journal line carries the
+    snapshot's generation, so a crash between "write snapshot" and
+    "truncate journal" can't replay old ops twice.
+    """
+
+    def __init__(self, tasks: TaskList | None = None, path=None):
+        self.tasks = None
+        self.path: Path | None = None
+        self._gen = None
+        self._journal_ops = 0
+        self._pending: list[dict] = []
+        self._needs_snapshot = True
+        self._bulk = 0
+        self.on_change = None  # optional callback, e.g. autosave
+        self.attach(tasks if tasks is not None else TaskList(), path)
+
+    # ---------- state ----------
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending) or (self._needs_snapshot and len(self.tasks) > 0)
+
+    def attach(self, tasks: TaskList, path=None, gen=None, journal_ops: int = 0):
+        self.detach()
+        self.tasks = tasks
+        self.path = Path(path) if path is not None else None
+        self._gen = gen
+        self._journal_ops = journal_ops
+        self._pending = []
+        self._needs_snapshot = gen is None
+        tasks.subscribe(self._on_change)
+
+    def detach(self):
+        if self.tasks is not None:
+            self.tasks.unsubscribe(self._on_change)
+
+    def begin_bulk(self):
+        """Stop buffering ops (e.g. during a huge import); the next save writes a snapshot."""
+        self._bulk += 1
+        self._needs_snapshot = True
+        self._pending = []
+
+    def end_bulk(self):
+        self._bulk = max(0, self._bulk - 1)
+
+    # ---------- File menu ----------
+    def new(self, title: str | None = None) -> TaskList:
+        tasks = TaskList() if title is None else TaskList(title)
+        self.attach(tasks)
+        return tasks
+
+    def open(self, path) -> TaskList:
+        tasks, gen, ops = self.load(path)
+        self.attach(tasks, path, gen, ops)
+        return tasks
+
+    def save(self, path=None):
+        """Save to path (Save As) or the current path; incremental when possible."""
+        plan = self.checkpoint(path)
+        if plan is not None:
+            self.write(plan)
+
+    def compact(self):
+        """Fold everything into a fresh snapshot and empty the journal."""
+        self.write(self.checkpoint(compact=True))
+
+    def checkpoint(self, path=None, compact: bool = False) -> SavePlan | None:
+        """Take what needs saving (cheap, Tk thread); None if nothing changed.
+
+        Journal plans just take the op buffer. Snapshot plans copy the rows as
+        tuples, which is the only O(n) step and only happens on Save As or
+        compaction.
+        """
+        if path is not None and Path(path) != self.path:
+            self.path = Path(path)
+            self._needs_snapshot = True
+        if self.path is None:
+            raise ValueError("no path to save to")
+
+        if compact or self._needs_snapshot or self._should_compact():
+            gen = secrets.token_hex(4)
+            rows = [(t.slot, t.text, t.done) for t in self.tasks]
+            plan = SavePlan("snapshot", self.path, gen, title=self.tasks.title, rows=rows)
+            self._gen = gen
+            self._journal_ops = 0
+            self._pending = []
+            self._needs_snapshot = False
+            return plan
+
+        if not self._pending:
+            return None
+        plan = SavePlan("journal", self.path, self._gen, ops=self._pending)
+        self._journal_ops += len(self._pending)
+        self._pending = []
+        return plan
+
+    def write(self, plan: SavePlan, fsync: bool = True):
+        """Do the I/O for a plan. Touches no TaskList state, so any thread may call it."""
+        try:
+            if plan.kind == "snapshot":
+                atomic_write(plan.path, self._snapshot_chunks(plan), fsync)
+                atomic_write(journal_path(plan.path), (), fsync)
+            else:
+                self._append_journal(plan, fsync)
+        except BaseException:
+            # ops in the plan are gone from the buffer: rewrite in full next time
+            if plan.path == self.path:
+                self._needs_snapshot = True
+            raise
+
+    # ---------- loading ----------
+    @classmethod
+    def load(cls, path) -> tuple[TaskList, str, int]:
+        """Read snapshot + journal tail; returns (tasks, generation, journal op count)."""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            header = cls._read_header(f.readline(), path)
+            tasks = TaskList(header.get("title", ""))
+            for lineno, line in enumerate(f, 2):
+                if not line.strip():
+                    continue
+                row = cls._read_row(line, path, lineno)
+                task = tasks.put(row["slot"], row["text"])
+                if task is not None and row.get("done"):
+                    tasks.set_done(task.slot, True)
+
+        gen = header["gen"]
+        ops = 0
+        jp = journal_path(path)
+        if jp.exists():
+            with open(jp, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from a crash mid-append
+                    if not _valid_op(op):
+                        break  # not something we wrote; nothing after it can be trusted
+                    if op.get("gen") != gen:
+                        continue  # already folded into the snapshot
+                    cls.apply(tasks, op)
+                    ops += 1
+        return tasks, gen, ops
+
+    @staticmethod
+    def _read_header(line: str, path) -> dict:
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != FORMAT:
+            raise FileFormatError(f"{path} is not a checklist file")
+        if header.get("version", 0) > VERSION:
+            raise FileFormatError(f"{path} was saved by a newer version")
+        if not isinstance(header.get("gen"), str) or not isinstance(header.get("title", ""), str):
+            raise FileFormatError(f"{path} has a damaged header")
+        return header
+
+    @staticmethod
+    def _read_row(line: str, path, lineno: int) -> dict:
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if (not isinstance(row, dict) or not _is_slot(row.get("slot"))
+                or not isinstance(row.get("text"), str)):
+            raise FileFormatError(f"{path} line {lineno} is not a task")
+        return row
+
+    @staticmethod
+    def apply(tasks: TaskList, op: dict):
+        kind = op["op"]
+        if kind in ("add", "edit"):
+            tasks.put(op["slot"], op["text"])
+        elif kind == "done":
+            if tasks.get(op["slot"]) is not None:
+                tasks.set_done(op["slot"], op["value"])
+        elif kind == "del":
+            if tasks.get(op["slot"]) is not None:
+                tasks.remove(op["slot"])
+        elif kind == "clear_done":
+            tasks.clear_completed()
+        elif kind == "compact":
+            tasks.compact()
+        elif kind == "title":
+            tasks.title = op["text"]
+        elif kind == "reset":
+            tasks.clear()
+
+    # ---------- internals ----------
+    def _on_change(self, op: str, slot, value):
+        self._record(op, slot, value)
+        if self.on_change is not None:
+            self.on_change()
+
+    def _record(self, op: str, slot, value):
+        if self._bulk:
+            return  # begin_bulk already forced a snapshot
+        if op == "restore":
+            # undo of a compacting clear touches most rows; a snapshot is smaller than the ops
+            self._needs_snapshot = True
+            self._pending = []
+            return
+        if op in ("add", "edit", "title"):
+            entry = {"op": op, "slot": slot, "text": value}
+        elif op == "done":
+            entry = {"op": op, "slot": slot, "value": value}
+        else:
+            entry = {"op": op, "slot": slot}
+
+        # typing into the title / re-editing or re-toggling a row: keep only the latest value
+        last = self._pending[-1] if self._pending else None
+        if (last is not None and op in ("edit", "title", "done")
+                and last["op"] == op and last["slot"] == slot):
+            last.update(entry)
+        else:
+            self._pending.append(entry)
+
+    def _should_compact(self) -> bool:
+        ops = self._journal_ops + len(self._pending)
+        return ops > max(COMPACT_MIN_OPS, COMPACT_RATIO * len(self.tasks))
+
+    @staticmethod
+    def _append_journal(plan: SavePlan, fsync: bool = True):
+        with open(journal_path(plan.path), "a", encoding="utf-8", newline="\n") as f:
+            f.write("".join(_dumps(dict(op, gen=plan.gen)) + "\n" for op in plan.ops))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _snapshot_chunks(plan: SavePlan):
+        yield _dumps({
+            "format": FORMAT,
+            "version": VERSION,
+            "gen": plan.gen,
+            "title": plan.title,
+        }) + "\n"
+
+        # buffer lines so a big list is written in a few large chunks
+        buf = []
+        for slot, text, done in plan.rows:
+            buf.append(_dumps({"slot": slot, "text": text, "done": done}))
+            if len(buf) >= 1024:
+                yield "\n".join(buf) + "\n"
+                buf = []
+        if buf:
+            yield "\n".join(buf) + "\n"
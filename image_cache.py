@@ -0,0 +1,64 @@
+# image_cache.py
+# LRU cache of scaled PhotoImages so common window sizes don't get resampled twice
+
+from collections import OrderedDict
+
+DEFAULT_BUCKET_PX = 8
+DEFAULT_MAX_BYTES = 96 * 1024 * 1024  # RGBA bitmaps add up fast on big monitors
+
+
+def bucket(n: int, step: int = DEFAULT_BUCKET_PX) -> int:
+    # round up so the bitmap always covers the target area
+    if step <= 1:
+        return max(1, n)
+    return max(step, ((n + step - 1) // step) * step)
+
+
+class ScaledImageCache:
+    """PhotoImages keyed by (asset, bucketed w, h, resample), LRU-evicted by bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, bucket_px: int = DEFAULT_BUCKET_PX):
+        self.max_bytes = max_bytes
+        self.bucket_px = bucket_px
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, asset: str, w: int, h: int, resample, exact: bool = False) -> tuple:
+        # only width is bucketed; height is usually fixed (tab bar) or snaps with it
+        step = 1 if exact else self.bucket_px
+        return (asset, bucket(w, step), max(1, h), resample)
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple, photo, nbytes: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self._entries[key] = (photo, nbytes)
+        self.bytes_used += nbytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _evict(self):
+        # never evict the newest entry; callers also keep the on-screen image referenced
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.bytes_used -= nbytes
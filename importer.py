@@ -0,0 +1,264 @@
+# importer.py
+# Streaming import of big task dumps: parse on a worker thread, insert on the Tk thread in batches
+
+import csv
+import json
+import queue
+import re
+import threading
+from pathlib import Path
+
+from file_manager import FileManager
+
+BATCH_SIZE = 2000
+QUEUE_BATCHES = 4  # worker blocks once this many batches are waiting -> bounded memory
+
+FORMATS = ("text", "markdown", "csv", "jsonl", "cql")
+_EXT_FORMATS = {
+    ".txt": "text",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+    ".cql": "cql",
+}
+
+# "- [ ] task", "* [x] task", "1. [X] task", plain "- task"
+_MD_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[([ xX])\]\s*)?(.*)$")
+
+_TEXT_KEYS = ("text", "task", "title", "name")
+_DONE_KEYS = ("done", "checked", "completed", "complete")
+_TRUTHY = {"1", "x", "true", "yes", "y", "done", "[x]"}
+
+
+def guess_format(path) -> str:
+    return _EXT_FORMATS.get(Path(path).suffix.lower(), "text")
+
+
+# ---------- generator pipeline ----------
+def read_lines(path, progress=None):
+    """Yield decoded lines; progress(bytes_read) is updated as we go."""
+    read = 0
+    with open(path, "rb", buffering=1 << 20) as f:
+        for raw in f:
+            read += len(raw)
+            if progress is not None:
+                progress(read)
+            yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+def parse_text(lines):
+    for line in _drop_underlined(lines):
+        text = line.strip()
+        if not text:
+            continue
+        # our own plain-text export marks rows "[x] task" / "[ ] task"
+        done = False
+        if text[:1] == "[" and text[2:4] == "] " and text[1] in " xX":
+            done = text[1] != " "
+            text = text[4:].strip()
+        if text:
+            yield text, done
+
+
+def parse_markdown(lines):
+    for line in lines:
+        m = _MD_ITEM.match(line)
+        if m is None:
+            continue  # headings, prose, blank lines
+        text = m.group(2).strip()
+        if text:
+            yield text, m.group(1) in ("x", "X")
+
+
+def parse_csv(lines):
+    rows = csv.reader(lines)
+    text_col, done_col = 0, 1
+
+    first = next(rows, None)
+    if first is None:
+        return
+    header = [c.strip().lower() for c in first]
+    if any(k in header for k in _TEXT_KEYS):
+        text_col = next(header.index(k) for k in _TEXT_KEYS if k in header)
+        done_col = next((header.index(k) for k in _DONE_KEYS if k in header), None)
+    else:
+        rows = _chain_one(first, rows)
+
+    for row in rows:
+        if text_col >= len(row):
+            continue
+        text = row[text_col].strip()
+        if not text:
+            continue
+        done = done_col is not None and done_col < len(row) and _truthy(row[done_col])
+        yield text, done
+
+
+def parse_jsonl(lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line in ("[", "]"):
+            continue
+        try:
+            obj = json.loads(line.rstrip(","))
+        except ValueError:
+            continue
+        if isinstance(obj, str):
+            text, done = obj, False
+        elif isinstance(obj, dict):
+            text = next((obj[k] for k in _TEXT_KEYS if isinstance(obj.get(k), str)), None)
+            if text is None or "format" in obj:
+                continue  # snapshot headers, journal ops, unrelated records
+            done = any(_truthy(obj.get(k)) for k in _DONE_KEYS)
+        else:
+            continue
+        text = text.strip()
+        if text:
+            yield text, done
+
+
+PARSERS = {
+    "text": parse_text,
+    "markdown": parse_markdown,
+    "csv": parse_csv,
+    "jsonl": parse_jsonl,
+}
+
+
+def iter_tasks(path, fmt: str | None = None, progress=None):
+    """(text, done) pairs from a file, streamed."""
+    fmt = fmt or guess_format(path)
+    if fmt == "cql":
+        return _iter_list_file(path, progress)
+    return PARSERS[fmt](read_lines(path, progress))
+
+
+def _iter_list_file(path, progress=None):
+    # our own list file: the snapshot alone is stale until its journal is replayed
+    tasks, _, _ = FileManager.load(path)
+    if progress is not None:
+        progress(Path(path).stat().st_size)
+    for task in tasks:
+        yield task.text, task.done
+
+
+def batched(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _drop_underlined(lines):
+    # "Title\n=====" headings (our plain-text export) aren't tasks
+    prev = None
+    for line in lines:
+        stripped = line.strip()
+        if prev is not None and stripped and set(stripped) <= {"=", "-"} and len(stripped) >= 3:
+            prev = None
+            continue
+        if prev is not None:
+            yield prev
+        prev = line
+    if prev is not None:
+        yield prev
+
+
+def _chain_one(first, rest):
+    yield first
+    yield from rest
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in _TRUTHY
+
+
+# ---------- background job ----------
+class ImportJob:
+    """Parses a file on a worker thread into a small bounded queue of batches.
+
+    The Tk side calls take() from an after() tick; the worker blocks when the
+    queue is full, so memory stays at a few batches whatever the file size.
+    """
+
+    def __init__(self, path, fmt: str | None = None, batch_size: int = BATCH_SIZE):
+        self.path = Path(path)
+        self.fmt = fmt or guess_format(path)
+        self.batch_size = batch_size
+        self.total_bytes = max(1, self.path.stat().st_size)
+        self.bytes_read = 0
+        self.imported = 0
+        self.error: Exception | None = None
+        self.finished = False
+
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_BATCHES)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="import", daemon=True)
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.bytes_read / self.total_bytes)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def take(self):
+        """Next batch if one is ready, [] if not yet, None once the job is over."""
+        if self.finished:
+            return None
+        try:
+            batch = self._queue.get_nowait()
+        except queue.Empty:
+            return []
+        if batch is None:
+            self.finished = True
+            return None
+        self.imported += len(batch)
+        return batch
+
+    def _run(self):
+        def progress(n):
+            self.bytes_read = n
+
+        try:
+            for batch in batched(iter_tasks(self.path, self.fmt, progress), self.batch_size):
+                if not self._put(batch):
+                    return
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(None, force=True)
+
+    def _put(self, item, force: bool = False) -> bool:
+        while True:
+            if self._cancel.is_set() and not force:
+                return False
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if force and self._cancel.is_set():
+                    # nobody is draining any more; make room for the end marker
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        pass
@@ -0,0 +1,179 @@
+# perf.py
+# Opt-in hot-path instrumentation: call counts, latency histograms, Tcl calls per operation
+
+import json
+import time
+from collections import deque
+
+# canvas methods that each cost a Tcl round-trip
+CANVAS_CALLS = (
+    "coords", "move", "itemconfigure", "itemconfig", "itemcget", "delete",
+    "tag_raise", "tag_lower", "create_image", "create_text", "create_rectangle",
+    "create_window", "create_line",
+)
+
+# latency histogram buckets, in microseconds (powers of two up to ~1 s)
+_BUCKETS = tuple(1 << i for i in range(4, 21))
+
+
+class Stat:
+    __slots__ = ("count", "total", "max", "tcl", "hist")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.tcl = 0
+        self.hist = [0] * (len(_BUCKETS) + 1)
+
+    def add(self, dt: float, tcl: int):
+        self.count += 1
+        self.total += dt
+        if dt > self.max:
+            self.max = dt
+        self.tcl += tcl
+        us = dt * 1e6
+        i = 0
+        while i < len(_BUCKETS) and us > _BUCKETS[i]:
+            i += 1
+        self.hist[i] += 1
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile, in ms."""
+        if not self.count:
+            return 0.0
+        want = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.hist):
+            seen += n
+            if seen >= want and i < len(_BUCKETS):
+                return round(min(_BUCKETS[i] / 1000.0, self.max * 1000.0), 3)
+            if seen >= want:
+                break
+        return self.max * 1000.0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max * 1000, 3),
+            "tcl_calls_per_op": round(self.tcl / self.count, 1) if self.count else 0.0,
+            "histogram_us": dict(zip([f"<={b}" for b in _BUCKETS] + ["more"], self.hist)),
+        }
+
+
+class Profiler:
+    """Wraps methods on live objects while enabled; restore() puts the originals back.
+
+    Nothing is wrapped until instrument() is called, so a disabled profiler
+    costs nothing on the hot paths.
+    """
+
+    def __init__(self, window: int = 120):
+        self.stats: dict[str, Stat] = {}
+        self.frames = deque(maxlen=window)  # (start, duration) of scheduler flushes
+        self.events = deque(maxlen=4096)    # timestamps of render requests / handler calls
+        self.tcl_calls = 0
+        self._patched: list[tuple[object, str]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    # ---------- wiring ----------
+    def instrument(self, obj, names, prefix: str = ""):
+        for name in names:
+            orig = getattr(obj, name, None)
+            if orig is None or name in vars(obj):
+                continue  # missing or already wrapped
+            setattr(obj, name, self._timed(prefix + name, orig))
+            self._patched.append((obj, name))
+
+    def count_tcl(self, widget, names=CANVAS_CALLS):
+        for name in names:
+            orig = getattr(widget, name, None)
+            if orig is None or name in vars(widget):
+                continue
+            setattr(widget, name, self._counted(orig))
+            self._patched.append((widget, name))
+
+    def restore(self):
+        for obj, name in reversed(self._patched):
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+        self._patched.clear()
+
+    def _timed(self, name: str, fn):
+        stat = self.stats.setdefault(name, Stat())
+        clock = time.perf_counter
+        events = self.events
+
+        def wrapper(*args, **kwargs):
+            tcl0 = self.tcl_calls
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                t1 = clock()
+                stat.add(t1 - t0, self.tcl_calls - tcl0)
+                events.append(t1)
+
+        wrapper.__wrapped__ = fn
+        return wrapper
+
+    def _counted(self, fn):
+        def wrapper(*args, **kwargs):
+            self.tcl_calls += 1
+            return fn(*args, **kwargs)
+
+        wrapper.__wrapped__ = fn
+        return wrapper
+
+    # ---------- scheduler hooks ----------
+    def on_frame(self, start: float, duration: float):
+        self.frames.append((start, duration))
+
+    def on_event(self):
+        self.events.append(time.perf_counter())
+
+    # ---------- reporting ----------
+    def frame_stats(self) -> dict:
+        if not self.frames:
+            return {"frame_ms": 0.0, "frame_max_ms": 0.0, "fps": 0.0}
+        durs = [d for _, d in self.frames]
+        # frames flushed during the last second; an idle window really is 0 fps
+        cutoff = time.perf_counter() - 1.0
+        fps = sum(1 for t, _ in self.frames if t >= cutoff)
+        return {
+            "frame_ms": round(sum(durs) / len(durs) * 1000, 2),
+            "frame_max_ms": round(max(durs) * 1000, 2),
+            "fps": float(fps),
+        }
+
+    def event_rate(self, window_s: float = 1.0) -> float:
+        cutoff = time.perf_counter() - window_s
+        return sum(1 for t in self.events if t >= cutoff) / window_s
+
+    def snapshot(self) -> dict:
+        return {
+            "frames": self.frame_stats(),
+            "events_per_s": round(self.event_rate(), 1),
+            "tcl_calls": self.tcl_calls,
+            "ops": {name: st.as_dict() for name, st in sorted(self.stats.items()) if st.count},
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        for st in self.stats.values():
+            st.__init__()  # wrappers hold on to their Stat
+        self.frames.clear()
+        self.events.clear()
+        self.tcl_calls = 0
@@ -0,0 +1,206 @@
+# pin_window.py
+# File -> Pin to Desktop: a small always-on-top window of pending tasks, redrawn only on list changes
+
+import tkinter as tk
+from itertools import islice
+
+from PIL import Image, ImageColor, ImageDraw, ImageTk
+
+PIN_W = 280
+PIN_H = 360
+HEADER_H = 34
+ROW_H = 28
+PAD = 10
+FOOTER_H = 24
+ROWS = (PIN_H - HEADER_H - 2 * PAD - FOOTER_H) // ROW_H
+PANEL_ALPHA = 215  # how much of the page art shows through the task panel
+
+
+def compose_background(themes, theme, w: int = PIN_W, h: int = PIN_H) -> Image.Image:
+    """Page art (or flat page colour), header band and task panel flattened into one image."""
+    art = themes.art(theme.background)
+    base = themes.store.scaled(art, w, h) if art is not None else None
+    if base is None:
+        base = Image.new("RGBA", (w, h), ImageColor.getrgb(theme.page_bg))
+    img = base.convert("RGBA")
+
+    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    draw.rectangle((0, 0, w, HEADER_H), fill=ImageColor.getrgb(theme.accent) + (255,))
+    draw.rounded_rectangle(
+        (PAD, HEADER_H + PAD, w - PAD, h - PAD),
+        radius=8,
+        fill=ImageColor.getrgb(theme.panel_bg) + (PANEL_ALPHA,),
+    )
+    return Image.alpha_composite(img, overlay)
+
+
+class PinWindow:
+    """Compact, fixed-size view of the first ROWS pending tasks of one TaskList.
+
+    The background is composited once per theme into a single PhotoImage
+    and the window never resizes, so nothing is ever rescaled. There is no
+    polling: TaskList change events mark what is stale and a single
+    after_idle redraw handles a whole burst. Changes below the last task
+    shown only touch the "+N more" line. Rows that did not change make no
+    Tcl calls.
+    """
+
+    def __init__(self, root, themes, fitter, tasks, theme, on_toggle=None, on_close=None):
+        self.themes = themes
+        self.fitter = fitter
+        self.on_toggle = on_toggle  # on_toggle(slot): checked off in the pin
+        self.on_close = on_close
+        self.tasks = None
+        self.theme = None
+        self._bg_photo = None
+        self._after = None
+        self._rows_stale = True
+        self._last_slot = -1  # slot of the last task shown
+        self._full = False    # every row shows a task
+        self._drag = None     # grab offset while the header is being dragged
+        self._footer = None
+
+        self.win = tk.Toplevel(root)
+        self.win.overrideredirect(True)
+        self.win.attributes("-topmost", True)
+        x = max(0, self.win.winfo_screenwidth() - PIN_W - 24)
+        self.win.geometry(f"{PIN_W}x{PIN_H}+{x}+48")
+        self.win.resizable(False, False)
+
+        c = self.canvas = tk.Canvas(self.win, width=PIN_W, height=PIN_H, bd=0, highlightthickness=0)
+        c.pack(fill="both", expand=True)
+        self._bg_id = c.create_image(0, 0, anchor="nw")
+        self._title_id = c.create_text(PAD, HEADER_H // 2, anchor="w")
+        self._close_id = c.create_text(PIN_W - PAD, HEADER_H // 2, anchor="e", text="×")
+        self._footer_id = c.create_text(PIN_W - 2 * PAD, PIN_H - PAD - FOOTER_H // 2, anchor="e")
+
+        self._rows = []
+        for r in range(ROWS):
+            y = HEADER_H + PAD + 6 + r * ROW_H
+            row = {"slot": None, "shown": None}
+            row["cb_id"] = c.create_image(2 * PAD, y, anchor="nw", state="hidden")
+            row["text_id"] = c.create_text(2 * PAD + 28, y + 2, anchor="nw", state="hidden")
+            for item_id in (row["cb_id"], row["text_id"]):
+                c.tag_bind(item_id, "<Button-1>", lambda e, row=row: self._clicked(row))
+            self._rows.append(row)
+
+        # no title bar of its own: the header band drags the window
+        c.tag_bind(self._close_id, "<Button-1>", lambda e: self._close_clicked())
+        c.bind("<ButtonPress-1>", self._start_drag)
+        c.bind("<B1-Motion>", self._on_drag)
+
+        self.set_theme(theme)
+        self.attach(tasks)
+
+    # ---------- model ----------
+    def attach(self, tasks):
+        if self.tasks is not None:
+            self.tasks.unsubscribe(self._on_change)
+        self.tasks = tasks
+        tasks.subscribe(self._on_change)
+        self._set_title()
+        self._rows_stale = True
+        self._schedule()
+
+    def _on_change(self, op: str, slot, value):
+        if op == "title":
+            self._set_title()
+            return
+        if slot is None or not (self._full and slot > self._last_slot):
+            self._rows_stale = True  # otherwise it is below the last row: only the count moves
+        self._schedule()
+
+    def _schedule(self):
+        # one redraw per burst of changes, then nothing until the next one
+        if self._after is None:
+            self._after = self.win.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._after = None
+        tasks = self.tasks
+        if self._rows_stale:
+            self._rows_stale = False
+            shown = list(islice(tasks.pending(), ROWS))
+            self._full = len(shown) == ROWS
+            self._last_slot = shown[-1].slot if shown else -1
+            width = PIN_W - 2 * PAD - 28 - 2 * PAD
+            for i, row in enumerate(self._rows):
+                task = shown[i] if i < len(shown) else None
+                key = (task.slot, task.text) if task is not None else None
+                if key == row["shown"]:
+                    continue
+                row["shown"] = key
+                row["slot"] = task.slot if task is not None else None
+                c = self.canvas
+                if task is None:
+                    c.itemconfigure(row["cb_id"], state="hidden")
+                    c.itemconfigure(row["text_id"], state="hidden")
+                else:
+                    c.itemconfigure(row["cb_id"], state="normal")
+                    c.itemconfigure(
+                        row["text_id"],
+                        text=self.fitter.fit(self.theme.item_font, task.text, width),
+                        state="normal",
+                    )
+        pending = tasks.pending_count
+        more = pending - sum(1 for row in self._rows if row["slot"] is not None)
+        text = f"+{more} more" if more > 0 else ("All done!" if len(tasks) else "")
+        if text != self._footer:
+            self._footer = text
+            self.canvas.itemconfigure(self._footer_id, text=text)
+
+    def _set_title(self):
+        width = PIN_W - 3 * PAD - 16
+        title = self.fitter.fit(self.theme.button_font, self.tasks.title, width)
+        self.canvas.itemconfigure(self._title_id, text=title)
+
+    # ---------- theme ----------
+    def set_theme(self, theme):
+        if theme is self.theme:
+            return
+        self.theme = theme
+        # the only image this window owns; made once here, never rescaled
+        self._bg_photo = ImageTk.PhotoImage(compose_background(self.themes, theme))
+        unchecked, _ = self.themes.sprites(theme)
+        c = self.canvas
+        c.itemconfigure(self._bg_id, image=self._bg_photo)
+        c.itemconfigure(self._title_id, fill=theme.on_accent, font=theme.button_font)
+        c.itemconfigure(self._close_id, fill=theme.on_accent, font=theme.button_font)
+        c.itemconfigure(self._footer_id, fill=theme.accent, font=theme.button_font)
+        for row in self._rows:
+            c.itemconfigure(row["cb_id"], image=unchecked)
+            c.itemconfigure(row["text_id"], fill=theme.text, font=theme.item_font)
+            row["shown"] = None  # the item font changed, texts get cut again
+        if self.tasks is not None:
+            self._set_title()
+            self._rows_stale = True
+            self._schedule()
+
+    # ---------- input ----------
+    def _clicked(self, row):
+        if row["slot"] is not None and self.on_toggle is not None:
+            self.on_toggle(row["slot"])
+
+    def _start_drag(self, event):
+        self._drag = (event.x, event.y) if event.y < HEADER_H else None
+
+    def _on_drag(self, event):
+        if self._drag is not None:
+            x = event.x_root - self._drag[0]
+            y = event.y_root - self._drag[1]
+            self.win.geometry(f"+{x}+{y}")
+
+    def _close_clicked(self):
+        self.close()
+        if self.on_close is not None:
+            self.on_close()
+
+    def close(self):
+        if self.tasks is not None:
+            self.tasks.unsubscribe(self._on_change)
+            self.tasks = None
+        if self._after is not None:
+            self.win.after_cancel(self._after)
+            self._after = None
+        self.win.destroy()
@@ -0,0 +1,77 @@
+# render_scheduler.py
+# Coalesces redraw requests so a resize storm costs one render per frame
+
+import time
+
+DEFAULT_MAX_FPS = 60
+
+
+class RenderScheduler:
+    """Collects dirty render passes and flushes them once per frame via root.after."""
+
+    def __init__(self, root, max_fps: int = DEFAULT_MAX_FPS):
+        self.root = root
+        self.max_fps = max(1, int(max_fps))
+        self._passes: list[tuple[str, object]] = []  # flush order matters
+        self._dirty: set[str] = set()
+        self._after_id = None
+        self._flushing = False
+        self._last_flush = 0.0
+        # optional profiler hooks: on_mark(), on_frame(start, duration)
+        self.on_mark = None
+        self.on_frame = None
+
+    @property
+    def frame_ms(self) -> float:
+        return 1000.0 / self.max_fps
+
+    def add_pass(self, name: str, fn):
+        self._passes.append((name, fn))
+
+    def mark(self, *names: str):
+        # no names -> everything is dirty
+        if names:
+            self._dirty.update(names)
+        else:
+            self._dirty.update(name for name, _ in self._passes)
+        if self.on_mark is not None:
+            self.on_mark()
+
+        if not self._flushing:
+            self._schedule()
+
+    def is_dirty(self, name: str) -> bool:
+        return name in self._dirty
+
+    def _schedule(self):
+        if self._after_id is not None or not self._dirty:
+            return
+        elapsed_ms = (time.perf_counter() - self._last_flush) * 1000.0
+        delay = max(0, int(self.frame_ms - elapsed_ms))
+        self._after_id = self.root.after(delay, self.flush)
+
+    def flush(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+        self._last_flush = time.perf_counter()
+        self._flushing = True
+        try:
+            # passes may dirty later passes; those still run in this frame
+            for name, fn in self._passes:
+                if name in self._dirty:
+                    self._dirty.discard(name)
+                    fn()
+        finally:
+            self._flushing = False
+            if self.on_frame is not None:
+                self.on_frame(self._last_flush, time.perf_counter() - self._last_flush)
+            # anything dirtied "backwards" waits for the next frame
+            self._schedule()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._dirty.clear()
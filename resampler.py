@@ -0,0 +1,133 @@
+# resampler.py
+# Progressive image scaling: cheap preview now, high-quality resample on a worker thread
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk
+
+PREVIEW_REDUCE = 4  # preview is NEAREST-scaled from a 1/4 resolution copy
+POLL_MS = 16
+
+
+class _Job:
+    __slots__ = ("key", "future", "preview", "on_ready")
+
+    def __init__(self, key, future, preview, on_ready):
+        self.key = key
+        self.future = future
+        self.preview = preview
+        self.on_ready = on_ready
+
+
+class ProgressiveResampler:
+    """One in-flight job per slot ("background", "tabbar"); newer requests drop older ones.
+
+    PIL does the decode / resize on worker threads; PhotoImages are only ever
+    built on the Tk thread, from an after() poll that runs only while jobs
+    are pending.
+    """
+
+    def __init__(self, root, cache, store, workers: int = 2, poll_ms: int = POLL_MS):
+        self.root = root
+        self.cache = cache
+        self.store = store
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resample")
+        self._jobs: dict[str, _Job] = {}
+        self._preview_src: dict[str, Image.Image] = {}
+        self._poll_id = None
+
+    def request(self, slot: str, asset: str, w: int, h: int, on_ready, resample=Image.BILINEAR):
+        """Return a PhotoImage to show right now (or None); on_ready(photo) gets the final one later."""
+        key = self.cache.key(asset, w, h, resample)
+
+        photo = self.cache.get(key)
+        if photo is not None:
+            self._drop(slot)
+            return photo
+
+        job = self._jobs.get(slot)
+        if job is not None and job.key == key:
+            job.on_ready = on_ready
+            return job.preview
+
+        # new size -> previous job for this slot is stale
+        self._drop(slot)
+
+        bw, bh = key[1], key[2]
+
+        # warm disk cache: a raw read is cheap enough to do right here
+        img = self.store.cached(asset, bw, bh, resample)
+        if img is not None:
+            photo = ImageTk.PhotoImage(img)
+            self.cache.put(key, photo, bw * bh * 4)
+            return photo
+
+        # no preview until the source has been decoded once (cold start)
+        preview = None
+        if self.store.is_loaded(asset):
+            base = self._preview_base(asset)
+            preview = ImageTk.PhotoImage(base.resize((bw, bh), Image.NEAREST))
+
+        future = self._pool.submit(self.store.scaled, asset, bw, bh, resample)
+        self._jobs[slot] = _Job(key, future, preview, on_ready)
+        self._ensure_polling()
+        return preview
+
+    def prefetch(self, asset: str, w: int, h: int, resample=Image.BILINEAR):
+        """Warm the memory cache for a size nobody is showing yet; all the work happens off-thread."""
+        key = self.cache.key(asset, w, h, resample)
+        slot = f"prefetch:{asset}:{key[1]}x{key[2]}"
+        if key in self.cache or slot in self._jobs:
+            return
+        # store.scaled reads the disk cache or resamples (and fills the disk cache)
+        future = self._pool.submit(self.store.scaled, asset, key[1], key[2], resample)
+        self._jobs[slot] = _Job(key, future, None, None)
+        self._ensure_polling()
+
+    def cancel(self, slot: str):
+        """Forget the slot's job; its on_ready won't run (e.g. the new theme has no art there)."""
+        self._drop(slot)
+
+    def shutdown(self):
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._jobs.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _preview_base(self, asset: str) -> Image.Image:
+        base = self._preview_src.get(asset)
+        if base is None:
+            src = self.store.source(asset)
+            base = src.reduce(PREVIEW_REDUCE) if min(src.size) >= PREVIEW_REDUCE * 8 else src
+            self._preview_src[asset] = base
+        return base
+
+    def _drop(self, slot: str):
+        job = self._jobs.pop(slot, None)
+        if job is not None:
+            job.future.cancel()  # no-op if already running; result is ignored either way
+
+    def _ensure_polling(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        for slot, job in list(self._jobs.items()):
+            if not job.future.done():
+                continue
+            del self._jobs[slot]
+            if job.future.cancelled() or job.future.exception() is not None:
+                continue
+            img = job.future.result()
+            if img is None:
+                continue  # asset went missing
+            photo = ImageTk.PhotoImage(img)
+            self.cache.put(job.key, photo, img.width * img.height * 4)
+            if job.on_ready is not None:
+                job.on_ready(photo)
+
+        if self._jobs:
+            self._ensure_polling()
@@ -0,0 +1,204 @@
+# search_index.py
+# Incremental token/prefix index over task texts for the live filter box
+
+import bisect
+import gc
+import re
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> frozenset:
+    return frozenset(_WORD.findall(text.lower()))
+
+
+class TaskIndex:
+    """Inverted index: token -> set of task ids, plus a sorted vocabulary for prefix lookups.
+
+    Kept current from TaskList change events (add / edit / del / clear_done),
+    so typing in the filter box never rebuilds anything. A query matches a
+    task when every query word is a prefix of one of the task's words.
+    Postings hold ids, not slots, so compacting the list moves nothing here.
+    """
+
+    def __init__(self, tasks=None):
+        self.tasks = None
+        self.on_change = None  # called after the index changes (UI re-filters)
+        self._postings: dict[str, set[int]] = {}
+        self._vocab: list[str] = []          # sorted keys of _postings
+        self._fresh: list[str] = []          # keys not merged into _vocab yet
+        self._doc: dict[int, frozenset] = {}  # task id -> its tokens
+        if tasks is not None:
+            self.attach(tasks)
+
+    def attach(self, tasks):
+        self.detach()
+        self.tasks = tasks
+        self._postings.clear()
+        self._doc.clear()
+        self._fresh.clear()
+        for task in tasks:
+            toks = tokenize(task.text)
+            self._doc[task.id] = toks
+            for tok in toks:
+                self._postings.setdefault(tok, set()).add(task.id)
+        self._vocab = sorted(self._postings)
+        tasks.subscribe(self._on_change)
+
+    def detach(self):
+        if self.tasks is not None:
+            self.tasks.unsubscribe(self._on_change)
+            self.tasks = None
+
+    # ---------- queries ----------
+    def search(self, query: str) -> list[int] | None:
+        """Sorted slots matching query; None for an empty query (= no filter)."""
+        words = tokenize(query)
+        if not words:
+            return None
+
+        # most selective word first; once few candidates are left it is
+        # cheaper to check their own tokens than to build more prefix unions
+        words = sorted(words, key=self._prefix_count)
+        cands = self._prefix_ids(words[0])
+        for i, w in enumerate(words[1:], 1):
+            if len(cands) <= 512:
+                doc = self._doc
+                rest = words[i:]
+                cands = [
+                    i for i in cands
+                    if all(any(t.startswith(r) for t in doc[i]) for r in rest)
+                ]
+                break
+            cands = cands & self._prefix_ids(w)
+        by_id = self.tasks.by_id
+        return sorted(by_id(i).slot for i in cands)
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        self._merge_fresh()
+        lo = bisect.bisect_left(self._vocab, prefix)
+        hi = bisect.bisect_left(self._vocab, prefix + "￿")
+        return lo, hi
+
+    def _prefix_count(self, prefix: str) -> int:
+        lo, hi = self._prefix_range(prefix)
+        return sum(len(self._postings[t]) for t in self._vocab[lo:hi])
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        lo, hi = self._prefix_range(prefix)
+        toks = self._vocab[lo:hi]
+        if len(toks) == 1:
+            return self._postings[toks[0]]
+        out = set()
+        for t in toks:
+            out |= self._postings[t]
+        return out
+
+    # ---------- maintenance ----------
+    def _on_change(self, op: str, slot, value):
+        if op in ("add", "edit"):
+            self._reindex(self.tasks.get(slot).id, value)
+        elif op == "del":
+            self._unindex(value.id)
+        elif op == "clear_done":
+            self._unindex_many(value)
+        elif op == "compact":
+            pass  # same ids, new slots: only the caller's slot view goes stale
+        elif op == "restore":
+            self._index_many(value[0])
+        elif op == "reset":
+            self._postings.clear()
+            self._vocab.clear()
+            self._fresh.clear()
+            self._doc.clear()
+        else:
+            return  # done / title don't change matches
+        if self.on_change is not None:
+            self.on_change()
+
+    def _index(self, tid: int, text: str):
+        toks = tokenize(text)
+        self._doc[tid] = toks
+        for tok in toks:
+            posting = self._postings.get(tok)
+            if posting is None:
+                posting = self._postings[tok] = set()
+                self._fresh.append(tok)  # sorted in on the next lookup, not per task
+            posting.add(tid)
+
+    def _reindex(self, tid: int, text: str):
+        # an edit usually changes a word or two: touch only those postings
+        old = self._doc.get(tid)
+        if old is None:
+            self._index(tid, text)
+            return
+        new = tokenize(text)
+        self._doc[tid] = new
+        for tok in old - new:
+            self._drop(tok, tid)
+        for tok in new - old:
+            posting = self._postings.get(tok)
+            if posting is None:
+                posting = self._postings[tok] = set()
+                self._fresh.append(tok)
+            posting.add(tid)
+
+    def _unindex(self, tid: int):
+        for tok in self._doc.pop(tid, ()):
+            self._drop(tok, tid)
+
+    def _drop(self, tok: str, tid: int):
+        posting = self._postings[tok]
+        posting.discard(tid)
+        if posting:
+            return
+        del self._postings[tok]
+        # still in the unsorted tail: no need to sort it in just to delete it
+        i = bisect.bisect_left(self._vocab, tok)
+        if i < len(self._vocab) and self._vocab[i] == tok:
+            del self._vocab[i]
+        else:
+            self._fresh.remove(tok)
+
+    def _merge_fresh(self):
+        # a sort of sorted _vocab + new tail is close to a single merge pass
+        if self._fresh:
+            self._vocab.extend(self._fresh)
+            self._fresh.clear()
+            self._vocab.sort()
+
+    # bulk versions: one pass over _vocab instead of a del per token
+    def _index_many(self, tasks):
+        postings = self._postings
+        fresh = self._fresh
+        # tens of thousands of fresh frozensets would set off full GC passes
+        # over the whole (acyclic) index; nothing here can form a cycle
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            for task in tasks:
+                toks = tokenize(task.text)
+                self._doc[task.id] = toks
+                for tok in toks:
+                    posting = postings.get(tok)
+                    if posting is None:
+                        posting = postings[tok] = set()
+                        fresh.append(tok)
+                    posting.add(task.id)
+        finally:
+            if paused:
+                gc.enable()
+
+    def _unindex_many(self, tasks):
+        postings = self._postings
+        dead = False
+        for task in tasks:
+            for tok in self._doc.pop(task.id, ()):
+                posting = postings[tok]
+                posting.discard(task.id)
+                if not posting:
+                    del postings[tok]
+                    dead = True
+        if dead:
+            self._merge_fresh()
+            self._vocab = [t for t in self._vocab if t in postings]
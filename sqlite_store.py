@@ -0,0 +1,296 @@
+# sqlite_store.py
+# Optional SQLite backend: many lists + completion history in one database file
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from file_manager import FileManager, SavePlan
+from tasks import TaskList
+
+DB_EXT = ".cqdb"
+PAGE_ROWS = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    id      INTEGER PRIMARY KEY,
+    title   TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lists_updated ON lists(updated);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+    slot    INTEGER NOT NULL,
+    text    TEXT NOT NULL,
+    done    INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    done_at REAL,
+    PRIMARY KEY (list_id, slot)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_done ON tasks(list_id, done);
+
+CREATE TABLE IF NOT EXISTS completion_events (
+    id      INTEGER PRIMARY KEY,
+    list_id INTEGER NOT NULL,
+    slot    INTEGER NOT NULL,
+    text    TEXT NOT NULL,
+    done    INTEGER NOT NULL,
+    at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_at ON completion_events(at);
+CREATE INDEX IF NOT EXISTS events_list_at ON completion_events(list_id, at);
+"""
+
+
+def connect(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=10.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL + NORMAL: durable at checkpoint, no fsync per commit
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SqliteFileManager(FileManager):
+    """Same interface as FileManager (autosave, File menu), stored in SQLite.
+
+    One database file holds any number of lists. Opening a list only reads
+    that list's rows (by the (list_id, slot) key); the completion history is
+    never loaded, only queried. Each save is one transaction, so a burst of
+    toggles / edits coalesced by autosave lands as a single batched commit.
+    """
+
+    def __init__(self, tasks: TaskList | None = None, path=None, list_id: int | None = None):
+        self.list_id = list_id
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        super().__init__(tasks, path)
+
+    # ---------- connections ----------
+    def conn(self, path=None) -> sqlite3.Connection:
+        # sqlite3 connections stay on the thread that made them
+        path = Path(path or self.path)
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(path)
+        if conn is None:
+            conn = conns[path] = connect(path)
+        return conn
+
+    # ---------- File menu ----------
+    def new(self, title: str | None = None) -> TaskList:
+        # a new list goes into the same database; its row is made on first save
+        path = self.path
+        tasks = super().new(title)
+        self.path = path
+        self.list_id = None
+        return tasks
+
+    def open(self, path, list_id: int | None = None) -> TaskList:
+        tasks, list_id = self.load_list(path, list_id)
+        self.list_id = list_id
+        self.attach(tasks, path, gen=str(list_id))
+        return tasks
+
+    def load_list(self, path, list_id: int | None = None) -> tuple[TaskList, int]:
+        """Read one list (the most recently updated if list_id is None)."""
+        conn = self.conn(path)
+        if list_id is None:
+            row = conn.execute("SELECT id, title FROM lists ORDER BY updated DESC LIMIT 1").fetchone()
+        else:
+            row = conn.execute("SELECT id, title FROM lists WHERE id = ?", (list_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"{path} has no such list")
+
+        list_id, title = row
+        tasks = TaskList(title)
+        for page in self.pages(path, list_id):
+            for slot, text, done in page:
+                task = tasks.put(slot, text)
+                if task is not None and done:
+                    tasks.set_done(slot, True)
+        return tasks, list_id
+
+    def pages(self, path, list_id: int, start: int = 0, stop: int | None = None,
+              page_rows: int = PAGE_ROWS):
+        """(slot, text, done) rows of a list in slot order, fetched page by page."""
+        sql = "SELECT slot, text, done FROM tasks WHERE list_id = ? AND slot >= ?"
+        args = [list_id, start]
+        if stop is not None:
+            sql += " AND slot < ?"
+            args.append(stop)
+        cur = self.conn(path).execute(sql + " ORDER BY slot", args)
+        while True:
+            page = cur.fetchmany(page_rows)
+            if not page:
+                return
+            yield page
+
+    def lists(self, path=None) -> list[tuple]:
+        """(id, title, updated, task count, done count), newest first."""
+        return self.conn(path).execute(
+            """SELECT l.id, l.title, l.updated,
+                      (SELECT COUNT(*) FROM tasks t WHERE t.list_id = l.id),
+                      (SELECT COUNT(*) FROM tasks t WHERE t.list_id = l.id AND t.done = 1)
+               FROM lists l ORDER BY l.updated DESC"""
+        ).fetchall()
+
+    # ---------- history ----------
+    def completed_between(self, start: float, end: float, list_id: int | None = None,
+                          path=None) -> list[tuple]:
+        """(list_id, slot, text, at) for tasks checked off in [start, end)."""
+        sql = "SELECT list_id, slot, text, at FROM completion_events WHERE done = 1 AND at >= ? AND at < ?"
+        args = [start, end]
+        if list_id is not None:
+            sql += " AND list_id = ?"
+            args.append(list_id)
+        return self.conn(path).execute(sql + " ORDER BY at", args).fetchall()
+
+    def completed_this_week(self, list_id: int | None = None, path=None) -> list[tuple]:
+        now = time.time()
+        lt = time.localtime(now)
+        start = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday - lt.tm_wday, 0, 0, 0, 0, 0, -1))
+        return self.completed_between(start, now + 1, list_id, path)
+
+    # ---------- saving ----------
+    def checkpoint(self, path=None, compact: bool = False) -> SavePlan | None:
+        if path is not None and Path(path) != self.path:
+            self.path = Path(path)
+            self.list_id = None
+        if self.path is None:
+            raise ValueError("no path to save to")
+
+        if self.list_id is None:
+            # allocate the row now so later journal plans already know the id
+            now = time.time()
+            with self._write_lock:
+                cur = self.conn().execute(
+                    "INSERT INTO lists(title, created, updated) VALUES (?, ?, ?)",
+                    (self.tasks.title, now, now),
+                )
+            self.list_id = cur.lastrowid
+            self._needs_snapshot = True
+
+        gen = str(self.list_id)
+        if compact or self._needs_snapshot:
+            rows = [(t.slot, t.text, t.done) for t in self.tasks]
+            self._pending = []
+            self._needs_snapshot = False
+            return SavePlan("snapshot", self.path, gen, title=self.tasks.title, rows=rows,
+                            list_id=self.list_id)
+
+        if not self._pending:
+            return None
+        plan = SavePlan("journal", self.path, gen, ops=self._pending, list_id=self.list_id)
+        self._pending = []
+        return plan
+
+    def write(self, plan: SavePlan, fsync: bool = True):
+        conn = self.conn(plan.path)
+        now = time.time()
+        try:
+            with self._write_lock:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if plan.kind == "snapshot":
+                        self._write_snapshot(conn, plan, now)
+                    else:
+                        for op in plan.ops:
+                            self._write_op(conn, plan.list_id, op, now)
+                    conn.execute("UPDATE lists SET updated = ? WHERE id = ?", (now, plan.list_id))
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except BaseException:
+            if plan.path == self.path:
+                self._needs_snapshot = True
+            raise
+
+    def compact(self):
+        self.write(self.checkpoint(compact=True))
+
+    def _should_compact(self) -> bool:
+        return False  # no journal to fold
+
+    def _record(self, op: str, slot, value):
+        super()._record(op, slot, value)
+        # stamp when it happened, not when autosave got round to it
+        if self._pending and op in ("add", "done"):
+            self._pending[-1]["at"] = time.time()
+
+    @staticmethod
+    def _write_snapshot(conn, plan: SavePlan, now: float):
+        lid = plan.list_id
+        conn.execute("UPDATE lists SET title = ? WHERE id = ?", (plan.title, lid))
+        # keep when tasks were added / checked off; matched by text, since a
+        # compaction renumbers slots
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS prev(text TEXT PRIMARY KEY, created REAL, done_at REAL)")
+        conn.execute("DELETE FROM prev")
+        conn.execute(
+            """INSERT INTO prev(text, created, done_at)
+               SELECT text, MIN(created), MAX(done_at) FROM tasks WHERE list_id = ? GROUP BY text""",
+            (lid,),
+        )
+        conn.execute("DELETE FROM tasks WHERE list_id = ?", (lid,))
+        conn.executemany(
+            "INSERT INTO tasks(list_id, slot, text, done, created, done_at) VALUES (?, ?, ?, ?, ?, ?)",
+            ((lid, slot, text, int(done), now, now if done else None) for slot, text, done in plan.rows),
+        )
+        conn.execute(
+            """UPDATE tasks SET
+                 created = COALESCE((SELECT created FROM prev WHERE prev.text = tasks.text), created),
+                 done_at = CASE WHEN done THEN
+                     COALESCE((SELECT done_at FROM prev WHERE prev.text = tasks.text), done_at) END
+               WHERE list_id = ?""",
+            (lid,),
+        )
+
+    @staticmethod
+    def _write_op(conn, lid: int, op: dict, now: float):
+        kind = op["op"]
+        at = op.get("at", now)
+        if kind in ("add", "edit"):
+            conn.execute(
+                """INSERT INTO tasks(list_id, slot, text, done, created) VALUES (?, ?, ?, 0, ?)
+                   ON CONFLICT(list_id, slot) DO UPDATE SET text = excluded.text""",
+                (lid, op["slot"], op["text"], at),
+            )
+        elif kind == "done":
+            done = int(bool(op["value"]))
+            conn.execute(
+                "UPDATE tasks SET done = ?, done_at = ? WHERE list_id = ? AND slot = ?",
+                (done, at if done else None, lid, op["slot"]),
+            )
+            conn.execute(
+                """INSERT INTO completion_events(list_id, slot, text, done, at)
+                   SELECT list_id, slot, text, done, ? FROM tasks WHERE list_id = ? AND slot = ?""",
+                (at, lid, op["slot"]),
+            )
+        elif kind == "del":
+            conn.execute("DELETE FROM tasks WHERE list_id = ? AND slot = ?", (lid, op["slot"]))
+        elif kind == "clear_done":
+            conn.execute("DELETE FROM tasks WHERE list_id = ? AND done = 1", (lid,))
+        elif kind == "compact":
+            # renumber rows 0..n-1 in slot order; go through negatives so the PK never collides
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS renumber(old INTEGER PRIMARY KEY, new INTEGER)")
+            conn.execute("DELETE FROM renumber")
+            conn.execute(
+                """INSERT INTO renumber(old, new)
+                   SELECT slot, ROW_NUMBER() OVER (ORDER BY slot) - 1 FROM tasks WHERE list_id = ?""",
+                (lid,),
+            )
+            conn.execute(
+                """UPDATE tasks SET slot = -1 - (SELECT new FROM renumber WHERE old = tasks.slot)
+                   WHERE list_id = ?""",
+                (lid,),
+            )
+            conn.execute("UPDATE tasks SET slot = -1 - slot WHERE list_id = ?", (lid,))
+        elif kind == "title":
+            conn.execute("UPDATE lists SET title = ? WHERE id = ?", (op["text"], lid))
+        elif kind == "reset":
+            conn.execute("DELETE FROM tasks WHERE list_id = ?", (lid,))
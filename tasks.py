@@ -0,0 +1,270 @@
+# tasks.py
+# Task list logic and Task model (no Tk in here, so it can be tested / benchmarked headless)
+
+import heapq
+import itertools
+from array import array
+
+DEFAULT_TITLE = "Check List Title"
+
+
+class Task:
+    __slots__ = ("id", "text", "done", "slot")
+
+    def __init__(self, task_id: int, text: str, done: bool = False, slot: int = -1):
+        self.id = task_id
+        self.text = text
+        self.done = done
+        self.slot = slot  # row position in the list
+
+    def __repr__(self):
+        mark = "x" if self.done else " "
+        return f"Task({self.id}, [{mark}] {self.text!r} @ {self.slot})"
+
+
+class TaskList:
+    """Rows of tasks where a row can also be empty (a blank ruled line on the page).
+
+    Rows live in a slot array. Emptied rows go on a min-heap so the next add
+    fills the first gap, like typing into the first blank line on paper.
+    Lookups by id and the completed set are kept up to date on every change,
+    so add / toggle / clear completed never scan the whole list.
+
+    Every change is reported to subscribers as listener(op, slot, value):
+      add / edit   slot, text
+      done         slot, bool
+      del          slot, removed task
+      clear_done   None, list of removed tasks
+      compact      None, (start, old slots of the rows now at start, start + 1, ...)
+      restore      None, (removed tasks, start, old slots), see restore()
+      title        None, text
+      reset        None, None
+    """
+
+    def __init__(self, title: str = DEFAULT_TITLE):
+        self._title = title
+        self._listeners = []
+        self._slots: list[Task | None] = []
+        self._free: list[int] = []            # min-heap of empty slots (may hold stale entries)
+        self._by_id: dict[int, Task] = {}
+        self._done: set[int] = set()          # ids of completed tasks
+        self._ids = itertools.count(1)
+
+    # ---------- change events ----------
+    def subscribe(self, fn):
+        self._listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _emit(self, op: str, slot=None, value=None):
+        for fn in tuple(self._listeners):  # a listener may unsubscribe itself
+            fn(op, slot, value)
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, text: str):
+        if text != self._title:
+            self._title = text
+            self._emit("title", None, text)
+
+    # ---------- size ----------
+    def __len__(self):
+        # number of real tasks (not counting empty rows)
+        return len(self._by_id)
+
+    @property
+    def span(self) -> int:
+        # number of rows including empty ones; last row is always a task
+        return len(self._slots)
+
+    @property
+    def done_count(self) -> int:
+        return len(self._done)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._by_id) - len(self._done)
+
+    # ---------- lookups ----------
+    def get(self, slot: int) -> Task | None:
+        if 0 <= slot < len(self._slots):
+            return self._slots[slot]
+        return None
+
+    def by_id(self, task_id: int) -> Task | None:
+        return self._by_id.get(task_id)
+
+    def __iter__(self):
+        return (t for t in self._slots if t is not None)
+
+    def rows(self, start: int, stop: int):
+        """Tasks in slots [start, stop), for walking a big list a chunk at a time."""
+        for task in self._slots[start:stop]:
+            if task is not None:
+                yield task
+
+    def completed(self):
+        return (t for t in self if t.done)
+
+    def pending(self):
+        return (t for t in self if not t.done)
+
+    def completed_ids(self) -> frozenset:
+        return frozenset(self._done)
+
+    # ---------- edits ----------
+    def add(self, text: str, done: bool = False) -> Task:
+        """Put text in the first empty row (or a new row at the end)."""
+        slot = self._pop_free()
+        if slot is None:
+            slot = len(self._slots)
+            self._slots.append(None)
+        task = self._place(slot, text, done)
+        self._emit("add", slot, text)
+        if done:
+            self._emit("done", slot, True)
+        return task
+
+    def put(self, slot: int, text: str) -> Task | None:
+        """Set the text of a row; blank text empties the row, rows past the end are created."""
+        if not text.strip():
+            if self.get(slot) is not None:
+                self.remove(slot)
+            return None
+
+        task = self.get(slot)
+        if task is not None:
+            if task.text != text:
+                task.text = text
+                self._emit("edit", slot, text)
+            return task
+
+        while len(self._slots) <= slot:
+            self._slots.append(None)
+            if len(self._slots) - 1 != slot:
+                heapq.heappush(self._free, len(self._slots) - 1)
+        task = self._place(slot, text, False)
+        self._emit("add", slot, text)
+        return task
+
+    def toggle(self, slot: int) -> bool:
+        task = self._slots[slot]
+        self.set_done(slot, not task.done)
+        return task.done
+
+    def set_done(self, slot: int, done: bool):
+        task = self._slots[slot]
+        done = bool(done)
+        if task.done == done:
+            return
+        task.done = done
+        if done:
+            self._done.add(task.id)
+        else:
+            self._done.discard(task.id)
+        self._emit("done", slot, done)
+
+    def remove(self, slot: int) -> Task:
+        task = self._slots[slot]
+        self._slots[slot] = None
+        del self._by_id[task.id]
+        self._done.discard(task.id)
+        # task.slot keeps the row it came from (undo / journal use it)
+
+        heapq.heappush(self._free, slot)
+        self._trim()
+        self._emit("del", slot, task)
+        return task
+
+    def clear_completed(self) -> list[Task]:
+        # walk the completed index, not the whole list
+        removed = [self._by_id[tid] for tid in list(self._done)]
+        for task in removed:
+            slot = task.slot
+            self._slots[slot] = None
+            del self._by_id[task.id]
+            heapq.heappush(self._free, slot)
+        self._done.clear()
+        self._trim()
+        if removed:
+            self._emit("clear_done", None, removed)
+        return removed
+
+    def compact(self) -> tuple[int, array]:
+        """Close up empty rows, keeping order. Returns (start, olds) for restore().
+
+        Rows before `start` didn't move; the row now at start + i came from
+        olds[i]. That array is the whole undo record: removed rows are not
+        copied, and nothing before the first gap is either.
+        """
+        slots = self._slots
+        start = 0
+        while start < len(slots) and slots[start] is not None:
+            start += 1
+        olds = array("I")
+        new = start
+        for old in range(start, len(slots)):
+            task = slots[old]
+            if task is None:
+                continue
+            olds.append(old)
+            task.slot = new
+            slots[new] = task
+            new += 1
+        del slots[new:]
+        self._free.clear()
+        if olds:
+            self._emit("compact", None, (start, olds))
+        return start, olds
+
+    def restore(self, removed: list[Task], start: int, olds):
+        """Undo clear_completed() + compact(): rows go back where they were, removed tasks return."""
+        slots = self._slots
+        span = max(olds[-1] + 1 if olds else len(slots), max((t.slot + 1 for t in removed), default=0))
+        moved = slots[start:start + len(olds)]
+        del slots[start:]
+        slots.extend([None] * (span - len(slots)))
+        for task, old in zip(moved, olds):
+            task.slot = old
+            slots[old] = task
+        for task in removed:
+            slots[task.slot] = task
+            self._by_id[task.id] = task
+            if task.done:
+                self._done.add(task.id)
+        self._free = [i for i in range(start, span) if slots[i] is None]  # ascending, so a valid heap
+        self._emit("restore", None, (removed, start, olds))
+
+    def clear(self):
+        self._slots.clear()
+        self._free.clear()
+        self._by_id.clear()
+        self._done.clear()
+        self._emit("reset")
+
+    # ---------- internals ----------
+    def _place(self, slot: int, text: str, done: bool) -> Task:
+        task = Task(next(self._ids), text, done, slot)
+        self._slots[slot] = task
+        self._by_id[task.id] = task
+        if done:
+            self._done.add(task.id)
+        return task
+
+    def _pop_free(self) -> int | None:
+        # heap entries go stale when a row is refilled by put() or trimmed off the end
+        while self._free:
+            slot = heapq.heappop(self._free)
+            if slot < len(self._slots) and self._slots[slot] is None:
+                return slot
+        return None
+
+    def _trim(self):
+        # drop trailing empty rows; their heap entries become stale and get skipped
+        while self._slots and self._slots[-1] is None:
+            self._slots.pop()
@@ -0,0 +1,92 @@
+# test_batch.py
+# batch.py end to end on temp directories (inline, -j 1, and through the pool)
+
+import json
+
+import pytest
+
+import batch
+from file_manager import FileManager
+from importer import iter_tasks
+from sqlite_store import SqliteFileManager
+from tasks import TaskList
+
+
+def make_cql(path, title, rows):
+    fm = FileManager(path=path)
+    fm.tasks.title = title
+    for text, done in rows:
+        fm.tasks.add(text, done)
+    fm.save()
+    return fm
+
+
+def read_cql(path):
+    tasks, _, _ = FileManager.load(path)
+    return tasks.title, [(t.text, t.done) for t in tasks]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "in"
+    (src / "sub").mkdir(parents=True)
+    make_cql(src / "a.cql", "A", [("milk", False), ("Milk ", True), ("eggs", False)])
+    fm = make_cql(src / "sub" / "b.cql", "B", [("x", True)])
+    fm.tasks.add("y")
+    fm.save()  # leaves a journal next to it
+    return src
+
+
+def test_stats(tree, capsys):
+    assert batch.main(["stats", str(tree), "--json", "-j", "1"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["title"], r["tasks"], r["done"]) for r in lines[:-1]] == [("A", 3, 1), ("B", 2, 1)]
+    assert lines[-1]["total"] and lines[-1]["pending"] == 3
+
+
+def test_wide_glob_skips_journals(tree, capsys):
+    assert batch.main(["stats", str(tree), "--glob", "*", "--json", "-j", "1"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()][:-1]
+    assert [r["path"].rsplit("/", 1)[-1] for r in rows] == ["a.cql", "b.cql"]
+
+
+def test_dedupe_in_place_keeps_title_and_done(tree):
+    assert batch.main(["dedupe", str(tree / "a.cql"), "-q", "-j", "1"]) == 0
+    assert read_cql(tree / "a.cql") == ("A", [("milk", True), ("eggs", False)])
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_filter_to_out_dir(tree, tmp_path, jobs):
+    out = tmp_path / "out"
+    assert batch.main(["filter", str(tree), "-o", str(out), "-q", "-j", jobs]) == 0
+    assert read_cql(out / "a.cql") == ("A", [("milk", False), ("eggs", False)])
+    assert read_cql(out / "sub" / "b.cql") == ("B", [("y", False)])
+
+
+def test_convert_and_clashing_names(tree, tmp_path, capsys):
+    (tree / "a.md").write_text("- [ ] other\n")
+    out = tmp_path / "out"
+    assert batch.main(["convert", str(tree), "--glob", "a.*", "--to", "csv", "-o", str(out), "-j", "1"]) == 1
+    assert "already written" in capsys.readouterr().err
+    assert list(iter_tasks(out / "a.csv")) == [("milk", False), ("Milk", True), ("eggs", False)]
+
+
+def test_convert_database_writes_one_file_per_list(tmp_path):
+    db = tmp_path / "lists.cqdb"
+    for title in ("One", "Two"):
+        tasks = TaskList(title)
+        tasks.add(title.lower())
+        SqliteFileManager(tasks, db).save()
+    out = tmp_path / "out"
+    assert batch.main(["convert", str(db), "--to", "markdown", "-o", str(out), "-q", "-j", "1"]) == 0
+    assert sorted(p.name for p in out.iterdir()) == ["lists.1.md", "lists.2.md"]
+
+
+def test_merge_with_dedupe(tree, tmp_path):
+    extra = tmp_path / "extra.txt"
+    extra.write_text("eggs\nbread\n")
+    out = tmp_path / "all.cql"
+    args = ["merge", str(tree), str(extra), "-o", str(out), "--dedupe", "-q", "-j", "1"]
+    assert batch.main(args) == 0
+    assert read_cql(out) == ("A", [("milk", True), ("eggs", False), ("x", True), ("y", False),
+                                   ("bread", False)])
@@ -0,0 +1,68 @@
+# test_exporter.py
+# Export formats (read back through the importer) and the streaming ExportJob
+
+import time
+
+import pytest
+
+from exporter import FORMATS, ExportJob, export_rows, formatter
+from importer import iter_tasks
+
+ROWS = [("milk", False), ("eggs, free range", True), ('say "hi"', False), ("ünïcode ✓", True)]
+EXT = {"markdown": ".md", "csv": ".csv", "jsonl": ".jsonl", "text": ".txt"}
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_every_format_reads_back(tmp_path, fmt):
+    path = tmp_path / ("out" + EXT[fmt])
+    export_rows(path, iter(ROWS), "Groceries", fmt)
+    assert list(iter_tasks(path)) == ROWS
+
+
+@pytest.mark.parametrize("which, want", [
+    ("completed", [r for r in ROWS if r[1]]),
+    ("pending", [r for r in ROWS if not r[1]]),
+])
+def test_which(tmp_path, which, want):
+    path = tmp_path / "out.md"
+    export_rows(path, iter(ROWS), "T", which=which)
+    assert list(iter_tasks(path)) == want
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        formatter("pdf", "T")
+
+
+def wait(job):
+    deadline = time.monotonic() + 10
+    while not job.done:
+        assert time.monotonic() < deadline, "export did not finish"
+        time.sleep(0.001)
+
+
+def offer_all(job, chunks):
+    for chunk in chunks:
+        while not job.offer(chunk):
+            time.sleep(0.001)
+
+
+def test_export_job_writes_every_chunk(tmp_path):
+    path = tmp_path / "out.csv"
+    job = ExportJob(path, "T").start()
+    offer_all(job, [ROWS[:2], ROWS[2:], None])
+    wait(job)
+    assert job.error is None and job.exported == len(ROWS)
+    assert list(iter_tasks(path)) == ROWS
+
+
+def test_cancelled_export_keeps_the_old_file(tmp_path):
+    path = tmp_path / "out.md"
+    path.write_text("previous export\n")
+    job = ExportJob(path, "T").start()
+    offer_all(job, [ROWS])
+    job.cancel()
+    wait(job)
+    assert job.cancelled
+    assert path.read_text() == "previous export\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.md"]  # no temp file left
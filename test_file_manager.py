@@ -0,0 +1,122 @@
+# test_file_manager.py
+# Snapshot + journal round trips for FileManager (python -m pytest -q)
+
+import pytest
+
+from file_manager import FileFormatError, FileManager, journal_path, read_json, write_json
+
+
+def state(tasks):
+    return tasks.title, [(t.slot, t.text, t.done) for t in tasks]
+
+
+def test_save_mutate_save_load(tmp_path):
+    path = tmp_path / "list.cql"
+    fm = FileManager(path=path)
+    tasks = fm.tasks
+    tasks.title = "Groceries"
+    for text in ("milk", "eggs", "bread"):
+        tasks.add(text)
+    fm.save()  # first save: snapshot
+
+    tasks.toggle(0)
+    tasks.put(1, "free-range eggs")
+    tasks.remove(2)
+    tasks.add("butter")
+    tasks.title = "Shopping"
+    fm.save()  # journal append
+    assert journal_path(path).stat().st_size > 0
+
+    loaded, gen, ops = FileManager.load(path)
+    assert state(loaded) == state(tasks)
+    assert ops > 0
+
+
+def test_torn_journal_tail_is_ignored(tmp_path):
+    path = tmp_path / "list.cql"
+    fm = FileManager(path=path)
+    fm.tasks.add("one")
+    fm.save()
+    fm.tasks.add("two")
+    fm.tasks.toggle(0)
+    fm.save()
+    expected = state(fm.tasks)
+
+    # crash halfway through the next append
+    with open(journal_path(path), "a", encoding="utf-8") as f:
+        f.write('{"op":"add","slot":2,"te')
+
+    loaded, _, _ = FileManager.load(path)
+    assert state(loaded) == expected
+
+
+def test_old_generation_journal_is_skipped_after_compaction(tmp_path):
+    path = tmp_path / "list.cql"
+    fm = FileManager(path=path)
+    fm.tasks.add("a")
+    fm.save()
+    fm.tasks.add("b")
+    fm.tasks.remove(0)
+    fm.save()
+    stale = journal_path(path).read_text(encoding="utf-8")
+
+    fm.compact()
+    assert journal_path(path).read_text(encoding="utf-8") == ""
+
+    # crash after the new snapshot, before the journal was emptied
+    journal_path(path).write_text(stale, encoding="utf-8")
+    loaded, gen, ops = FileManager.load(path)
+    assert state(loaded) == state(fm.tasks)
+    assert ops == 0
+
+    # ops of the new generation still replay on top
+    fm.tasks.add("c")
+    fm.save()
+    loaded, _, ops = FileManager.load(path)
+    assert state(loaded) == state(fm.tasks)
+    assert ops == 1
+
+
+@pytest.mark.parametrize("content", [
+    "",                                                              # empty
+    '{"format":"checklist-quest","version":1,"title":"T"}\n',        # no gen
+    '{"format":"checklist-quest","version":1,"gen":"ab","title":"T"}\n{"text":"x"}\n',
+    '{"format":"checklist-quest","version":1,"gen":"ab","title":"T"}\n{"slot":"0","text":"x"}\n',
+    '{"format":"checklist-quest","version":1,"gen":"ab","title":"T"}\n{"slot":0,"text":null}\n',
+    '{"format":"checklist-quest","version":1,"gen":"ab","title":"T"}\n[0,"x"]\n',
+    '{"format":"checklist-quest","version":1,"gen":"ab","title":"T"}\n{"slot":0,"te\n',
+])
+def test_damaged_snapshot_is_a_format_error(tmp_path, content):
+    path = tmp_path / "list.cql"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(FileFormatError):
+        FileManager.load(path)
+
+
+def test_malformed_journal_op_ends_the_replay(tmp_path):
+    path = tmp_path / "list.cql"
+    fm = FileManager(path=path)
+    fm.tasks.add("one")
+    fm.save()
+    fm.tasks.add("two")
+    fm.save()
+    expected = state(fm.tasks)
+
+    gen = FileManager.load(path)[1]
+    with open(journal_path(path), "a", encoding="utf-8") as f:
+        f.write('{"op":"add","text":"no slot","gen":"%s"}\n' % gen)
+        f.write('{"op":"add","slot":5,"text":"after it","gen":"%s"}\n' % gen)
+
+    loaded, _, ops = FileManager.load(path)
+    assert state(loaded) == expected
+    assert ops == 1
+
+
+def test_json_state_round_trip_and_damage(tmp_path):
+    path = tmp_path / "sub" / "state.json"
+    assert read_json(path) is None
+    write_json(path, {"version": 1, "lists": [["a.cql", None]]})
+    assert read_json(path) == {"version": 1, "lists": [["a.cql", None]]}
+    for damaged in ('{"version": 1', "[1, 2]"):
+        path.write_text(damaged)
+        assert read_json(path) is None
@@ -0,0 +1,93 @@
+# test_importer.py
+# Import parsers, .cql import through FileManager.load, and the batched ImportJob
+
+import time
+
+from file_manager import FileManager
+from importer import (ImportJob, batched, guess_format, iter_tasks, parse_csv, parse_jsonl,
+                      parse_markdown, parse_text)
+
+
+def test_guess_format():
+    assert guess_format("a.MD") == "markdown"
+    assert guess_format("a.ndjson") == "jsonl"
+    assert guess_format("a.cql") == "cql"
+    assert guess_format("notes") == "text"
+
+
+def test_parse_text_skips_underlined_titles_and_reads_marks():
+    lines = ["Groceries", "=========", "", "[x] milk", "[ ] eggs", "bread  "]
+    assert list(parse_text(lines)) == [("milk", True), ("eggs", False), ("bread", False)]
+
+
+def test_parse_markdown():
+    lines = ["# List", "", "- [ ] one", "* [X] two", "1. three", "prose", "+ [x]  "]
+    assert list(parse_markdown(lines)) == [("one", False), ("two", True), ("three", False)]
+
+
+def test_parse_csv_with_and_without_header():
+    assert list(parse_csv(["Done,Task", "yes,a", ",b", "1,"])) == [("a", True), ("b", False)]
+    assert list(parse_csv(["a,x", "b", '"c, d",'])) == [("a", True), ("b", False), ("c, d", False)]
+
+
+def test_parse_jsonl_shapes():
+    lines = [
+        "[",
+        '{"format": "checklist-quest-export", "list": "T"},',
+        '"plain string",',
+        '{"task": "dict", "completed": "yes"},',
+        '{"unrelated": 1}',
+        "not json",
+        "]",
+    ]
+    assert list(parse_jsonl(lines)) == [("plain string", False), ("dict", True)]
+
+
+def test_cql_import_replays_the_journal(tmp_path):
+    path = tmp_path / "list.cql"
+    fm = FileManager(path=path)
+    for text in ("one", "two", "three"):
+        fm.tasks.add(text)
+    fm.save()
+    fm.tasks.put(1, "TWO edited")
+    fm.tasks.toggle(1)
+    fm.tasks.remove(0)
+    fm.tasks.add("four")
+    fm.save()
+    assert list(iter_tasks(path)) == [("four", False), ("TWO edited", True), ("three", False)]
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def run(job):
+    out = []
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        batch = job.take()
+        if batch is None:
+            return out
+        out.extend(batch)
+        if not batch:
+            time.sleep(0.001)
+    raise AssertionError("import did not finish")
+
+
+def test_import_job_streams_batches(tmp_path):
+    path = tmp_path / "big.md"
+    path.write_text("".join(f"- [{'x' if i % 3 == 0 else ' '}] task {i}\n" for i in range(2500)))
+    job = ImportJob(path, batch_size=1000).start()
+    rows = run(job)
+    assert len(rows) == 2500 and job.imported == 2500
+    assert rows[3] == ("task 3", True) and rows[4] == ("task 4", False)
+    assert job.fraction == 1.0 and job.error is None
+
+
+def test_import_job_cancel_ends_it(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("".join(f"task {i}\n" for i in range(50_000)))
+    job = ImportJob(path, batch_size=100).start()
+    job.cancel()
+    rows = run(job)
+    assert len(rows) < 50_000 and job.cancelled
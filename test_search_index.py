@@ -0,0 +1,89 @@
+# test_search_index.py
+# TaskIndex: prefix queries, kept current from TaskList events
+
+from search_index import TaskIndex, tokenize
+from tasks import TaskList
+
+
+def make(*texts):
+    tasks = TaskList()
+    for text in texts:
+        tasks.add(text)
+    return tasks, TaskIndex(tasks)
+
+
+def brute(tasks, query):
+    words = tokenize(query)
+    return sorted(
+        t.slot for t in tasks
+        if all(any(tok.startswith(w) for tok in tokenize(t.text)) for w in words)
+    )
+
+
+def test_every_word_must_prefix_some_token():
+    tasks, index = make("Buy milk", "buy bread", "Call Mum", "mill visit")
+    assert index.search("") is None
+    assert index.search("bu") == [0, 1]
+    assert index.search("mil") == [0, 3]
+    assert index.search("BUY mi") == [0]
+    assert index.search("zzz") == []
+
+
+def test_follows_edits_removes_and_adds():
+    tasks, index = make("apple pie", "banana split")
+    tasks.put(0, "cherry pie")
+    assert index.search("app") == []
+    assert index.search("che") == [0]
+    tasks.remove(1)
+    assert index.search("ban") == []
+    tasks.add("blueberry")
+    assert index.search("b") == [1]
+
+
+def test_edit_touches_only_changed_tokens():
+    tasks, index = make("pie crust", "pie dish")
+    tasks.put(0, "pie newword")
+    tasks.put(0, "pie other")  # "newword" dropped before any lookup sorted it in
+    assert index._fresh == ["other"] or "other" in index._vocab
+    assert "newword" not in index._postings and "crust" not in index._vocab
+    assert index._postings["pie"] == {tasks.get(0).id, tasks.get(1).id}
+    assert index.search("ne") == [] and index.search("oth") == [0]
+
+
+def test_clear_completed_restore_and_reset():
+    tasks, index = make("one", "two", "three")
+    tasks.toggle(1)
+    removed = tasks.clear_completed()
+    start, olds = tasks.compact()
+    assert index.search("t") == [1]  # "three" moved up; ids, not slots, are indexed
+    tasks.restore(removed, start, olds)
+    assert index.search("t") == [1, 2]
+    tasks.clear()
+    assert index.search("t") == []
+
+
+def test_on_change_fires_for_matching_changes_only():
+    tasks, index = make("a")
+    calls = []
+    index.on_change = lambda: calls.append(1)
+    tasks.toggle(0)
+    tasks.title = "other"
+    assert calls == []
+    tasks.add("b")
+    tasks.put(0, "c")
+    assert len(calls) == 2
+
+
+def test_matches_a_brute_force_scan():
+    words = ["alpha", "alpine", "beta", "bet", "gamma", "gam", "delta", "al"]
+    tasks = TaskList()
+    index = TaskIndex(tasks)
+    for i in range(600):
+        tasks.add(" ".join(words[(i * k) % len(words)] for k in (1, 3, 5)[: 1 + i % 3]))
+    for slot in range(0, 600, 7):
+        tasks.put(slot, words[slot % len(words)] + " extra")
+    for slot in range(0, 600, 11):
+        if tasks.get(slot) is not None:
+            tasks.remove(slot)
+    for query in ("al", "alp", "be gam", "ex", "delta al", "b g a"):
+        assert index.search(query) == brute(tasks, query), query
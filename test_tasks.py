@@ -0,0 +1,140 @@
+# test_tasks.py
+# TaskList: slots, the free-row heap, the completed index and change events
+
+from tasks import TaskList
+
+
+def texts(tasks):
+    return [tasks.get(i).text if tasks.get(i) else None for i in range(tasks.span)]
+
+
+def recorder(tasks):
+    events = []
+    tasks.subscribe(lambda op, slot, value: events.append((op, slot, value)))
+    return events
+
+
+def test_add_fills_the_first_empty_row():
+    tasks = TaskList()
+    for text in "abcd":
+        tasks.add(text)
+    tasks.remove(2)
+    tasks.remove(0)
+    assert texts(tasks) == [None, "b", None, "d"]
+    assert tasks.add("e").slot == 0
+    assert tasks.add("f").slot == 2
+    assert tasks.add("g").slot == 4
+
+
+def test_trailing_empty_rows_are_trimmed():
+    tasks = TaskList()
+    for text in "abc":
+        tasks.add(text)
+    tasks.remove(1)
+    tasks.remove(2)
+    assert tasks.span == 1
+    # the heap still holds 1 and 2; both are stale or past the end now
+    assert tasks.add("d").slot == 1
+    assert tasks.add("e").slot == 2
+
+
+def test_put_past_the_end_leaves_free_rows():
+    tasks = TaskList()
+    tasks.put(3, "x")
+    assert tasks.span == 4 and len(tasks) == 1
+    assert [tasks.add(t).slot for t in "abc"] == [0, 1, 2]
+
+
+def test_put_blank_empties_the_row():
+    tasks = TaskList()
+    tasks.add("a")
+    tasks.add("b")
+    assert tasks.put(0, "   ") is None
+    assert tasks.get(0) is None and len(tasks) == 1
+
+
+def test_done_index_follows_toggles_and_removes():
+    tasks = TaskList()
+    for text in "abc":
+        tasks.add(text)
+    tasks.toggle(0)
+    tasks.toggle(2)
+    assert tasks.done_count == 2 and tasks.pending_count == 1
+    tasks.remove(2)
+    assert tasks.done_count == 1
+    assert tasks.completed_ids() == frozenset({tasks.get(0).id})
+
+
+def test_clear_completed_then_restore_puts_rows_back():
+    tasks = TaskList()
+    for text in "abcdef":
+        tasks.add(text)
+    for slot in (1, 4):
+        tasks.toggle(slot)
+    before = [(t.id, t.slot, t.text, t.done) for t in tasks]
+
+    removed = tasks.clear_completed()
+    start, olds = tasks.compact()
+    assert texts(tasks) == ["a", "c", "d", "f"]
+    assert (start, list(olds)) == (1, [2, 3, 5])
+
+    tasks.restore(removed, start, olds)
+    assert [(t.id, t.slot, t.text, t.done) for t in tasks] == before
+    assert tasks.done_count == 2
+    assert tasks.add("g").slot == 6
+
+
+def test_events():
+    tasks = TaskList("T")
+    events = recorder(tasks)
+    a = tasks.add("a")
+    tasks.put(0, "a2")
+    tasks.put(0, "a2")  # unchanged: no event
+    tasks.toggle(0)
+    tasks.title = "U"
+    tasks.title = "U"
+    tasks.add("b")
+    removed = tasks.remove(1)
+    cleared = tasks.clear_completed()
+    tasks.clear()
+    assert events == [
+        ("add", 0, "a"),
+        ("edit", 0, "a2"),
+        ("done", 0, True),
+        ("title", None, "U"),
+        ("add", 1, "b"),
+        ("del", 1, removed),
+        ("clear_done", None, [a]),
+        ("reset", None, None),
+    ]
+    assert cleared == [a]
+
+
+def test_add_done_reports_both_events():
+    tasks = TaskList()
+    events = recorder(tasks)
+    tasks.add("x", done=True)
+    assert events == [("add", 0, "x"), ("done", 0, True)]
+    assert tasks.done_count == 1
+
+
+def test_listener_may_unsubscribe_itself():
+    tasks = TaskList()
+    seen = []
+
+    def once(op, slot, value):
+        seen.append(op)
+        tasks.unsubscribe(once)
+
+    tasks.subscribe(once)
+    tasks.add("a")
+    tasks.add("b")
+    assert seen == ["add"]
+
+
+def test_rows_walks_a_slot_range():
+    tasks = TaskList()
+    for i in range(10):
+        tasks.add(str(i))
+    tasks.remove(4)
+    assert [t.text for t in tasks.rows(3, 7)] == ["3", "5", "6"]
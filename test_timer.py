@@ -0,0 +1,115 @@
+# test_timer.py
+# TaskTimer on a fake clock: labels, the shared tick, countdowns, checkpoint / restore
+
+import time
+
+from tasks import TaskList
+from timer import TaskTimer, fmt
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_fmt():
+    assert fmt(0) == "0:00"
+    assert fmt(75) == "1:15"
+    assert fmt(3725) == "1:02:05"
+
+
+def test_stopwatch_pause_resume():
+    clock = Clock()
+    timers = TaskTimer(clock)
+    timers.start_stopwatch(1)
+    clock.now += 5.5
+    assert timers.label(1) == "0:05"
+    timers.pause(1)
+    clock.now += 100
+    assert timers.label(1) == "0:05"
+    timers.resume(1)
+    clock.now += 1
+    assert timers.label(1) == "0:06"
+
+
+def test_only_watched_timers_tick_every_second():
+    clock = Clock()
+    timers = TaskTimer(clock)
+    timers.start_stopwatch(1)
+    timers.start_stopwatch(2)
+    assert timers.next_due() is None  # nothing on screen
+
+    timers.watch([1])
+    clock.now += 1.0
+    changed, finished = timers.tick()
+    assert changed == {1} and finished == []
+    assert timers.next_due() is not None
+
+
+def test_countdown_finishes_off_screen():
+    clock = Clock()
+    timers = TaskTimer(clock)
+    timers.start_countdown(1, 3)
+    assert timers.label(1) == "0:03"
+    clock.now += 3.2
+    changed, finished = timers.tick()
+    assert finished == [1] and changed == set()
+    timer = timers.get(1)
+    assert timer.finished and not timer.running
+    assert timers.label(1) == "0:00"
+    timers.resume(1)
+    assert not timer.running  # a finished countdown stays finished
+
+
+def test_stop_orphans_heap_entries():
+    clock = Clock()
+    timers = TaskTimer(clock)
+    timers.start_countdown(1, 2)
+    timers.stop(1)
+    clock.now += 5
+    assert timers.tick() == (set(), [])
+    assert 1 not in timers
+
+
+def test_checkpoint_restore_same_boot():
+    clock = Clock()
+    tasks = TaskList()
+    task = tasks.add("write report")
+    timers = TaskTimer(clock)
+    timers.start_stopwatch(task.id)
+    clock.now += 10
+    state = timers.checkpoint(tasks)
+
+    clock.now += 50  # closed for 50 s
+    state["wall"] = time.time() - 50
+    restored = TaskTimer(clock)
+    restored.restore(state, tasks)
+    assert restored.get(task.id).running
+    assert round(restored.get(task.id).elapsed_at(clock.now)) == 60
+
+
+def test_restore_after_reboot_uses_wall_time():
+    tasks = TaskList()
+    task = tasks.add("x")
+    wall = time.time()
+    state = {"mono": 5_000_000.0, "wall": wall - 3600, "timers": [
+        {"slot": 0, "text": "x", "kind": "stopwatch", "duration": 0.0,
+         "elapsed": 10.0, "running": True, "finished": False},
+    ]}
+    timers = TaskTimer(Clock(50.0))  # monotonic restarted: another boot
+    timers.restore(state, tasks)
+    assert round(timers.get(task.id).elapsed_at(50.0)) == 3610
+
+
+def test_restore_skips_rows_changed_outside_the_app():
+    tasks = TaskList()
+    tasks.add("renamed")
+    state = {"mono": 0.0, "wall": time.time(), "timers": [
+        {"slot": 0, "text": "original", "kind": "stopwatch", "elapsed": 1.0, "running": False},
+    ]}
+    timers = TaskTimer(Clock(0.0))
+    timers.restore(state, tasks)
+    assert len(timers) == 0
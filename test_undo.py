@@ -0,0 +1,119 @@
+# test_undo.py
+# UndoLog: deltas replayed against a TaskList, merging, and the size caps
+
+from tasks import TaskList
+from undo import UndoLog
+
+
+def texts(tasks):
+    return [(t.slot, t.text, t.done) for t in tasks]
+
+
+def test_add_edit_toggle_title_round_trip():
+    tasks, log = TaskList("T"), UndoLog(merge_s=0)
+    states = [(tasks.title, texts(tasks))]
+
+    def step():
+        states.append((tasks.title, texts(tasks)))
+
+    tasks.add("a")
+    log.record_add(0, "a")
+    step()
+    tasks.put(0, "b")
+    log.record_edit(0, "a", "b")
+    step()
+    tasks.toggle(0)
+    log.record_toggle(0)
+    step()
+    log.record_title(tasks.title, "U")
+    tasks.title = "U"
+    step()
+
+    for want in reversed(states[:-1]):
+        log.undo(tasks)
+        assert (tasks.title, texts(tasks)) == want
+    assert not log.can_undo
+    for want in states[1:]:
+        log.redo(tasks)
+        assert (tasks.title, texts(tasks)) == want
+    assert not log.can_redo
+
+
+def test_blank_edit_undoes_back_to_a_done_task():
+    tasks, log = TaskList(), UndoLog()
+    tasks.add("a")
+    tasks.toggle(0)
+    tasks.put(0, "")
+    log.record_edit(0, "a", "", old_done=True)
+    assert len(tasks) == 0
+
+    log.undo(tasks)
+    assert texts(tasks) == [(0, "a", True)]
+    log.redo(tasks)
+    assert len(tasks) == 0
+
+
+def test_clear_completed_undo_and_redo():
+    tasks, log = TaskList(), UndoLog()
+    for text in "abcd":
+        tasks.add(text)
+    tasks.toggle(1)
+    before = texts(tasks)
+
+    removed = tasks.clear_completed()
+    start, olds = tasks.compact()
+    log.record_clear(removed, start, olds)
+    after = texts(tasks)
+
+    log.undo(tasks)
+    assert texts(tasks) == before
+    log.redo(tasks)
+    assert texts(tasks) == after
+
+
+def test_quick_edits_of_one_row_merge():
+    tasks, log = TaskList(), UndoLog(merge_s=60)
+    tasks.add("a")
+    log.record_add(0, "a")
+    for old, new in (("a", "ab"), ("ab", "abc"), ("abc", "abcd")):
+        tasks.put(0, new)
+        log.record_edit(0, old, new)
+    assert len(log) == 2
+    log.undo(tasks)
+    assert tasks.get(0).text == "a"
+
+
+def test_toggling_straight_back_cancels_out():
+    log = UndoLog()
+    log.record_toggle(3)
+    log.record_toggle(3)
+    assert len(log) == 0
+
+
+def test_new_entry_clears_redo():
+    tasks, log = TaskList(), UndoLog()
+    tasks.add("a")
+    log.record_add(0, "a")
+    log.undo(tasks)
+    assert log.can_redo and log.redo_kind == "add"
+    tasks.add("b")
+    log.record_add(0, "b")
+    assert not log.can_redo
+
+
+def test_caps_drop_the_oldest_entries_but_keep_the_newest():
+    log = UndoLog(max_entries=3)
+    for slot in range(5):
+        log.record_add(slot, "x")
+    assert len(log) == 3
+
+    log = UndoLog(max_bytes=1)
+    log.record_add(0, "x" * 1000)
+    log.record_add(1, "y")
+    assert len(log) == 1 and log.undo_kind == "add"
+
+    log = UndoLog()
+    for slot in range(10):
+        log.record_add(slot, "x" * 100)
+    log.trim(500)
+    assert 1 <= len(log) < 10 and log.bytes_used <= 500
@@ -0,0 +1,103 @@
+# test_xp_manager.py
+# XPManager: totals from events, stickers, streaks, and the log / snapshot on disk
+
+import json
+
+import xp_manager
+from xp_manager import XP_ADD, XP_DONE, XP_LIST, XPManager, level_for
+
+
+def flush(xp):
+    plan = xp.checkpoint()
+    if plan is not None:
+        xp.write(plan)
+
+
+def test_level_for():
+    assert level_for(0) == (1, 0, 100)
+    assert level_for(99) == (1, 0, 100)
+    assert level_for(100) == (2, 100, 400)
+    assert level_for(400)[0] == 3
+
+
+def test_totals_and_undo_events(tmp_path):
+    xp = XPManager(tmp_path)
+    xp.record("add", "a", 3)
+    xp.record("done", "a", 2)
+    assert xp.stats["xp"] == 3 * XP_ADD + 2 * XP_DONE
+    xp.record("undone", "a")
+    xp.record("add_undone", "a")
+    assert xp.stats["xp"] == 2 * XP_ADD + XP_DONE
+    assert xp.stats["tasks_added"] == 2 and xp.stats["tasks_completed"] == 1
+    assert xp.completed_last(7) == 1
+
+
+def test_list_done_counts_once_until_reopened(tmp_path):
+    xp = XPManager(tmp_path)
+    assert xp.record("list_done", "a") == ["List Slayer"]
+    xp.record("list_done", "a")
+    assert xp.stats["lists_finished"] == 1
+    xp.record("add", "a")
+    xp.record("list_done", "a")
+    assert xp.stats["lists_finished"] == 2
+    assert xp.stats["xp"] == 2 * XP_LIST + XP_ADD
+
+    xp.record("list_done", None)  # no key: nothing to track it by
+    assert xp.stats["lists_finished"] == 2
+
+
+def test_stickers_unlock_once(tmp_path):
+    xp = XPManager(tmp_path)
+    assert xp.record("done") == ["First Step"]
+    assert xp.record("done") == []
+    got = {name for name, _, _, at in xp.stickers() if at is not None}
+    assert got == {"First Step"}
+
+
+def test_streak_across_days(tmp_path, monkeypatch):
+    xp = XPManager(tmp_path)
+    day = [700_000]
+    monkeypatch.setattr(xp_manager, "_today", lambda: day[0])
+    for _ in range(3):
+        xp.record("done")
+        day[0] += 1
+    assert xp.stats["streak"] == 3 and xp.stats["best_streak"] == 3
+    assert "Three in a Row" in xp.stats["stickers"]
+    day[0] += 2  # skipped a day
+    xp.record("done")
+    assert xp.stats["streak"] == 1 and xp.stats["best_streak"] == 3
+
+
+def test_nothing_touches_disk_until_a_plan_is_written(tmp_path):
+    xp = XPManager(tmp_path)
+    xp.record("add")
+    assert not xp.log_path.exists()
+    flush(xp)
+    assert len(xp.log_path.read_text().splitlines()) == 1
+    assert xp.checkpoint() is None
+
+
+def test_reload_replays_the_log_after_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(xp_manager, "SNAPSHOT_EVERY", 5)
+    xp = XPManager(tmp_path)
+    for _ in range(7):
+        xp.record("add")
+        flush(xp)
+    assert json.loads(xp.snapshot_path.read_text())["seq"] == 5
+    assert len(xp.log_path.read_text().splitlines()) == 2
+    xp.close()
+
+    again = XPManager(tmp_path)
+    assert again.stats["tasks_added"] == 7 and again.stats["seq"] == 7
+
+
+def test_crash_between_snapshot_and_cut_counts_once(tmp_path):
+    xp = XPManager(tmp_path)
+    for _ in range(3):
+        xp.record("add")
+    flush(xp)
+    log = xp.log_path.read_text()
+    xp.close()  # snapshot, log cut back
+    xp.log_path.write_text(log)  # ...as if the cut never happened
+
+    assert XPManager(tmp_path).stats["tasks_added"] == 3
@@ -0,0 +1,77 @@
+# text_fit.py
+# Fitting task text into a pixel width: memoized Font.measure and binary-search ellipsizing
+
+import tkinter.font as tkfont
+from collections import OrderedDict
+
+ELLIPSIS = "…"
+MAX_WIDTHS = 50_000  # memoized (font, text) widths, least recently used dropped first
+MAX_FITS = 10_000    # memoized (font, text, width) -> shown text
+
+
+class TextFitter:
+    """Cuts text down to a width with a trailing ellipsis; every measurement is memoized.
+
+    Font.measure is a Tcl round trip, so widths are cached by (font, text)
+    and fit results by (font, text, width). A fit is a binary search over
+    the cut point; the first probes of that search are the same for every
+    width, so a resize mostly reuses widths measured on the last frame.
+    """
+
+    def __init__(self, root, max_widths: int = MAX_WIDTHS, max_fits: int = MAX_FITS):
+        self.root = root
+        self.max_widths = max_widths
+        self.max_fits = max_fits
+        self._fonts: dict = {}  # font spec -> tkfont.Font
+        self._widths: OrderedDict[tuple, int] = OrderedDict()
+        self._fits: OrderedDict[tuple, str] = OrderedDict()
+        self.measured = 0  # Tcl measure calls made, for the profiler / bench
+
+    def font(self, spec) -> tkfont.Font:
+        font = self._fonts.get(spec)
+        if font is None:
+            font = self._fonts[spec] = tkfont.Font(root=self.root, font=spec)
+        return font
+
+    def measure(self, spec, text: str) -> int:
+        key = (spec, text)
+        w = self._widths.get(key)
+        if w is not None:
+            self._widths.move_to_end(key)
+            return w
+        w = self.font(spec).measure(text)
+        self.measured += 1
+        self._widths[key] = w
+        if len(self._widths) > self.max_widths:
+            self._widths.popitem(last=False)
+        return w
+
+    def fit(self, spec, text: str, width: int) -> str:
+        """`text` if it fits in `width` px, else its longest prefix that fits with an ellipsis."""
+        key = (spec, text, width)
+        shown = self._fits.get(key)
+        if shown is not None:
+            self._fits.move_to_end(key)
+            return shown
+
+        if self.measure(spec, text) <= width:
+            shown = text
+        else:
+            # largest n with text[:n] + ellipsis inside width
+            lo, hi = 0, len(text) - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if self.measure(spec, text[:mid].rstrip() + ELLIPSIS) <= width:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            shown = text[:lo].rstrip() + ELLIPSIS
+
+        self._fits[key] = shown
+        if len(self._fits) > self.max_fits:
+            self._fits.popitem(last=False)
+        return shown
+
+    def clear(self):
+        self._widths.clear()
+        self._fits.clear()
@@ -0,0 +1,163 @@
+# theme_manager.py
+# themes: background art, tab bar, checkbox sprites, fonts and colours
+
+from PIL import ImageTk
+
+PREWARM_DELAY_MS = 750  # wait for the window size to settle before warming other themes
+
+
+class Theme:
+    """Everything a theme swaps. Art names are relative to assets/ and may be missing."""
+
+    __slots__ = (
+        "name", "background", "tabbar", "checkbox_checked", "checkbox_unchecked",
+        "accent", "on_accent", "page_bg", "panel_bg", "text",
+        "title_font", "item_font", "button_font",
+    )
+
+    def __init__(self, name, *, background=None, tabbar=None,
+                 checkbox_checked="checkbox_checked_purple.png",
+                 checkbox_unchecked="checkbox_unchecked.png",
+                 accent="#6a1b9a", on_accent="white", page_bg="#e7cbff",
+                 panel_bg="white", text="black",
+                 title_font=("Consolas", 28, "bold"), item_font=("Consolas", 14),
+                 button_font=("Consolas", 12, "bold")):
+        self.name = name
+        self.background = background
+        self.tabbar = tabbar
+        self.checkbox_checked = checkbox_checked
+        self.checkbox_unchecked = checkbox_unchecked
+        self.accent = accent
+        self.on_accent = on_accent
+        self.page_bg = page_bg
+        self.panel_bg = panel_bg
+        self.text = text
+        self.title_font = title_font
+        self.item_font = item_font
+        self.button_font = button_font
+
+    def copy(self, name=None, **changes) -> "Theme":
+        fields = {k: getattr(self, k) for k in self.__slots__ if k != "name"}
+        fields.update(changes)
+        return Theme(name or self.name, **fields)
+
+
+# theme art lives in assets/themes/<folder>/; a theme without art falls back to flat colours
+THEMES = (
+    Theme(
+        "Default",
+        background="app_background.png",
+        tabbar="tabbar.png",
+    ),
+    Theme(
+        "Goth Girly",
+        background="themes/goth_girly/app_background.png",
+        tabbar="themes/goth_girly/tabbar.png",
+        checkbox_checked="themes/goth_girly/checkbox_checked.png",
+        checkbox_unchecked="themes/goth_girly/checkbox_unchecked.png",
+        accent="#c2185b", page_bg="#2b1b2e", panel_bg="#fff0f6", text="#1a1a1a",
+        title_font=("Georgia", 28, "bold italic"),
+    ),
+    Theme(
+        "Pastel Gamer",
+        background="themes/pastel_gamer/app_background.png",
+        tabbar="themes/pastel_gamer/tabbar.png",
+        checkbox_checked="themes/pastel_gamer/checkbox_checked.png",
+        checkbox_unchecked="themes/pastel_gamer/checkbox_unchecked.png",
+        accent="#5c6bc0", page_bg="#d6f5ef", panel_bg="#fdfdff", text="#37474f",
+        title_font=("Courier New", 26, "bold"), item_font=("Courier New", 14),
+        button_font=("Courier New", 12, "bold"),
+    ),
+)
+DEFAULT_THEME = THEMES[0].name
+
+
+class ThemeManager:
+    """Owns the theme list and keeps inactive themes' images decoded and scaled.
+
+    Sprites are turned into PhotoImages once per theme. Background and tab bar
+    art for the themes that are *not* showing is resampled on the resampler's
+    worker pool at the current window size, so a switch only has to swap
+    PhotoImages that are already in the image cache.
+    """
+
+    def __init__(self, root, store, resampler, themes=THEMES):
+        self.root = root
+        self.store = store
+        self.resampler = resampler
+        self.themes: dict[str, Theme] = {t.name: t for t in themes}
+        self.active: Theme = self.themes[DEFAULT_THEME]
+        self._sprites: dict[str, tuple] = {}  # theme name -> (unchecked, checked)
+        self._sizes = None                    # ((bg w, h), (tab w, h)) to prewarm at
+        self._prewarm_id = None
+
+    def names(self) -> list[str]:
+        return list(self.themes)
+
+    def get(self, name: str) -> Theme:
+        return self.themes[name]
+
+    def activate(self, name: str) -> Theme:
+        self.active = self.themes[name]
+        self.schedule_prewarm()  # the old theme is now one of the inactive ones
+        return self.active
+
+    def set_custom(self, base: Theme, **changes) -> Theme:
+        theme = base.copy("Custom", **changes)
+        self.themes["Custom"] = theme
+        self._sprites.pop("Custom", None)
+        return theme
+
+    # ---------- art ----------
+    def art(self, name: str | None) -> str | None:
+        return name if name and self.store.exists(name) else None
+
+    def sprites(self, theme: Theme) -> tuple:
+        """(unchecked, checked) PhotoImages; a theme missing sprites borrows the default ones."""
+        pair = self._sprites.get(theme.name)
+        if pair is None:
+            default = self.themes[DEFAULT_THEME]
+            imgs = []
+            for name, fallback in (
+                (theme.checkbox_unchecked, default.checkbox_unchecked),
+                (theme.checkbox_checked, default.checkbox_checked),
+            ):
+                src = self.store.source(self.art(name) or fallback)
+                imgs.append(ImageTk.PhotoImage(src) if src is not None else None)
+            pair = tuple(imgs)
+            self._sprites[theme.name] = pair
+        return pair
+
+    # ---------- prewarm ----------
+    def set_sizes(self, bg_size: tuple, tab_size: tuple):
+        sizes = (bg_size, tab_size)
+        if sizes != self._sizes:
+            self._sizes = sizes
+            self.schedule_prewarm()
+
+    def schedule_prewarm(self):
+        # debounced: a resize storm only warms the size it ends on
+        if self._prewarm_id is not None:
+            self.root.after_cancel(self._prewarm_id)
+        self._prewarm_id = self.root.after(PREWARM_DELAY_MS, self.prewarm)
+
+    def prewarm(self):
+        self._prewarm_id = None
+        if self._sizes is None:
+            return
+        (bw, bh), (tw, th) = self._sizes
+        for theme in self.themes.values():
+            if theme is self.active:
+                continue
+            bg = self.art(theme.background)
+            if bg is not None and bw > 4 and bh > 4:
+                self.resampler.prefetch(bg, bw, bh)
+            tab = self.art(theme.tabbar)
+            if tab is not None and tw > 1:
+                self.resampler.prefetch(tab, tw, th)
+            self.sprites(theme)  # tiny, decoded here
+
+    def cancel(self):
+        if self._prewarm_id is not None:
+            self.root.after_cancel(self._prewarm_id)
+            self._prewarm_id = None
@@ -0,0 +1,255 @@
+# timer.py
+# Task timer logic (Tools -> Task Timer): stopwatches and countdowns on many tasks, one tick
+
+import heapq
+import math
+import time
+
+from file_manager import read_json, write_json
+
+STATE_VERSION = 1
+GRID_S = 0.25  # display changes are rounded up to this grid so neighbours share a tick
+BOOT_SLACK_S = 2.0  # wall - monotonic drift (clock slew) still counted as the same boot
+
+
+def fmt(seconds: int) -> str:
+    m, s = divmod(max(0, int(seconds)), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+class Timer:
+    """One task's timer. Time only accrues between resume and pause, off the monotonic clock."""
+
+    __slots__ = ("task_id", "kind", "duration", "elapsed", "started", "finished")
+
+    def __init__(self, task_id: int, kind: str, duration: float = 0.0):
+        self.task_id = task_id
+        self.kind = kind            # "stopwatch" or "countdown"
+        self.duration = duration    # countdown length in seconds
+        self.elapsed = 0.0          # banked running time
+        self.started = None         # monotonic time of the last resume, None while paused
+        self.finished = False
+
+    @property
+    def running(self) -> bool:
+        return self.started is not None
+
+    def elapsed_at(self, now: float) -> float:
+        return self.elapsed + (now - self.started if self.started is not None else 0.0)
+
+    def value(self, now: float) -> int:
+        # whole seconds shown: counted up, or left (rounded up, so 0:00 means done)
+        t = self.elapsed_at(now)
+        if self.kind == "countdown":
+            return max(0, math.ceil(self.duration - t - 1e-9))
+        return int(t)
+
+    def next_change(self, now: float) -> float | None:
+        """Monotonic time the shown value next changes (countdowns: also when they hit zero)."""
+        if self.started is None:
+            return None
+        t = self.elapsed_at(now)
+        if self.kind == "countdown":
+            left = self.duration - t
+            if left <= 0:
+                return None
+            step = left - math.floor(left - 1e-9) if left > 1 else left
+        else:
+            step = math.floor(t) + 1 - t
+        return now + step
+
+
+class TaskTimer:
+    """Every timer shares one heap of (due, task id, generation) and one tick.
+
+    Only timers on rows the UI says are visible (watch()) get a wakeup per
+    displayed second; the rest only wake when a countdown runs out. Due
+    times are rounded up to GRID_S, so hundreds of timers cost at most a
+    few ticks a second, and none at all when nothing on screen is running.
+    Stale heap entries are skipped by their generation number.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._timers: dict[int, Timer] = {}
+        self._heap: list[tuple[float, int, int]] = []
+        self._gen: dict[int, int] = {}
+        self._watched: frozenset = frozenset()
+        self._shown: dict[int, str] = {}  # last label handed out per watched timer
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._timers
+
+    def __iter__(self):
+        return iter(self._timers.values())
+
+    def get(self, task_id: int) -> Timer | None:
+        return self._timers.get(task_id)
+
+    def label(self, task_id: int) -> str:
+        timer = self._timers.get(task_id)
+        if timer is None:
+            return ""
+        text = fmt(timer.value(self.clock()))
+        if task_id in self._watched:
+            self._shown[task_id] = text
+        return text
+
+    # ---------- control ----------
+    def start_stopwatch(self, task_id: int) -> Timer:
+        return self._start(Timer(task_id, "stopwatch"))
+
+    def start_countdown(self, task_id: int, seconds: float) -> Timer:
+        return self._start(Timer(task_id, "countdown", float(seconds)))
+
+    def pause(self, task_id: int):
+        timer = self._timers.get(task_id)
+        if timer is not None and timer.running:
+            timer.elapsed = timer.elapsed_at(self.clock())
+            timer.started = None
+            self._reschedule(timer)
+
+    def resume(self, task_id: int):
+        timer = self._timers.get(task_id)
+        if timer is not None and not timer.running and not timer.finished:
+            timer.started = self.clock()
+            self._reschedule(timer)
+
+    def stop(self, task_id: int) -> Timer | None:
+        timer = self._timers.pop(task_id, None)
+        if timer is not None:
+            self._gen[task_id] = self._gen.get(task_id, 0) + 1  # orphan its heap entries
+            self._shown.pop(task_id, None)
+        return timer
+
+    def clear(self):
+        self._timers.clear()
+        self._heap.clear()
+        self._gen.clear()
+        self._shown.clear()
+        self._watched = frozenset()
+
+    def watch(self, task_ids) -> bool:
+        """Tell the timer which tasks are on screen; only those tick every second."""
+        ids = frozenset(i for i in task_ids if i in self._timers)
+        if ids == self._watched:
+            return False
+        changed = ids ^ self._watched
+        self._watched = ids
+        for tid in changed:
+            if tid not in ids:
+                self._shown.pop(tid, None)
+            timer = self._timers.get(tid)
+            if timer is not None:
+                self._reschedule(timer)
+        return True
+
+    # ---------- ticking ----------
+    def next_due(self) -> float | None:
+        heap = self._heap
+        while heap and heap[0][2] != self._gen.get(heap[0][1]):
+            heapq.heappop(heap)  # stale
+        return heap[0][0] if heap else None
+
+    def tick(self) -> tuple[set, list]:
+        """Pop everything due; returns (watched ids whose label changed, ids whose countdown finished)."""
+        now = self.clock()
+        heap = self._heap
+        changed, finished = set(), []
+        while heap and heap[0][0] <= now:
+            _, tid, gen = heapq.heappop(heap)
+            if gen != self._gen.get(tid):
+                continue
+            timer = self._timers[tid]
+            if timer.kind == "countdown" and timer.running and timer.elapsed_at(now) >= timer.duration - 1e-6:
+                timer.elapsed = timer.duration
+                timer.started = None
+                timer.finished = True
+                finished.append(tid)
+            if tid in self._watched:
+                text = fmt(timer.value(now))
+                if self._shown.get(tid) != text:
+                    self._shown[tid] = text
+                    changed.add(tid)
+            self._reschedule(timer, now)
+        return changed, finished
+
+    def _start(self, timer: Timer) -> Timer:
+        self.stop(timer.task_id)
+        self._timers[timer.task_id] = timer
+        timer.started = self.clock()
+        self._reschedule(timer)
+        return timer
+
+    def _reschedule(self, timer: Timer, now: float | None = None):
+        tid = timer.task_id
+        gen = self._gen.get(tid, 0) + 1
+        self._gen[tid] = gen
+        if now is None:
+            now = self.clock()
+        if tid in self._watched:
+            due = timer.next_change(now)
+        elif timer.kind == "countdown" and timer.running:
+            due = now + max(0.0, timer.duration - timer.elapsed_at(now))
+        else:
+            due = None  # off-screen stopwatch or paused: nothing to do until it is seen
+        if due is not None:
+            due = math.ceil(due / GRID_S) * GRID_S
+            heapq.heappush(self._heap, (due, tid, gen))
+
+    # ---------- persistence ----------
+    def checkpoint(self, tasks) -> dict:
+        """Timers of `tasks` as plain data; rows are matched by slot + text on restore."""
+        mono, wall = self.clock(), time.time()
+        rows = []
+        for timer in self._timers.values():
+            task = tasks.by_id(timer.task_id)
+            if task is None:
+                continue
+            rows.append({
+                "slot": task.slot,
+                "text": task.text,
+                "kind": timer.kind,
+                "duration": timer.duration,
+                "elapsed": round(timer.elapsed_at(mono), 3),
+                "running": timer.running,
+                "finished": timer.finished,
+            })
+        return {"mono": mono, "wall": wall, "timers": rows}
+
+    def restore(self, state: dict, tasks):
+        """Reattach saved timers; running ones also get the time that passed while closed."""
+        mono, wall = self.clock(), time.time()
+        # wall - mono is when the monotonic clock started: if that moved, this is
+        # another boot (or the machine slept), so the monotonic gap means nothing
+        saved_mono, saved_wall = state.get("mono"), state.get("wall", wall)
+        if saved_mono is not None and abs((wall - mono) - (saved_wall - saved_mono)) <= BOOT_SLACK_S:
+            gap = max(0.0, mono - saved_mono)
+        else:
+            gap = max(0.0, wall - saved_wall)
+        for row in state.get("timers", ()):
+            task = tasks.get(row["slot"])
+            if task is None or task.text != row["text"]:
+                continue  # list changed outside the app
+            timer = Timer(task.id, row["kind"], row.get("duration", 0.0))
+            timer.elapsed = row.get("elapsed", 0.0) + (gap if row.get("running") else 0.0)
+            timer.finished = row.get("finished", False)
+            if row.get("running"):
+                timer.started = mono
+            self._timers[task.id] = timer
+            self._reschedule(timer)
+
+
+def load_state(path) -> dict:
+    data = read_json(path)
+    if data is None or data.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "lists": {}}
+    return data
+
+
+def save_state(path, data: dict):
+    write_json(path, data)
@@ -2,37 +2,99 @@
 # ui_main.py
 # Canvas-based UI for "Checklist Quest"
 
+import bisect
+import sqlite3
+import time
 import tkinter as tk
 from pathlib import Path
-from PIL import Image, ImageTk
-
-PURPLE = "#6a1b9a"
-PAGE_BG_FALLBACK = "#e7cbff"  # light purple that matches your art
-
-ASSETS_DIR = Path(__file__).parent / "assets"
+from tkinter import colorchooser, filedialog, messagebox, simpledialog, ttk
+from PIL import ImageTk
+
+from asset_store import AssetStore
+from autosave import Autosave
+from config import ASSETS_DIR, ASSET_CACHE_DIR, DATA_DIR, PROFILE, TIMERS_PATH, WORKSPACE_PATH
+from file_manager import FileManager, LIST_EXT
+from exporter import ExportJob, CHUNK_ROWS
+from importer import ImportJob
+from perf import Profiler
+from pin_window import PinWindow
+from sqlite_store import SqliteFileManager, DB_EXT
+from image_cache import ScaledImageCache
+from render_scheduler import RenderScheduler, DEFAULT_MAX_FPS
+from resampler import ProgressiveResampler
+from search_index import TaskIndex
+from tasks import TaskList
+from text_fit import TextFitter
+from undo import UndoLog
+from theme_manager import ThemeManager
+from timer import TaskTimer, load_state as load_timer_state, save_state as save_timer_state
+from workspace import ListEntry, Workspace, load_state as load_workspace_state, save_state as save_workspace_state
+from xp_manager import XPManager, XP_DONE, XP_LIST
+
+
+# import inserts rows in short slices so the window keeps repainting
+IMPORT_TICK_MS = 10
+IMPORT_BUDGET_S = 0.008
+
+# pooled row "index" meaning "showing something, but rebind me" (None = hidden)
+STALE_ROW = -1
+
+# methods timed while profiling is on; scheduler passes call them by name so the wrappers apply
+HOT_PATHS = (
+    "_render_tabbar", "_render_backgrounds", "_render_header_panel", "_apply_filter",
+    "_step_scroll", "_layout_canvas_list", "_add_item_from_bar", "_toggle_item",
+    "_start_edit_item", "_finish_edit_item",
+)
+PERF_OVERLAY_MS = 500
 
 
 class ChecklistUI:
-    def __init__(self, root: tk.Tk):
+    # widget option -> Theme attribute, see _skin
+    ENTRY_ROLES = {"font": "item_font", "bg": "panel_bg", "fg": "text", "insertbackground": "accent"}
+    BUTTON_ROLES = {
+        "font": "button_font", "bg": "accent", "fg": "on_accent",
+        "activebackground": "accent", "activeforeground": "on_accent",
+    }
+
+    def __init__(self, root: tk.Tk, max_fps: int = DEFAULT_MAX_FPS):
         self.root = root
 
-        # image storage
-        self.base_tabbar_img = None
-        self.base_app_bg_img = None
+        # all redraws go through here so resize storms coalesce per frame
+        self.scheduler = RenderScheduler(root, max_fps=max_fps)
+        # off unless CHECKLIST_QUEST_PROFILE is set or the overlay is turned on
+        self.profiler = Profiler()
+        self._profiling = False  # profiler.enabled is already true once _load_images is wrapped
+        self._perf_after = None
+        self._perf_ids = None
+
+        # image storage (big art is decoded lazily, see _load_images)
+        self.tabbar_asset = None
+        self.app_bg_asset = None
         self.checkbox_unchecked = None
         self.checkbox_checked = None
         self.icon_min = None
         self.icon_max = None
         self.icon_close = None
         self.images: dict[str, object] = {}
+        self.assets = AssetStore(ASSETS_DIR, ASSET_CACHE_DIR)
+        self.image_cache = ScaledImageCache()
+        self.resampler = ProgressiveResampler(root, self.image_cache, self.assets)
+        # colours / fonts / art come from the active theme; _skinned widgets get recoloured on switch
+        self.themes = ThemeManager(root, self.assets, self.resampler)
+        self.theme = self.themes.active
+        self._skinned: list[tuple[object, dict]] = []
 
         self.title_height = 60
         self._drag_data = {"x": 0, "y": 0}
         self._is_maximized = False
         self._original_geom = ""
+        self._tabbar_w = 0
+        self._tabbar_img_id = None
 
         # build basic window + UI structure
         self._build_window()
+        if PROFILE:
+            self.profiler.instrument(self, ("_load_images",))
         self._load_images()
         self._build_menus()
         self._build_titlebar()
@@ -45,75 +107,268 @@ class ChecklistUI:
         self.list_padx = 24
         self.list_start_y = 172
         self.row_h = 35.6
+        self.list_bottom_pad = 24
+        self.page_rows = 20  # rows per page before the canvas has a real size
+
+        # virtual scroll position in pixels (eased toward _scroll_target)
+        self.scroll_y = 0.0
+        self._scroll_target = 0.0
+        self._first_row = 0
+        self._edit_idx = None
+
+        # last geometry pushed to the canvas, so layout can diff against it
+        self._list_base_y = None
+        self._list_geom_x = None
+        self._list_entry_w = None
+        # long task texts are cut to the page width with an ellipsis (memoized, see text_fit.py)
+        self.fitter = TextFitter(root)
+        self._list_text_w = None
+        self._timer_reserve = 0
+
+        # shared inline editor, see _ensure_editor
+        self._editor = None
+        self._editor_win_id = None
 
         self._build_title()
-        
-        self.max_rows = 20
-        self.item_texts = [""] * self.max_rows
+
+        # backing task store; unbounded, the canvas only ever shows a page of it
+        self.tasks = TaskList(self.title_var.get())
+        self.files = FileManager(self.tasks)
+        self.autosave = Autosave(root, self.files)
+        # live filter: _view_slots is None (show every row) or the sorted matching slots
+        self.search = TaskIndex(self.tasks)
+        self.search.on_change = self._on_index_change
+        self._view_slots = None
+        self._filter_query = ""
+        self._filter_stale = False
+
+        # undo / redo deltas; _replaying keeps undo's own changes out of the log
+        self.history = UndoLog()
+        self._replaying = False
+        # per-task stopwatches / countdowns: one heap, one after() tick (see timer.py)
+        self.timers = TaskTimer()
+        self._timer_after = None
+        self._timer_dirty: set[int] = set()
+        self._timer_state = load_timer_state(TIMERS_PATH)
+
+        # XP / streaks / stickers: running totals fed by add, toggle and clear
+        self.xp = XPManager(DATA_DIR)
+        self._xp_windows: dict[str, tk.Toplevel] = {}
+        self._toast_id = None
+        self._toast_after = None
+        self._xp_after = None
+        # File -> Pin to Desktop; follows the active list, see pin_window.py
+        self.pin = None
+
+        # lists open side by side; only the active one is bound to the canvas rows
+        self.workspace = Workspace()
+        entry = self.workspace.add(ListEntry(files=self.files, tasks=self.tasks))
+        entry.index, entry.history = self.search, self.history
+        self.workspace.touch(entry)
+
+        self._import_job = None
+        self._export_job = None
+        self._export_cursor = 0
+        self.title_var.trace_add("write", lambda *a: self._on_title_change())
         self._build_add_bar()
         self._build_list()
 
+        # flush order: tab bar, background, header panel, then list on top
+        self.scheduler.add_pass("tabbar", lambda: self._render_tabbar())
+        self.scheduler.add_pass("background", lambda: self._render_backgrounds())
+        self.scheduler.add_pass("header", lambda: self._render_header_panel())
+        self.scheduler.add_pass("filter", lambda: self._apply_filter())
+        self.scheduler.add_pass("scroll", lambda: self._step_scroll())
+        self.scheduler.add_pass("list", lambda: self._layout_canvas_list())
+        self.scheduler.add_pass("timers", lambda: self._render_timers())
+        if PROFILE:
+            self._set_profiling(True)
+        self._restore_workspace()
+
+        # first render once layout settles
+        self.scheduler.mark()
+
+    # ---------- themes ----------
+    def _skin(self, widget, **roles):
+        """Colour / font a widget from the theme now, and again on every theme switch."""
+        widget.configure(**{opt: getattr(self.theme, role) for opt, role in roles.items()})
+        self._skinned.append((widget, roles))
+        return widget
+
+    def _apply_theme(self, name: str):
+        theme = self.themes.activate(name)
+        if theme is self.theme:
+            return
+        self.theme = theme
+        self.theme_var.set(theme.name)
+
+        for widget, roles in self._skinned:
+            widget.configure(**{opt: getattr(theme, role) for opt, role in roles.items()})
+
+        # recolour pass over canvas tags; pooled rows keep their items
+        self.title_canvas.itemconfigure("tabbar_fill", fill=theme.accent)
+        if self.header_panel_id is not None:
+            self.canvas.itemconfigure(self.header_panel_id, fill=theme.panel_bg)
+        fill = theme.accent if self._view_slots is not None else theme.text
+        self.canvas.itemconfigure("row_text", fill=fill, font=theme.item_font)
+        self.canvas.itemconfigure("row_timer", fill=theme.accent, font=theme.button_font)
+
+        # sprites were decoded ahead of time, only the bound rows need the new pair
+        self.checkbox_unchecked, self.checkbox_checked = self.themes.sprites(theme)
+        for item in self.canvas_items:
+            task = None if item["index"] in (None, STALE_ROW) else self.tasks.get(item["index"])
+            img = self.checkbox_checked if task is not None and task.done else self.checkbox_unchecked
+            self.canvas.itemconfigure(item["cb_id"], image=img)
+
+        # art: prewarmed sizes come straight out of the image cache
+        self.tabbar_asset = self.themes.art(theme.tabbar)
+        self.app_bg_asset = self.themes.art(theme.background)
+        self._tabbar_w = 0
+        self._bg_size = (0, 0)
+        self._list_text_w = None  # new item font: texts get cut again on the next layout
+        if self.pin is not None:
+            self.pin.set_theme(theme)
+        self.scheduler.mark("tabbar", "background", "list")
+
+    def _custom_theme(self):
+        _, accent = colorchooser.askcolor(color=self.theme.accent, title="Custom Theme: Accent Colour")
+        if accent is None:
+            return
+        # background art is optional, cancel keeps the current one
+        path = filedialog.askopenfilename(
+            title="Custom Theme: Background Image (optional)",
+            filetypes=[("Images", "*.png *.jpg *.jpeg *.gif *.bmp"), ("All files", "*.*")],
+        )
+        changes = {"accent": accent}
+        if path:
+            changes["background"] = path
+        self.themes.set_custom(self.theme, **changes)
+        if "Custom" not in self._theme_menu_names:
+            self._theme_menu_names.append("Custom")
+            self.themes_menu.insert_radiobutton(
+                len(self._theme_menu_names) - 1,
+                label="Custom",
+                variable=self.theme_var,
+                value="Custom",
+                command=lambda: self._apply_theme("Custom"),
+            )
+        self._apply_theme("Custom")
 
-        # # DEBUG + first render
-        # print("=== ABOUT TO CALL _render_backgrounds DIRECTLY ===")
-        # self._render_backgrounds()
-        # print("=== RETURNED FROM _render_backgrounds ===")
-
-        # re-render after layout settles
-        self.root.after(50, self._render_backgrounds)
+    # ---------- profiling ----------
+    def _set_profiling(self, on: bool):
+        if on == self._profiling:
+            return
+        self._profiling = on
+        p = self.profiler
+        if on:
+            p.instrument(self, HOT_PATHS)
+            p.count_tcl(self.canvas)
+            self.scheduler.on_mark = p.on_event
+            self.scheduler.on_frame = p.on_frame
+        else:
+            p.restore()
+            self.scheduler.on_mark = None
+            self.scheduler.on_frame = None
+
+    def _toggle_perf_overlay(self):
+        if self.perf_overlay_var.get():
+            self._set_profiling(True)
+            self._update_perf_overlay()
+        else:
+            self._hide_perf_overlay()
+            if not PROFILE:
+                self._set_profiling(False)
+
+    def _update_perf_overlay(self):
+        self._perf_after = None
+        snap = self.profiler.frame_stats()
+        text = (
+            f"frame {snap['frame_ms']:.1f} ms (max {snap['frame_max_ms']:.1f})  "
+            f"{snap['fps']:.0f} fps  {self.profiler.event_rate():.0f} ev/s"
+        )
+        x = self.list_padx
+        y = max(0, self.canvas.winfo_height() - 6)
+        # drawn through the original methods so the overlay doesn't count itself
+        c = tk.Canvas
+        if self._perf_ids is None:
+            bg = c.create_rectangle(self.canvas, 0, 0, 0, 0, fill=self.theme.panel_bg, outline=self.theme.accent, tags=("perf_overlay",))
+            txt = c.create_text(
+                self.canvas, x, y, text=text, anchor="sw", fill=self.theme.accent,
+                font=("Consolas", 9), tags=("perf_overlay",),
+            )
+            self._perf_ids = (bg, txt)
+        bg, txt = self._perf_ids
+        c.coords(self.canvas, txt, x, y)
+        c.itemconfigure(self.canvas, txt, text=text)
+        box = c.bbox(self.canvas, txt)
+        if box:
+            c.coords(self.canvas, bg, box[0] - 4, box[1] - 2, box[2] + 4, box[3] + 2)
+        c.tag_raise(self.canvas, "perf_overlay")
+        self._perf_after = self.root.after(PERF_OVERLAY_MS, self._update_perf_overlay)
+
+    def _hide_perf_overlay(self):
+        if self._perf_after is not None:
+            self.root.after_cancel(self._perf_after)
+            self._perf_after = None
+        if self._perf_ids is not None:
+            tk.Canvas.delete(self.canvas, "perf_overlay")
+            self._perf_ids = None
+
+    def _dump_perf(self):
+        if not self.profiler.enabled:
+            messagebox.showinfo(
+                "Performance Stats",
+                "Nothing recorded yet. Turn on Tools > Performance Overlay first.",
+            )
+            return
+        path = filedialog.asksaveasfilename(
+            title="Dump Performance Stats",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            self.profiler.dump(path)
+        except OSError as e:
+            messagebox.showerror("Performance Stats", f"Could not write stats:\n{e}")
 
     # ---------- window ----------
     def _build_window(self):
         self.root.title("Checklist Quest")
         self.root.geometry("600x800")
         self.root.minsize(600, 800)
-        self.root.configure(bg=PAGE_BG_FALLBACK)
+        self._skin(self.root, bg="page_bg")
         self.root.overrideredirect(True)  # remove OS title bar
         self.root.bind("<Configure>", self._on_resize)
+        self.root.bind("<Control-z>", lambda e: self._undo())
+        self.root.bind("<Control-y>", lambda e: self._redo())
+        self.root.bind("<Control-Z>", lambda e: self._redo())  # Ctrl+Shift+Z
+        self.root.bind("<Control-Tab>", lambda e: self._step_list(1))
+        self.root.bind("<Control-Shift-Tab>", lambda e: self._step_list(-1))
+        self.root.bind("<Control-ISO_Left_Tab>", lambda e: self._step_list(-1))  # X11's Shift+Tab
 
     # ---------- load images ----------
     def _load_images(self):
-        print("ASSETS_DIR =", ASSETS_DIR.resolve())
-
-        def dbg(name: str):
-            p = ASSETS_DIR / name
-            print(name, "exists:", p.exists(), "->", p)
-            return p
-
-        # tab bar (top)
-        p = dbg("tabbar.png")
-        if p.exists():
-            self.base_tabbar_img = Image.open(p).convert("RGBA")
+        # Only the tiny sprites are decoded here. The tab bar and background
+        # are just checked for existence; their scaled variants come from the
+        # on-disk cache (warm start) or a worker thread (cold start).
+        self.tabbar_asset = self.themes.art(self.theme.tabbar)
 
         # SINGLE full-window background image (your merged art)
-        p = dbg("app_background.png")
-        if p.exists():
-            self.base_app_bg_img = Image.open(p).convert("RGBA")
-        else:
-            self.base_app_bg_img = None
-
-        # checkboxes
-        p_unchecked = dbg("checkbox_unchecked.png")
-        p_checked = dbg("checkbox_checked_purple.png")
-        if p_unchecked.exists() and p_checked.exists():
-            self.checkbox_unchecked = ImageTk.PhotoImage(
-                Image.open(p_unchecked).convert("RGBA")
-            )
-            self.checkbox_checked = ImageTk.PhotoImage(
-                Image.open(p_checked).convert("RGBA")
-            )
-            self.images["cb_unchecked"] = self.checkbox_unchecked
-            self.images["cb_checked"] = self.checkbox_checked
+        self.app_bg_asset = self.themes.art(self.theme.background)
+
+        # checkboxes (the theme manager keeps one pair per theme)
+        self.checkbox_unchecked, self.checkbox_checked = self.themes.sprites(self.theme)
 
         # window icons
         def load_icon(name: str, size=(20, 20)):
-            p = dbg(name)
-            if p.exists():
-                img = Image.open(p).convert("RGBA").resize(size, Image.BILINEAR)
-                tk_img = ImageTk.PhotoImage(img)
-                self.images[name] = tk_img
-                return tk_img
-            return None
+            img = self.assets.scaled(name, *size)
+            if img is None:
+                return None
+            tk_img = ImageTk.PhotoImage(img)
+            self.images[name] = tk_img
+            return tk_img
 
         self.icon_min = load_icon("minimize.png")
         self.icon_max = load_icon("maximize.png")
@@ -122,18 +377,29 @@ class ChecklistUI:
     # ---------- menus ----------
     def _build_menus(self):
         self.file_menu = tk.Menu(self.root, tearoff=0)
-        self.file_menu.add_command(label="New List", command=self._todo)
-        self.file_menu.add_command(label="Open...", command=self._todo)
-        self.file_menu.add_command(label="Save", command=self._todo)
-        self.file_menu.add_command(label="Save As...", command=self._todo)
+        self.file_menu.add_command(label="New List", command=self._new_list)
+        self.file_menu.add_command(label="Open...", command=self._open_list)
+        self.file_menu.add_command(label="Save", command=self._save_list)
+        self.file_menu.add_command(label="Save As...", command=self._save_list_as)
+        self.file_menu.add_command(label="Close List", command=self._close_list)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Export...", command=self._todo)
-        self.file_menu.add_command(label="Import...", command=self._todo)
+        # one entry per open list, rebuilt when the cascade opens (titles change as you type)
+        self.list_var = tk.IntVar(value=0)
+        self.lists_menu = tk.Menu(self.file_menu, tearoff=0, postcommand=self._fill_lists_menu)
+        self.file_menu.add_cascade(label="Open Lists", menu=self.lists_menu)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Pin to Desktop", command=self._todo)
+        self.export_menu = tk.Menu(self.file_menu, tearoff=0)
+        self.export_menu.add_command(label="All Tasks...", command=lambda: self._export_tasks("all"))
+        self.export_menu.add_command(label="Completed Only...", command=lambda: self._export_tasks("completed"))
+        self.export_menu.add_command(label="Pending Only...", command=lambda: self._export_tasks("pending"))
+        self.file_menu.add_cascade(label="Export...", menu=self.export_menu)
+        self.file_menu.add_command(label="Import...", command=self._import_tasks)
+        self.file_menu.add_separator()
+        self.pin_var = tk.BooleanVar(value=False)
+        self.file_menu.add_checkbutton(label="Pin to Desktop", variable=self.pin_var, command=self._toggle_pin)
         self.file_menu.add_command(label="Reset Template", command=self._todo)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Exit", command=self.root.quit)
+        self.file_menu.add_command(label="Exit", command=self._exit)
 
         self.settings_menu = tk.Menu(self.root, tearoff=0)
         self.settings_menu.add_command(label="Title Font...", command=self._todo)
@@ -145,18 +411,41 @@ class ChecklistUI:
         self.settings_menu.add_command(label="Bullet Style...", command=self._todo)
 
         self.themes_menu = tk.Menu(self.root, tearoff=0)
-        self.themes_menu.add_command(label="Default", command=self._todo)
-        self.themes_menu.add_command(label="Goth Girly", command=self._todo)
-        self.themes_menu.add_command(label="Pastel Gamer", command=self._todo)
-        self.themes_menu.add_command(label="Custom...", command=self._todo)
+        self.theme_var = tk.StringVar(value=self.theme.name)
+        self._theme_menu_names = self.themes.names()
+        for name in self._theme_menu_names:
+            self.themes_menu.add_radiobutton(
+                label=name,
+                variable=self.theme_var,
+                value=name,
+                command=lambda name=name: self._apply_theme(name),
+            )
+        self.themes_menu.add_separator()
+        self.themes_menu.add_command(label="Custom...", command=self._custom_theme)
 
         self.tools_menu = tk.Menu(self.root, tearoff=0)
-        self.tools_menu.add_command(label="Task Timer", command=self._todo)
-        self.tools_menu.add_command(label="Clear Completed", command=self._todo)
+        self.timer_menu = tk.Menu(self.tools_menu, tearoff=0)
+        self.timer_menu.add_command(label="Pause All", command=lambda: self._all_timers("pause"))
+        self.timer_menu.add_command(label="Resume All", command=lambda: self._all_timers("resume"))
+        self.timer_menu.add_command(label="Stop All", command=lambda: self._all_timers("stop"))
+        self.timer_menu.add_separator()
+        self.timer_menu.add_command(label="(right-click a task to time it)", state="disabled")
+        self.tools_menu.add_cascade(label="Task Timer", menu=self.timer_menu)
+        self.tools_menu.add_command(label="Clear Completed", command=self._clear_completed)
+        self.tools_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self._undo)
+        self.tools_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self._redo)
+        self.tools_menu.add_separator()
+        self.perf_overlay_var = tk.BooleanVar(value=False)
+        self.tools_menu.add_checkbutton(
+            label="Performance Overlay",
+            variable=self.perf_overlay_var,
+            command=self._toggle_perf_overlay,
+        )
+        self.tools_menu.add_command(label="Dump Performance Stats...", command=self._dump_perf)
 
         self.xp_menu = tk.Menu(self.root, tearoff=0)
-        self.xp_menu.add_command(label="My Stickers", command=self._todo)
-        self.xp_menu.add_command(label="Progress", command=self._todo)
+        self.xp_menu.add_command(label="My Stickers", command=self._open_stickers_window)
+        self.xp_menu.add_command(label="Progress", command=self._open_progress_window)
         self.xp_menu.add_separator()
         self.xp_menu.add_command(
             label="Watch Ad for Sticker (coming soon)",
@@ -171,8 +460,8 @@ class ChecklistUI:
             height=self.title_height,
             highlightthickness=0,
             bd=0,
-            bg=PURPLE,
         )
+        self._skin(self.title_canvas, bg="accent")
         self.title_canvas.pack(fill="x", side="top")
 
         self._render_tabbar()
@@ -183,56 +472,73 @@ class ChecklistUI:
         self.title_canvas.bind("<Button-1>", self._on_title_click)
 
     def _build_add_bar(self):
-        self.add_bar = tk.Frame(self.content, bg="white", bd=0, highlightthickness=0)
+        self.add_bar = self._skin(tk.Frame(self.content, bd=0, highlightthickness=0), bg="panel_bg")
         self.add_bar.pack(fill="x", padx=20, pady=(0, 10))
 
         self.new_item_var = tk.StringVar()
 
-        entry = tk.Entry(
-            self.add_bar,
-            textvariable=self.new_item_var,
-            font=("Consolas", 14),
-            bd=0,
-            highlightthickness=1,
-            relief="solid",
-            bg="#ffffff",
-            insertbackground=PURPLE,
+        entry = self._skin(
+            tk.Entry(
+                self.add_bar,
+                textvariable=self.new_item_var,
+                bd=0,
+                highlightthickness=1,
+                relief="solid",
+            ),
+            **self.ENTRY_ROLES,
         )
         entry.pack(side="left", fill="x", expand=True)
 
-        btn = tk.Button(
-            self.add_bar,
-            text="Add",
-            font=("Consolas", 12, "bold"),
-            bd=0,
-            padx=14,
-            pady=6,
-            bg=PURPLE,
-            fg="white",
-            activebackground=PURPLE,
-            activeforeground="white",
-            command=self._add_item_from_bar,
+        btn = self._skin(
+            tk.Button(
+                self.add_bar,
+                text="Add",
+                bd=0,
+                padx=14,
+                pady=6,
+                command=self._add_item_from_bar,
+            ),
+            **self.BUTTON_ROLES,
         )
         btn.pack(side="left", padx=(10, 0))
 
         entry.bind("<Return>", lambda e: self._add_item_from_bar())
 
+        # filter box: narrows the list as you type (see _apply_filter)
+        self.filter_var = tk.StringVar()
+        self._skin(
+            tk.Label(self.add_bar, text="Find"), font="button_font", bg="panel_bg", fg="accent"
+        ).pack(side="left", padx=(14, 4))
+        filter_entry = self._skin(
+            tk.Entry(
+                self.add_bar,
+                textvariable=self.filter_var,
+                width=12,
+                bd=0,
+                highlightthickness=1,
+                relief="solid",
+            ),
+            **self.ENTRY_ROLES,
+        )
+        filter_entry.pack(side="left")
+        filter_entry.bind("<Escape>", lambda e: self.filter_var.set(""))
+        self.filter_var.trace_add("write", lambda *a: self.scheduler.mark("filter"))
+
     def _render_tabbar(self):
-        self.title_canvas.delete("all")
         width = max(self.root.winfo_width(), 1)
         height = self.title_height
 
-        # bar
-        if self.base_tabbar_img is not None:
-            resized = self.base_tabbar_img.resize((width, height), Image.BILINEAR)
-            self.images["tabbar_scaled"] = ImageTk.PhotoImage(resized)
-            self.title_canvas.create_image(
-                0, 0, anchor="nw", image=self.images["tabbar_scaled"], tags="tabbar"
-            )
-        else:
-            self.title_canvas.create_rectangle(
-                0, 0, width, height, fill=PURPLE, outline="", tags="tabbar"
-            )
+        # root <Configure> also fires on window moves; skip if size is unchanged
+        if width == self._tabbar_w:
+            return
+        self._tabbar_w = width
+        self.title_canvas.delete("all")
+        self._tabbar_img_id = None
+
+        # bar (plain purple until the art is ready, or if there is none)
+        self.title_canvas.create_rectangle(
+            0, 0, width, height, fill=self.theme.accent, outline="", tags=("tabbar", "tabbar_fill")
+        )
 
         # window icons (aligned vertically)
         cy = height // 2
@@ -249,27 +555,48 @@ class ChecklistUI:
                 int(width * 0.98), cy, image=self.icon_close, tags="icons"
             )
 
+        if self.tabbar_asset is not None:
+            # preview now, full-quality bar swapped in by _swap_tabbar
+            photo = self.resampler.request(
+                "tabbar", self.tabbar_asset, width, height, self._swap_tabbar,
+            )
+            if photo is not None:
+                self._swap_tabbar(photo)
+        else:
+            self.resampler.cancel("tabbar")  # a job for the last theme's bar would paint over this
+
+    def _swap_tabbar(self, photo):
+        self.images["tabbar_scaled"] = photo
+        if self._tabbar_img_id is None:
+            self._tabbar_img_id = self.title_canvas.create_image(
+                0, 0, anchor="nw", image=photo, tags="tabbar"
+            )
+            # the bar goes under the window icons
+            if self.title_canvas.find_withtag("icons"):
+                self.title_canvas.tag_lower(self._tabbar_img_id, "icons")
+        else:
+            self.title_canvas.itemconfigure(self._tabbar_img_id, image=photo)
+
     # ---------- canvas + content ----------
     def _build_canvas_and_content(self):
         self.header_panel_id = None
         # main canvas holds background image + content frame
-        self.canvas = tk.Canvas(
-            self.root,
-            highlightthickness=0,
-            bd=0,
-            bg=PAGE_BG_FALLBACK,
+        self.canvas = self._skin(
+            tk.Canvas(self.root, highlightthickness=0, bd=0), bg="page_bg"
         )
         self.canvas.pack(fill="both", expand=True)
 
         # drag from empty canvas
         self.canvas.bind("<ButtonPress-1>", self._start_move)
         self.canvas.bind("<B1-Motion>", self._on_move)
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
 
         # background image will be drawn here
         self.bg_image_id = None
+        self._bg_size = (0, 0)
 
         # content frame (everything except tabbar)
-        self.content = tk.Frame(self.canvas, bg="white", bd=0, highlightthickness=0)
+        self.content = self._skin(tk.Frame(self.canvas, bd=0, highlightthickness=0), bg="panel_bg")
 
         # place content using create_window so it moves with canvas
         self.content_window_id = self.canvas.create_window(
@@ -278,10 +605,11 @@ class ChecklistUI:
             anchor="nw",
             window=self.content,
         )
-    def _render_header_panel(self):
-        # Must run after widgets have sizes
-        self.root.update_idletasks()
+        # title / add bar height feeds the header panel
+        self.content.bind("<Configure>", lambda e: self.scheduler.mark("header"))
 
+    def _render_header_panel(self):
+        # runs from the scheduler, so widget sizes are already settled
         w = self.canvas.winfo_width()
         if w < 10:
             return
@@ -295,7 +623,7 @@ class ChecklistUI:
         if self.header_panel_id is None:
             self.header_panel_id = self.canvas.create_rectangle(
                 0, 0, w, panel_h,
-                fill="white",
+                fill=self.theme.panel_bg,
                 outline=""
             )
         else:
@@ -307,129 +635,182 @@ class ChecklistUI:
         self.canvas.tag_raise(self.header_panel_id)
         self.canvas.tag_raise(self.content_window_id)
 
-
-        # keep content stretched horizontally when canvas resizes
-        def on_canvas_resize(event):
-            # keep content frame stretched
-            self.canvas.itemconfigure(
-                self.content_window_id,
-                width=event.width,
-            )
-
-            # only redraw background when the canvas is actually a real size
-            if event.width > 10 and event.height > 10:
-                
-                print("  on_canvas_resize -> calling _render_backgrounds")
-                self._render_backgrounds()
-                self._render_header_panel()
-
-        self.canvas.bind("<Configure>", on_canvas_resize)
-        
-
-
-
     # # ---------- backgrounds ----------
     def _render_backgrounds(self):
-        if self.base_app_bg_img is None:
-            return
-
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
         if w < 5 or h < 5:
             return
+        # other themes' art gets scaled to this size in the background
+        self.themes.set_sizes((w, h), (self._tabbar_w, self.title_height))
+
+        if self.app_bg_asset is None:
+            # theme without art: flat page colour, and no late swap of the last theme's art
+            self.resampler.cancel("background")
+            if self.bg_image_id is not None:
+                self.canvas.itemconfigure(self.bg_image_id, state="hidden")
+            return
+        if (w, h) == self._bg_size and self.bg_image_id is not None:
+            return
+        self._bg_size = (w, h)
 
-        resized = self.base_app_bg_img.resize((w, h), Image.BILINEAR)
-        self.images["app_bg_scaled"] = ImageTk.PhotoImage(resized)
+        # cached sizes come back instantly; new sizes show a preview until
+        # the worker's resample lands in _swap_background
+        photo = self.resampler.request(
+            "background", self.app_bg_asset, w, h, self._swap_background,
+        )
+        if photo is not None:
+            self._swap_background(photo)
 
+    def _swap_background(self, photo):
+        self.images["app_bg_scaled"] = photo
         if self.bg_image_id is None:
             self.bg_image_id = self.canvas.create_image(
-                0, 0, anchor="nw", image=self.images["app_bg_scaled"]
+                0, 0, anchor="nw", image=photo
             )
             self.canvas.tag_lower(self.bg_image_id)  # ← RIGHT HERE
-        else:
-            self.canvas.itemconfig(
-                self.bg_image_id, image=self.images["app_bg_scaled"]
-            )
 
-        # keep canvas checklist aligned
-        self._layout_canvas_list()
-        
-        self._render_header_panel()
-
-   
+            # new background goes under the panel + list, re-stack them this frame
+            self.scheduler.mark("header", "list")
+        else:
+            self.canvas.itemconfig(self.bg_image_id, image=photo, state="normal")
 
     # ---------- title inside content ----------
     def _build_title(self):
-        self.title_frame = tk.Frame(self.content, bg="white", highlightthickness=0, bd=0)
+        self.title_frame = self._skin(
+            tk.Frame(self.content, highlightthickness=0, bd=0), bg="panel_bg"
+        )
         self.title_frame.pack(fill="x", padx=20, pady=(20, 10))
 
         self.title_var = tk.StringVar(value="Check List Title")
 
-        title_entry = tk.Entry(
-            self.title_frame,
-            textvariable=self.title_var,
-            font=("Consolas", 28, "bold"),
-            bd=0,
-            highlightthickness=0,
-            fg=PURPLE,
-            bg="#ffffff",
-            insertbackground=PURPLE,
+        title_entry = self._skin(
+            tk.Entry(
+                self.title_frame,
+                textvariable=self.title_var,
+                bd=0,
+                highlightthickness=0,
+            ),
+            font="title_font", fg="accent", bg="panel_bg", insertbackground="accent",
         )
         title_entry.pack(fill="x")
 
     # ---------- list ----------
     def _build_list(self):
-        # Canvas-based list (no Frames, no Checkbutton widgets)
+        # Virtualized canvas list: a small pool of rows sized to the viewport
+        # is recycled over the backing TaskList
         self.canvas_items.clear()
+        self._ensure_row_pool(self._rows_fit() + 1)
 
-        # create 12 empty rows
-        for i in range(self.max_rows):
-            var = tk.BooleanVar(value=False)
-
-            # create checkbox image
-            cb_img = self.checkbox_checked if var.get() else self.checkbox_unchecked
-            cb_id = self.canvas.create_image(0, 0, anchor="nw", image=cb_img)
-
-            # create text
-            text_id = self.canvas.create_text(
-                0, 0,
-                anchor="nw",
-                text=self.item_texts[i],
-                font=("Consolas", 14),
-                fill="black"
-            )
+        # wheel: Windows/mac send <MouseWheel>, X11 sends Button-4/5
+        self.canvas.bind("<MouseWheel>", self._on_list_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(3))
 
-            # editing entry (hidden until used)
-            entry = tk.Entry(
+        # initial layout
+        self._layout_canvas_list()
+
+    def _make_row(self):
+        cb_id = self.canvas.create_image(
+            0, 0, anchor="nw", image=self.checkbox_unchecked, state="hidden",
+            tags="list_row",
+        )
+        text_id = self.canvas.create_text(
+            0, 0,
+            anchor="nw",
+            text="",
+            font=self.theme.item_font,
+            fill=self.theme.text,
+            state="hidden",
+            tags=("list_row", "row_text"),
+        )
+        # right-aligned timer readout; empty text when the task has no timer
+        timer_id = self.canvas.create_text(
+            0, 0,
+            anchor="ne",
+            text="",
+            font=self.theme.button_font,
+            fill=self.theme.accent,
+            tags=("list_row", "row_timer"),
+        )
+
+        # "index" is the task this pooled row currently shows (None = unused),
+        # "y" is its line offset below the list's base y (None = not placed yet)
+        row = {
+            "index": None,
+            "y": None,
+            "cb_id": cb_id,
+            "text_id": text_id,
+            "timer_id": timer_id,
+            "timer": "",
+            "fit": None,  # (text, font, width) the shown text was cut for
+        }
+
+        # bindings resolve the task index at click time, rows get recycled
+        self.canvas.tag_bind(cb_id, "<Button-1>", lambda e, row=row: self._toggle_item(row["index"]))
+        self.canvas.tag_bind(text_id, "<Button-1>", lambda e, row=row: self._start_edit_item(row["index"]))
+        for item_id in (cb_id, text_id, timer_id):
+            self.canvas.tag_bind(item_id, "<Button-3>", lambda e, row=row: self._row_menu(e, row["index"]))
+        return row
+
+    def _ensure_editor(self):
+        # one inline editor for the whole list, created on first use
+        if self._editor is not None:
+            return self._editor
+
+        self._editor = self._skin(
+            tk.Entry(
                 self.root,                 # root is fine; it will be embedded into canvas
-                font=("Consolas", 14),
                 bd=0,
                 highlightthickness=1,
                 relief="solid",
-                bg="#ffffff",
-                insertbackground=PURPLE
-            )
-            entry_win_id = self.canvas.create_window(0, 0, anchor="nw", window=entry)
-            self.canvas.itemconfigure(entry_win_id, state="hidden")
+            ),
+            **self.ENTRY_ROLES,
+        )
+        self._editor_win_id = self.canvas.create_window(
+            0, 0, anchor="nw", window=self._editor, state="hidden", tags="list_entry",
+        )
+        if self._list_entry_w is not None:
+            self.canvas.itemconfigure(self._editor_win_id, width=self._list_entry_w)
 
-            item = {
-                "var": var,
-                "cb_id": cb_id,
-                "text_id": text_id,
-                "entry": entry,
-                "entry_win_id": entry_win_id,
-            }
-            self.canvas_items.append(item)
+        self._editor.bind("<Return>", lambda e: self._finish_edit_item(self._edit_idx))
+        self._editor.bind("<FocusOut>", lambda e: self._finish_edit_item(self._edit_idx))
+        return self._editor
 
-            # bindings
-            self.canvas.tag_bind(cb_id, "<Button-1>", lambda e, idx=i: self._toggle_item(idx))
-            self.canvas.tag_bind(text_id, "<Button-1>", lambda e, idx=i: self._start_edit_item(idx))
+    def _ensure_row_pool(self, n: int):
+        # grow only; spare rows are hidden by _layout_canvas_list and reused on maximize
+        while len(self.canvas_items) < n:
+            self.canvas_items.append(self._make_row())
 
-            entry.bind("<Return>", lambda e, idx=i: self._finish_edit_item(idx))
-            entry.bind("<FocusOut>", lambda e, idx=i: self._finish_edit_item(idx))
+    def _rows_fit(self) -> int:
+        h = self.canvas.winfo_height()
+        if h < 10:
+            return self.page_rows
+        usable = h - self.list_start_y - self.list_bottom_pad
+        return max(1, int(usable // self.row_h))
+
+    def _total_rows(self, rows_fit: int) -> int:
+        if self._view_slots is not None:
+            return len(self._view_slots)  # filtered: matches only, no blank rows
+        # always draw at least a page of (empty) ruled rows
+        return max(self.tasks.span, rows_fit)
+
+    def _view_slot(self, pos: int) -> int:
+        # screen position -> task slot
+        return pos if self._view_slots is None else self._view_slots[pos]
+
+    def _view_pos(self, slot: int):
+        # task slot -> screen position (None if filtered out)
+        if self._view_slots is None:
+            return slot
+        i = bisect.bisect_left(self._view_slots, slot)
+        if i < len(self._view_slots) and self._view_slots[i] == slot:
+            return i
+        return None
 
-        # initial layout
-        self._layout_canvas_list()
+    def _max_scroll(self) -> float:
+        rows_fit = self._rows_fit()
+        return max(0, self._total_rows(rows_fit) - rows_fit) * self.row_h
 
     def _layout_canvas_list(self):
         if not self.canvas_items:
@@ -439,83 +820,1072 @@ class ChecklistUI:
         if w < 10:
             return
 
+        rows_fit = self._rows_fit()
+        self._ensure_row_pool(rows_fit + 1)  # +1 for the partial row while scrolling
+        total = self._total_rows(rows_fit)
+
+        max_scroll = self._max_scroll()
+        self._scroll_target = min(self._scroll_target, max_scroll)
+        self.scroll_y = min(self.scroll_y, max_scroll)
+
+        # epsilon: row-aligned targets like 33 * 35.6 must not floor to 32
+        first = int(self.scroll_y / self.row_h + 1e-6)
+        self._first_row = first
+
         x0 = self.list_padx
-        y0 = self.list_start_y
 
         cb_size = 24  
         text_x = x0 + cb_size + 14
         max_text_w = max(100, w - text_x - self.list_padx)
+        top_limit = self.list_start_y - self.row_h / 2
+
+        # Pool slot r always sits on screen line r, offset only by the
+        # sub-row scroll fraction; scrolling past a whole row rebinds content
+        # instead of moving items. So a vertical shift is one move() on the
+        # shared tag, and unchanged geometry costs no Tcl calls at all.
+        base_y = int(round(self.list_start_y - (self.scroll_y - first * self.row_h)))
+        geom_x = (x0, text_x, w - self.list_padx)
+
+        if geom_x != self._list_geom_x:
+            for r, item in enumerate(self.canvas_items):
+                self._place_row(item, r, base_y, geom_x)
+            self._list_geom_x = geom_x
+        else:
+            if base_y != self._list_base_y:
+                self.canvas.move("list_row", 0, base_y - self._list_base_y)
+            for r, item in enumerate(self.canvas_items):
+                if item["y"] is None:  # freshly pooled row
+                    self._place_row(item, r, base_y, geom_x)
+        self._list_base_y = base_y
+
+        if max_text_w != self._list_entry_w:
+            self.canvas.itemconfigure("list_entry", width=max_text_w)
+            self._list_entry_w = max_text_w
+        # rows bound below are cut to this width; rows already bound are refit after
+        refit = max_text_w != self._list_text_w
+        if refit:
+            self._list_text_w = max_text_w
+            self._timer_reserve = self.fitter.measure(self.theme.button_font, "0:00:00") + 12
+
+        # only the pooled (visible) rows are touched, however long the list is
+        for r, item in enumerate(self.canvas_items):
+            idx = first + r
+            if idx >= total or base_y + item["y"] < top_limit:
+                self._hide_row(item)
+            else:
+                self._bind_row(item, self._view_slot(idx))
+        if refit:
+            for item in self.canvas_items:
+                if item["index"] is not None:
+                    self._fit_row(item)
+
+        if self.timers:
+            self._watch_timers()
+
+    def _place_row(self, item, r: int, base_y: int, geom_x: tuple):
+        x0, text_x, right_x = geom_x
+        off = int(round(r * self.row_h))
+        y_line = base_y + off  # this is the ruled line Y
+        item["y"] = off
+
+        cb_y = y_line - (24 // 2) + self.cb_nudge_y
+        self.canvas.coords(item["cb_id"], x0, cb_y)
+
+        # keep text aligned to the same line
+        self.canvas.coords(item["text_id"], text_x, y_line - 10)   # adjust only if needed
+        self.canvas.coords(item["timer_id"], right_x, y_line - 8)
+
+    def _bind_row(self, item, idx: int):
+        if item["index"] == idx:
+            return
+        item["index"] = idx
+
+        task = self.tasks.get(idx)
+        text = task.text if task is not None else ""
+        img = self.checkbox_checked if task is not None and task.done else self.checkbox_unchecked
+        # matches are drawn in the accent colour while a filter is active
+        fill = self.theme.accent if self._view_slots is not None else self.theme.text
+        label = self.timers.label(task.id) if task is not None else ""
+        self.canvas.itemconfig(item["cb_id"], image=img, state="normal")
+        self.canvas.itemconfig(
+            item["text_id"], text=self._row_text(item, text, bool(label)), fill=fill, state="normal"
+        )
+        self._set_row_timer(item, label)
+
+    def _row_text(self, item, text: str, timed: bool) -> str:
+        # the timer readout takes the right end of the line when there is one
+        width = (self._list_text_w or 0) - (self._timer_reserve if timed else 0)
+        font = self.theme.item_font
+        item["fit"] = (text, font, width)
+        return self.fitter.fit(font, text, width) if width > 0 else text
+
+    def _fit_row(self, item):
+        """Re-cut a bound row's text if the width, font or timer changed since it was drawn."""
+        task = None if item["index"] in (None, STALE_ROW) else self.tasks.get(item["index"])
+        if task is None:
+            return
+        width = (self._list_text_w or 0) - (self._timer_reserve if item["timer"] else 0)
+        if item["fit"] == (task.text, self.theme.item_font, width):
+            return
+        self.canvas.itemconfigure(item["text_id"], text=self._row_text(item, task.text, bool(item["timer"])))
 
-        for i, item in enumerate(self.canvas_items):
-            y_line = int(round(self.list_start_y + i * self.row_h))  # this is the ruled line Y
+    def _hide_row(self, item):
+        if item["index"] is None:
+            return
+        item["index"] = None
+        self.canvas.itemconfig(item["cb_id"], state="hidden")
+        self.canvas.itemconfig(item["text_id"], state="hidden")
+        self._set_row_timer(item, "")
+
+    def _row_for(self, idx):
+        # pooled row currently showing task idx, if it is on screen
+        pos = self._view_pos(idx)
+        if pos is None:
+            return None
+        r = pos - self._first_row
+        if 0 <= r < len(self.canvas_items) and self.canvas_items[r]["index"] == idx:
+            return self.canvas_items[r]
+        return None
+
+    def _refresh_row(self, idx: int):
+        item = self._row_for(idx)
+        if item is not None:
+            item["index"] = STALE_ROW  # force a rebind
+            self._bind_row(item, idx)
+
+    # ---------- filter ----------
+    def _apply_filter(self):
+        query = self.filter_var.get().strip()
+        new_query = query != self._filter_query
+        if not new_query and not self._filter_stale:
+            return
+        self._filter_query = query
+        self._filter_stale = False
+
+        if self._edit_idx is not None:
+            self._finish_edit_item(self._edit_idx)
+        self._view_slots = self.search.search(query)
+
+        if new_query:
+            self.scroll_y = 0.0
+            self._scroll_target = 0.0
+        self._invalidate_rows()
+        self.scheduler.mark("list")
+
+    def _on_index_change(self):
+        # a task's text changed; matches may have too
+        if self._view_slots is not None:
+            self._filter_stale = True
+            self.scheduler.mark("filter")
+
+    # ---------- scrolling ----------
+    def _on_list_wheel(self, event):
+        if event.delta:
+            self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _scroll_rows(self, n: int):
+        self._scroll_to_y(self._scroll_target + n * self.row_h)
+
+    def _scroll_to_y(self, y: float):
+        # targets land on whole rows so text settles onto the ruled lines
+        y = round(y / self.row_h) * self.row_h
+        y = min(max(0.0, y), self._max_scroll())
+        if y == self._scroll_target:
+            return
+        if self._edit_idx is not None:
+            self._finish_edit_item(self._edit_idx)  # row is about to be recycled
+        self._scroll_target = y
+        self.scheduler.mark("scroll")
 
-            cb_y = y_line - (cb_size // 2) + self.cb_nudge_y
-            self.canvas.coords(item["cb_id"], x0, cb_y)
+    def _scroll_into_view(self, idx: int):
+        idx = self._view_pos(idx)
+        if idx is None:
+            return  # filtered out
+        rows_fit = self._rows_fit()
+        first = int(round(self._scroll_target / self.row_h))
+        if idx < first:
+            self._scroll_to_y(idx * self.row_h)
+        elif idx >= first + rows_fit:
+            self._scroll_to_y((idx - rows_fit + 1) * self.row_h)
+
+    def _step_scroll(self):
+        # ease toward the target, one step per frame
+        diff = self._scroll_target - self.scroll_y
+        if abs(diff) < 0.5:
+            self.scroll_y = self._scroll_target
+        else:
+            self.scroll_y += diff * 0.35
+            self.scheduler.mark("scroll")
+        self.scheduler.mark("list")
 
-            # keep text aligned to the same line
-            self.canvas.coords(item["text_id"], text_x, y_line - 10)   # adjust only if needed
-            self.canvas.coords(item["entry_win_id"], text_x, y_line - 12)
+    # ---------- bulk ----------
+    def _clear_completed(self):
+        if not self.tasks.done_count:
+            return
+        self._commit_pending_edit()
+
+        # one walk over the done set, one over the rows to close the gaps;
+        # the undo record is the removed tasks plus an int array, not a copy
+        removed = self.tasks.clear_completed()
+        start, olds = self.tasks.compact()
+        self.history.record_clear(removed, start, olds)
+        self._xp("clear", len(removed))
+
+        # pooled rows just rebind in the next frame; no items are created or deleted
+        self._invalidate_rows()
+        self.scheduler.mark("list")
+
+    # ---------- task timer ----------
+    def _set_row_timer(self, item, label: str):
+        if item["timer"] != label:
+            room_changed = bool(item["timer"]) != bool(label)
+            item["timer"] = label
+            self.canvas.itemconfigure(item["timer_id"], text=label)
+            if room_changed:
+                self._fit_row(item)  # a timer appeared / went away: text gets / gives up room
+
+    def _row_menu(self, event, idx):
+        task = None if idx in (None, STALE_ROW) else self.tasks.get(idx)
+        if task is None:
+            return
+        timer = self.timers.get(task.id)
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="Start Stopwatch", command=lambda: self._start_timer(task.id, None))
+        menu.add_command(label="Start Countdown...", command=lambda: self._ask_countdown(task.id))
+        if timer is not None:
+            menu.add_separator()
+            if timer.running:
+                menu.add_command(label="Pause Timer", command=lambda: self._timer_action("pause", task.id))
+            elif not timer.finished:
+                menu.add_command(label="Resume Timer", command=lambda: self._timer_action("resume", task.id))
+            menu.add_command(label="Stop Timer", command=lambda: self._timer_action("stop", task.id))
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def _ask_countdown(self, task_id: int):
+        minutes = simpledialog.askfloat(
+            "Countdown", "Minutes:", initialvalue=25, minvalue=0.1, maxvalue=24 * 60, parent=self.root
+        )
+        if minutes:
+            self._start_timer(task_id, minutes * 60)
 
-            # keep entry aligned with text, when shown
-            self.canvas.coords(item["entry_win_id"], text_x, y+4)
-            self.canvas.itemconfigure(item["entry_win_id"], width=max_text_w)
+    def _start_timer(self, task_id: int, seconds):
+        if seconds is None:
+            self.timers.start_stopwatch(task_id)
+        else:
+            self.timers.start_countdown(task_id, seconds)
+        self._timers_changed(task_id)
+
+    def _timer_action(self, action: str, task_id: int):
+        getattr(self.timers, action)(task_id)
+        self._timers_changed(task_id)
+
+    def _all_timers(self, action: str):
+        ids = [t.task_id for t in self.timers]
+        for tid in ids:
+            getattr(self.timers, action)(tid)
+        self._timers_changed(*ids)
+
+    def _timers_changed(self, *task_ids):
+        self._timer_dirty.update(task_ids)
+        self._watch_timers(force=True)
+        self.scheduler.mark("timers")
+        self._save_timers()
+
+    def _watch_timers(self, force: bool = False):
+        ids = []
+        for item in self.canvas_items:
+            if item["index"] not in (None, STALE_ROW):
+                task = self.tasks.get(item["index"])
+                if task is not None:
+                    ids.append(task.id)
+        if self.timers.watch(ids) or force:
+            self._schedule_timer_tick()
+
+    def _schedule_timer_tick(self):
+        if self._timer_after is not None:
+            self.root.after_cancel(self._timer_after)
+            self._timer_after = None
+        due = self.timers.next_due()
+        if due is not None:
+            delay = max(0, int((due - time.monotonic()) * 1000) + 1)
+            self._timer_after = self.root.after(delay, self._timer_tick)
+
+    def _timer_tick(self):
+        self._timer_after = None
+        changed, finished = self.timers.tick()
+        if changed:
+            self._timer_dirty |= changed
+            self.scheduler.mark("timers")
+        if finished:
+            live = [tid for tid in finished if self.tasks.by_id(tid) is not None]
+            for tid in finished:
+                if tid not in live:
+                    self.timers.stop(tid)  # its task was deleted meanwhile
+            if live:
+                self.root.bell()
+            self._save_timers()
+        self._schedule_timer_tick()
+
+    def _render_timers(self):
+        # one pass per frame over the timers whose shown value changed
+        dirty, self._timer_dirty = self._timer_dirty, set()
+        for tid in dirty:
+            task = self.tasks.by_id(tid)
+            item = self._row_for(task.slot) if task is not None else None
+            if item is not None:
+                self._set_row_timer(item, self.timers.label(tid))
+
+    def _save_timers(self):
+        key = self.workspace.active.key
+        if key is None:
+            return  # unsaved list: nothing to match timers back to later
+        lists = self._timer_state["lists"]
+        if self.timers:
+            lists[key] = self.timers.checkpoint(self.tasks)
+        elif lists.pop(key, None) is None:
+            return
+        try:
+            save_timer_state(TIMERS_PATH, self._timer_state)
+        except OSError:
+            pass  # timers still run; they just won't survive a restart
+
+    def _load_timers(self, state=None):
+        # state: a checkpoint kept while the list was in the background, else what's on disk
+        self.timers.clear()
+        key = self.workspace.active.key
+        if state is None and key is not None:
+            state = self._timer_state["lists"].get(key)
+        if state:
+            self.timers.restore(state, self.tasks)
+        self._schedule_timer_tick()
+
+    # ---------- XP ----------
+    def _xp(self, kind: str, n: int = 1):
+        # unsaved lists each need their own key, or they'd share one "finished" flag
+        entry = self.workspace.active
+        key = entry.key or "unsaved:" + entry.uid
+        unlocked = self.xp.record(kind, key, n)
+        if self._xp_after is None:
+            # one log append per burst, on the autosave writer
+            self._xp_after = self.root.after(self.autosave.interval_ms, self._flush_xp)
+        if unlocked:
+            self._toast("Sticker unlocked: " + ", ".join(unlocked))
+        if "progress" in self._xp_windows:
+            self._fill_progress_window()
+
+    def _flush_xp(self):
+        self._xp_after = None
+        self.autosave.write_later(self.xp, self.xp.checkpoint())
+
+    def _close_xp(self):
+        # after the writer is idle: the rest goes out here, as a snapshot
+        if self._xp_after is not None:
+            self.root.after_cancel(self._xp_after)
+            self._xp_after = None
+        self.xp.close()
+
+    def _toast(self, text: str, ms: int = 3000):
+        # small note at the bottom of the page, gone after a few seconds
+        c = self.canvas
+        x = c.winfo_width() // 2
+        y = max(0, c.winfo_height() - 28)
+        if self._toast_id is None:
+            self._toast_id = c.create_text(
+                x, y, text=text, anchor="s", fill=self.theme.accent,
+                font=self.theme.button_font, tags=("toast",),
+            )
+        else:
+            c.coords(self._toast_id, x, y)
+            c.itemconfigure(self._toast_id, text=text)
+        c.tag_raise(self._toast_id)
+        if self._toast_after is not None:
+            self.root.after_cancel(self._toast_after)
+        self._toast_after = self.root.after(ms, self._hide_toast)
+
+    def _hide_toast(self):
+        self._toast_after = None
+        if self._toast_id is not None:
+            self.canvas.delete(self._toast_id)
+            self._toast_id = None
+
+    def _xp_window(self, name: str, title: str):
+        """(window, created) -- one window per view, raised if already open."""
+        win = self._xp_windows.get(name)
+        if win is not None:
+            win.lift()
+            return win, False
+        win = self._skin(tk.Toplevel(self.root), bg="panel_bg")
+        win.title(title)
+        win.resizable(False, False)
+        win.protocol("WM_DELETE_WINDOW", lambda: self._close_xp_window(name))
+        self._xp_windows[name] = win
+        return win, True
+
+    def _close_xp_window(self, name: str):
+        win = self._xp_windows.pop(name, None)
+        if win is not None:
+            # drop its skinned widgets too, so theme switches don't touch dead windows
+            self._skinned = [(w, r) for w, r in self._skinned if w is not win and w.master is not win]
+            win.destroy()
+
+    def _open_progress_window(self):
+        win, created = self._xp_window("progress", "Progress")
+        if created:
+            self._progress_labels = {}
+            for key in ("level", "xp", "completed", "week", "lists", "streak"):
+                lbl = self._skin(tk.Label(win, anchor="w"), bg="panel_bg", fg="text", font="item_font")
+                lbl.pack(fill="x", padx=20, pady=2)
+                self._progress_labels[key] = lbl
+            self._progress_labels["level"].configure(font=self.theme.title_font)
+            self._progress_bar = ttk.Progressbar(win, orient="horizontal", length=300, maximum=100)
+            self._progress_bar.pack(fill="x", padx=20, pady=(4, 16))
+        self._fill_progress_window()
+
+    def _fill_progress_window(self):
+        # everything here is a running total; nothing is rescanned
+        st = self.xp.stats
+        level, lo, hi = self.xp.level()
+        lbl = self._progress_labels
+        lbl["level"].configure(text=f"Level {level}")
+        lbl["xp"].configure(text=f"{st['xp']} XP  ({hi - st['xp']} to level {level + 1})")
+        lbl["completed"].configure(text=f"Tasks completed: {st['tasks_completed']}  (+{XP_DONE} XP each)")
+        lbl["week"].configure(text=f"Completed in the last 7 days: {self.xp.completed_last(7)}")
+        lbl["lists"].configure(text=f"Lists finished: {st['lists_finished']}  (+{XP_LIST} XP each)")
+        lbl["streak"].configure(
+            text=f"Streak: {self.xp.current_streak()} days  (best {st['best_streak']})"
+        )
+        self._progress_bar["value"] = 100 * (st["xp"] - lo) / max(1, hi - lo)
+
+    def _open_stickers_window(self):
+        win, created = self._xp_window("stickers", "My Stickers")
+        if not created:
+            for child in list(win.children.values()):
+                child.destroy()
+        names = {"tasks_completed": "tasks completed", "lists_finished": "lists finished",
+                 "best_streak": "day streak", "tasks_added": "tasks added"}
+        for name, metric, threshold, at in self.xp.stickers():
+            got = at is not None
+            when = time.strftime("%Y-%m-%d", time.localtime(at)) if got else "locked"
+            row = tk.Label(
+                win,
+                text=f"{'★' if got else '☆'} {name:<16} {threshold} {names.get(metric, metric):<16} {when}",
+                anchor="w",
+                font=("Consolas", 12),
+                bg=self.theme.panel_bg,
+                fg=self.theme.accent if got else "gray50",
+            )
+            row.pack(fill="x", padx=20, pady=1)
 
+    # ---------- pin to desktop ----------
+    def _toggle_pin(self):
+        if self.pin is not None:
+            self.pin.close()
+            self.pin = None
+        else:
+            self.pin = PinWindow(
+                self.root, self.themes, self.fitter, self.tasks, self.theme,
+                on_toggle=self._toggle_item, on_close=self._pin_closed,
+            )
+        self.pin_var.set(self.pin is not None)
+
+    def _pin_closed(self):
+        self.pin = None
+        self.pin_var.set(False)
+
+    # ---------- undo ----------
+    def _undo(self):
+        self._replay(self.history.undo, self.history.undo_kind)
+
+    def _redo(self):
+        self._replay(self.history.redo, self.history.redo_kind)
+
+    def _replay(self, step, kind):
+        self._commit_pending_edit()
+        done_before, count_before = self.tasks.done_count, len(self.tasks)
+        self._replaying = True
+        try:
+            slot = step(self.tasks)
+            if self.title_var.get() != self.tasks.title:
+                self.title_var.set(self.tasks.title)
+        finally:
+            self._replaying = False
+        # undoing a check-off or an add gives its XP back (and redo earns it
+        # again); rows a Clear Completed or an edit brings back were paid for already
+        if kind == "toggle":
+            delta = self.tasks.done_count - done_before
+            if delta:
+                self._xp("done" if delta > 0 else "undone", abs(delta))
+        elif kind == "add":
+            delta = len(self.tasks) - count_before
+            if delta:
+                self._xp("add" if delta > 0 else "add_undone", abs(delta))
+        self._invalidate_rows()
+        self.scheduler.mark("list")
+        if slot is not None and self.tasks.get(slot) is not None:
+            self._scroll_into_view(slot)
+
+    # ---------- items ----------
     def _add_item_from_bar(self):
         text = self.new_item_var.get().strip()
         if not text:
             return
 
-        idx = self._first_empty_row()
-        if idx is None:
-            return  # no space left (could expand max_rows later)
+        # fills the first empty row, or appends
+        idx = self.tasks.add(text).slot
+        self.history.record_add(idx, text)
+        self._xp("add")
+        self._refresh_row(idx)  # may already show as an empty ruled row
+        self.scheduler.mark("list")
 
-        self.item_texts[idx] = text
-        self.canvas.itemconfig(self.canvas_items[idx]["text_id"], text=text)
         self.new_item_var.set("")
+        self._scroll_into_view(idx)
+
+    def _toggle_item(self, idx):
+        if idx is None or self.tasks.get(idx) is None:
+            return  # empty ruled row, nothing to check off
+        done = self.tasks.toggle(idx)
+        self.history.record_toggle(idx)
+        self._xp("done" if done else "undone")
+        if done and self.tasks.pending_count == 0:
+            self._xp("list_done")
+
+        item = self._row_for(idx)
+        if item is not None:
+            img = self.checkbox_checked if done else self.checkbox_unchecked
+            self.canvas.itemconfig(item["cb_id"], image=img)
+
+    def _start_edit_item(self, idx):
+        item = None if idx is None else self._row_for(idx)
+        if item is None:
+            return
+        if self._edit_idx is not None and self._edit_idx != idx:
+            self._finish_edit_item(self._edit_idx)
 
-    def _first_empty_row(self):
-        for i, t in enumerate(self.item_texts):
-            if not t.strip():
-                return i
-        return None
-
-    def _toggle_item(self, idx: int):
-        item = self.canvas_items[idx]
-        v = item["var"]
-        v.set(not v.get())
-
-        img = self.checkbox_checked if v.get() else self.checkbox_unchecked
-        self.canvas.itemconfig(item["cb_id"], image=img)
-
-    def _start_edit_item(self, idx: int):
-        item = self.canvas_items[idx]
-        current = self.canvas.itemcget(item["text_id"], "text")
+        task = self.tasks.get(idx)
+        current = task.text if task is not None else ""
 
-        ent = item["entry"]
+        ent = self._ensure_editor()
         ent.delete(0, "end")
         ent.insert(0, current)
 
-        self.canvas.itemconfigure(item["entry_win_id"], state="normal")
+        # move the shared editor onto this row's line
+        y_line = self._list_base_y + item["y"]
+        self.canvas.coords(self._editor_win_id, self._list_geom_x[1], y_line - 12)
+
+        self._edit_idx = idx
+        self.canvas.itemconfigure(self._editor_win_id, state="normal")
         ent.focus_set()
         ent.icursor("end")
 
-    def _finish_edit_item(self, idx: int):
-        item = self.canvas_items[idx]
-        ent = item["entry"]
+    def _finish_edit_item(self, idx):
+        if idx is None or idx != self._edit_idx:
+            return "break"  # e.g. <FocusOut> right after <Return>
+        self._edit_idx = None
+
+        new_text = self._editor.get()
+        self.canvas.itemconfigure(self._editor_win_id, state="hidden")
 
-        new_text = ent.get()
-        self.item_texts[idx] = new_text
-        self.canvas.itemconfig(item["text_id"], text=new_text)
+        # blank text empties the row; typing past the end grows the list
+        task = self.tasks.get(idx)
+        old_text, old_done = (task.text, task.done) if task is not None else ("", False)
+        self.tasks.put(idx, new_text)
+        self.history.record_edit(idx, old_text, new_text if new_text.strip() else "", old_done)
+        self._refresh_row(idx)
 
-        self.canvas.itemconfigure(item["entry_win_id"], state="hidden")
+        self.scheduler.mark("list")
         return "break"
 
 
+    # ---------- files ----------
+    def _new_list(self):
+        # opens next to the current list; a database backend puts it in the same file
+        if self._busy():
+            return
+        if isinstance(self.files, SqliteFileManager):
+            files = SqliteFileManager(path=self.files.path)
+        else:
+            files = FileManager()
+        self._open_entry(ListEntry(files=files, tasks=files.new()))
+
+    def _open_list(self):
+        if self._busy():
+            return
+        path = filedialog.askopenfilename(
+            title="Open List", filetypes=self._list_filetypes()
+        )
+        if not path:
+            return
+        list_id = None
+        if Path(path).suffix.lower() == DB_EXT:
+            try:
+                lists = SqliteFileManager().lists(path)
+            except sqlite3.Error as e:
+                messagebox.showerror("Open List", f"Could not open {path}:\n{e}")
+                return
+            list_id = self._pick_db_list(path, lists)
+            if list_id is None:
+                return
+        entry = self.workspace.find(path, list_id)
+        if entry is None:
+            entry = ListEntry(path, list_id=list_id)
+            if not self._load_entry(entry):
+                return
+        self._open_entry(entry)
+
+    def _pick_db_list(self, path, lists) -> int | None:
+        """Which list of a database to open; asks only when there is more than one."""
+        if len(lists) <= 1:
+            return lists[0][0] if lists else None
+        win = self._skin(tk.Toplevel(self.root), bg="panel_bg")
+        win.title(f"Open List - {Path(path).name}")
+        win.transient(self.root)
+        box = self._skin(
+            tk.Listbox(win, height=min(12, len(lists)), width=48, activestyle="none", bd=0),
+            bg="panel_bg", fg="text", font="item_font",
+        )
+        for _, title, _, n, done in lists:
+            box.insert("end", f"{title or 'Untitled'}  ({done}/{n})")
+        box.selection_set(0)
+        box.pack(fill="both", expand=True, padx=16, pady=(16, 8))
+        picked = []
+
+        def choose(event=None):
+            sel = box.curselection()
+            if sel:
+                picked.append(lists[sel[0]][0])
+            win.destroy()
+
+        box.bind("<Double-Button-1>", choose)
+        win.bind("<Return>", choose)
+        win.bind("<Escape>", lambda e: win.destroy())
+        self._skin(
+            tk.Button(win, text="Open", bd=0, padx=12, command=choose),
+            bg="accent", fg="on_accent", activebackground="accent", activeforeground="on_accent",
+        ).pack(pady=(0, 16))
+        win.grab_set()
+        box.focus_set()
+        self.root.wait_window(win)
+        self._skinned = [(w, r) for w, r in self._skinned if w is not win and w.master is not win]
+        return picked[0] if picked else None
+
+    def _close_list(self):
+        if self._busy() or not self._confirm_discard():
+            return
+        ws = self.workspace
+        entry = ws.active
+        ws.remove(entry)
+        entry.files.detach()
+        self._show_entry(self._next_loaded())
+
+    def _save_list(self):
+        if self.files.path is None:
+            return self._save_list_as()
+        self._commit_pending_edit()
+        try:
+            self.autosave.flush()
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Save", f"Could not save {self.files.path}:\n{e}")
+
+    def _save_list_as(self):
+        path = filedialog.asksaveasfilename(
+            title="Save List As",
+            defaultextension=LIST_EXT,
+            filetypes=self._list_filetypes(),
+        )
+        if not path:
+            return
+        self._commit_pending_edit()
+        files = self._files_for(path)
+        if files is not self.files:
+            # e.g. .cql -> .cqdb: the new backend takes over this list
+            files.attach(self.tasks)
+            self._use_files(files)
+        try:
+            self.autosave.flush(path)
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Save As", f"Could not save {path}:\n{e}")
+
+    # ---------- import ----------
+    def _import_tasks(self):
+        if self._import_job is not None or self._export_job is not None:
+            return  # one background job at a time
+        path = filedialog.askopenfilename(
+            title="Import Tasks",
+            filetypes=[
+                ("Task files", "*.txt *.md *.markdown *.csv *.jsonl *.ndjson *.json *.cql"),
+                ("All files", "*.*"),
+            ],
+        )
+        if not path:
+            return
+        try:
+            self._import_job = ImportJob(path).start()
+        except OSError as e:
+            messagebox.showerror("Import", f"Could not read {path}:\n{e}")
+            return
+
+        self._commit_pending_edit()
+        self.history.clear()  # imported rows land in the gaps older entries point at
+        # no per-item journal ops / autosaves while thousands of rows stream in
+        self.files.begin_bulk()
+        self.autosave.enabled = False
+        self._show_progress("Importing...", self._cancel_import)
+        self.root.after(IMPORT_TICK_MS, self._pump_import)
+
+    def _pump_import(self):
+        job = self._import_job
+        if job is None:
+            return
+
+        # insert batches until this tick's time budget is used up
+        deadline = time.perf_counter() + IMPORT_BUDGET_S
+        added = False
+        batch = []
+        while time.perf_counter() < deadline:
+            batch = job.take()
+            if not batch:
+                break
+            add = self.tasks.add
+            for text, done in batch:
+                add(text, done)
+            added = True
+
+        if added:
+            self.scheduler.mark("list")
+        self._set_progress(job.fraction, f"Importing... {job.imported:,} tasks")
+
+        if batch is None:
+            self._finish_import()
+        else:
+            self.root.after(IMPORT_TICK_MS, self._pump_import)
+
+    def _cancel_import(self):
+        if self._import_job is not None:
+            self._import_job.cancel()
+
+    def _finish_import(self):
+        job, self._import_job = self._import_job, None
+        self.files.end_bulk()
+        self.autosave.enabled = True
+        self.autosave.touch()
+        self._hide_progress()
+
+        if job.error is not None:
+            messagebox.showerror("Import", f"Import stopped after {job.imported:,} tasks:\n{job.error}")
+
+    # ---------- export ----------
+    def _export_tasks(self, which: str = "all"):
+        if self._import_job is not None or self._export_job is not None:
+            return  # one background job at a time
+        path = filedialog.asksaveasfilename(
+            title="Export Tasks",
+            defaultextension=".md",
+            filetypes=[
+                ("Markdown", "*.md"),
+                ("CSV", "*.csv"),
+                ("JSON lines", "*.jsonl"),
+                ("Plain text", "*.txt"),
+            ],
+        )
+        if not path:
+            return
+
+        self._commit_pending_edit()
+        self._export_job = ExportJob(path, self.title_var.get(), which=which).start()
+        self._export_cursor = 0
+        self._show_progress("Exporting...", self._cancel_export)
+        self.root.after(IMPORT_TICK_MS, self._pump_export)
+
+    def _pump_export(self):
+        # walk the list a chunk of slots at a time; the writer thread formats + writes
+        job = self._export_job
+        if job is None:
+            return
+
+        span = self.tasks.span
+        deadline = time.perf_counter() + IMPORT_BUDGET_S
+        while not job.done and not job.cancelled and time.perf_counter() < deadline:
+            if self._export_cursor >= span:
+                if job.offer(None):
+                    self._export_cursor = span + 1  # end marker sent
+                break
+            start = self._export_cursor
+            rows = [(t.text, t.done) for t in self.tasks.rows(start, start + CHUNK_ROWS)]
+            if not job.offer(rows):
+                break  # writer is behind, try next tick
+            self._export_cursor = start + CHUNK_ROWS
+
+        self._set_progress(min(1.0, self._export_cursor / max(1, span)), f"Exporting... {job.exported:,} tasks")
+
+        if job.done:
+            self._finish_export()
+        else:
+            self.root.after(IMPORT_TICK_MS, self._pump_export)
+
+    def _cancel_export(self):
+        if self._export_job is not None:
+            self._export_job.cancel()
+
+    def _finish_export(self):
+        job, self._export_job = self._export_job, None
+        self._hide_progress()
+        if job.error is not None:
+            messagebox.showerror("Export", f"Could not export to {job.path}:\n{job.error}")
+
+    # ---------- progress strip (import / export) ----------
+    def _show_progress(self, text: str, on_cancel):
+        if not hasattr(self, "progress_strip"):
+            self.progress_strip = self._skin(
+                tk.Frame(self.content, bd=0, highlightthickness=0), bg="panel_bg"
+            )
+            self.progress_label = self._skin(
+                tk.Label(self.progress_strip, text="", font=("Consolas", 10)),
+                bg="panel_bg", fg="accent",
+            )
+            self.progress_label.pack(side="left")
+            self.progress_bar = ttk.Progressbar(
+                self.progress_strip, orient="horizontal", mode="determinate", maximum=100
+            )
+            self.progress_bar.pack(side="left", fill="x", expand=True, padx=(8, 8))
+            self._skin(
+                tk.Button(
+                    self.progress_strip,
+                    text="Cancel",
+                    font=("Consolas", 10, "bold"),
+                    bd=0,
+                    padx=8,
+                    command=lambda: self._progress_cancel(),
+                ),
+                bg="accent", fg="on_accent", activebackground="accent", activeforeground="on_accent",
+            ).pack(side="left")
+        self._progress_cancel = on_cancel
+        self._set_progress(0.0, text)
+        self.progress_strip.pack(fill="x", padx=20, pady=(0, 10))
+
+    def _set_progress(self, fraction: float, text: str):
+        self.progress_bar["value"] = fraction * 100
+        self.progress_label.configure(text=text)
+
+    def _hide_progress(self):
+        self.progress_strip.pack_forget()
+
+    def _list_filetypes(self):
+        return [
+            ("Checklist Quest lists", "*" + LIST_EXT),
+            ("Checklist Quest database", "*" + DB_EXT),
+            ("All files", "*.*"),
+        ]
+
+    def _files_for(self, path, fresh: bool = False):
+        # storage backend by extension; reuse the current one if it matches
+        cls = SqliteFileManager if Path(path).suffix.lower() == DB_EXT else FileManager
+        if type(self.files) is cls and not fresh:
+            return self.files
+        return cls()
+
+    def _use_files(self, files):
+        if files is not self.files:
+            self.files.detach()
+        self.files = files
+        self.workspace.active.files = files
+        self.autosave.attach(files)
+
+    def _confirm_discard(self) -> bool:
+        if self.files.path is not None:
+            # list has a file: just write out what autosave hasn't yet
+            self._flush_autosave()
+            self._save_timers()
+            return True
+        if not self.files.dirty:
+            return True
+        return messagebox.askyesno("Unsaved changes", "Discard unsaved changes to this list?")
+
+    def _commit_pending_edit(self):
+        if self._edit_idx is not None:
+            self._finish_edit_item(self._edit_idx)
+
+    # ---------- workspace ----------
+    def _busy(self) -> bool:
+        # import / export stream into the active list, so it stays put until they finish
+        if self._import_job is not None or self._export_job is not None:
+            self.root.bell()
+            return True
+        return False
+
+    def _load_entry(self, entry) -> bool:
+        """Read a list that so far is only a path (first show, or File -> Open)."""
+        files = self._files_for(entry.path, fresh=True)
+        try:
+            if isinstance(files, SqliteFileManager):
+                entry.tasks = files.open(entry.path, entry.list_id)
+            else:
+                entry.tasks = files.open(entry.path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            messagebox.showerror("Open List", f"Could not open {entry.path}:\n{e}")
+            return False
+        entry.files = files
+        return True
+
+    def _open_entry(self, entry):
+        ws = self.workspace
+        prev = ws.active
+        if entry not in ws.entries:
+            ws.add(entry)
+        if not self._switch_to(entry):
+            return
+        # the blank list a session starts with is replaced, not left behind as a tab
+        if prev is not None and prev is not entry and self._pristine(prev):
+            ws.remove(prev)
+            prev.files.detach()
+
+    def _pristine(self, entry) -> bool:
+        return entry.path is None and len(entry.tasks) == 0 and not entry.files.dirty
+
+    def _switch_to(self, entry) -> bool:
+        ws = self.workspace
+        if entry is ws.active:
+            return True
+        if self._busy():
+            return False
+        if not entry.loaded and not self._load_entry(entry):
+            ws.remove(entry)
+            return False
+        self._stash_active()
+        self._show_entry(entry)
+        return True
+
+    def _step_list(self, n: int):
+        entry = self.workspace.step(n)
+        if entry is not None:
+            self._switch_to(entry)
+        return "break"  # Ctrl+Tab is not focus traversal here
+
+    def _next_loaded(self):
+        # after closing the active list: last one shown, else the first that still opens
+        ws = self.workspace
+        entry = ws.fallback()
+        while entry is not None and not entry.loaded and not self._load_entry(entry):
+            ws.remove(entry)
+            entry = ws.fallback()
+        if entry is None:
+            files = FileManager()
+            entry = ws.add(ListEntry(files=files, tasks=files.new()))
+        return entry
+
+    def _stash_active(self):
+        # everything the outgoing list needs to come back as it was
+        entry = self.workspace.active
+        self._flush_autosave()
+        self._save_timers()
+        entry.timers = self.timers.checkpoint(self.tasks) if self.timers else None
+        entry.view = {"scroll": self._scroll_target, "filter": self.filter_var.get()}
+        self.search.on_change = None
+
+    def _show_entry(self, entry):
+        # swap in another list; pooled rows are rebound, not rebuilt
+        self._commit_pending_edit()
+        if entry.index is None:
+            entry.index = TaskIndex(entry.tasks)  # evicted (or never built): rebuild now
+        if entry.history is None:
+            entry.history = UndoLog()
+        self.tasks = entry.tasks
+        self.files = entry.files
+        self.autosave.attach(entry.files)
+        self.search = entry.index
+        self.search.on_change = self._on_index_change
+        self.history = entry.history
+        if self.pin is not None:
+            self.pin.attach(entry.tasks)
+        self.workspace.touch(entry)  # may drop the caches of lists not shown in a while
+        self.title_var.set(entry.tasks.title)
+        self._load_timers(entry.timers)
+        entry.timers = None
+
+        # filter and scroll as they were when the list was last on screen
+        query = entry.view.get("filter", "")
+        self.filter_var.set(query)
+        self._filter_query = query.strip()
+        self._filter_stale = False
+        self._view_slots = self.search.search(self._filter_query)
+        self.scroll_y = self._scroll_target = min(entry.view.get("scroll", 0.0), self._max_scroll())
+        self._invalidate_rows()
+        self.scheduler.mark("list")
+
+    def _fill_lists_menu(self):
+        menu = self.lists_menu
+        menu.delete(0, "end")
+        ws = self.workspace
+        for i, entry in enumerate(ws):
+            label = entry.title if entry.path is None else f"{entry.title}  ({Path(entry.path).name})"
+            menu.add_radiobutton(
+                label=label,
+                variable=self.list_var,
+                value=i,
+                command=lambda e=entry: self._switch_to(e),
+            )
+            if entry is ws.active:
+                self.list_var.set(i)
+        menu.add_separator()
+        menu.add_command(label="Next List", accelerator="Ctrl+Tab", command=lambda: self._step_list(1))
+        menu.add_command(label="Previous List", accelerator="Ctrl+Shift+Tab", command=lambda: self._step_list(-1))
+
+    def _restore_workspace(self):
+        # lists open last time come back as paths; only the one on screen is read now
+        state = load_workspace_state(WORKSPACE_PATH)
+        ws = self.workspace
+        wanted = None
+        active = state.get("active")
+        for path, list_id in state.get("lists", ()):
+            if Path(path).exists() and ws.find(path, list_id) is None:
+                entry = ws.add(ListEntry(path, list_id=list_id), at_end=True)
+                if [path, list_id] == active:
+                    wanted = entry
+        candidates = [e for e in ws if not e.loaded]
+        if wanted is not None:
+            candidates.insert(0, wanted)
+        for entry in candidates:
+            if entry in ws.entries:
+                self._open_entry(entry)
+                if ws.active is entry:
+                    break
+
+    def _save_workspace(self):
+        try:
+            save_workspace_state(WORKSPACE_PATH, self.workspace.state())
+        except OSError:
+            pass  # the lists themselves are saved; only the tab set is lost
+
+    def _invalidate_rows(self):
+        # pooled rows rebind (or hide) on the next layout
+        for item in self.canvas_items:
+            if item["index"] is not None:
+                item["index"] = STALE_ROW
+
+    def _on_title_change(self):
+        old = self.tasks.title
+        self.tasks.title = self.title_var.get()
+        if not self._replaying:
+            self.history.record_title(old, self.tasks.title)  # keystrokes merge in UndoLog
+
+    def _flush_autosave(self):
+        self._commit_pending_edit()
+        try:
+            self.autosave.flush()
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Autosave", f"Could not save {self.files.path}:\n{e}")
+
     # ---------- events ----------
     def _on_resize(self, event):
         if event.widget is self.root:
-            self._render_tabbar()
-            self._render_backgrounds()
+            self.scheduler.mark("tabbar")
+
+    def _on_canvas_resize(self, event):
+        # keep content frame stretched (cheap, do it right away)
+        self.canvas.itemconfigure(self.content_window_id, width=event.width)
+
+        # only redraw background when the canvas is actually a real size
+        if event.width > 10 and event.height > 10:
+            self.scheduler.mark("background", "header", "list")
 
     def _start_move(self, event):
         self._drag_data["x"] = event.x
@@ -578,7 +1948,29 @@ class ChecklistUI:
                 self.root.geometry(self._original_geom)
             self._is_maximized = False
 
+    def _exit(self):
+        self._flush_autosave()
+        self._save_timers()
+        self._save_workspace()
+        self._close_xp()
+        self.root.quit()
+
     def _close(self):
+        self._hide_perf_overlay()
+        if self.pin is not None:
+            self.pin.close()
+        self.themes.cancel()
+        self._save_timers()
+        self._save_workspace()
+        if self._timer_after is not None:
+            self.root.after_cancel(self._timer_after)
+        self._cancel_import()
+        self._cancel_export()
+        self._flush_autosave()
+        self.autosave.stop()
+        self._close_xp()
+        self.scheduler.cancel()
+        self.resampler.shutdown()
         self.root.destroy()
 
     def _todo(self):
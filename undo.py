@@ -0,0 +1,184 @@
+# undo.py
+# Undo / redo as a log of small deltas against a TaskList (no Tk in here)
+
+import time
+from collections import deque
+
+MAX_BYTES = 16 * 1024 * 1024  # rough cap on what the log keeps alive
+MAX_ENTRIES = 2000
+MERGE_S = 1.5                 # edits to the same row closer than this undo as one step
+
+_ENTRY_BYTES = 96   # one _Cmd with its small fields
+_TASK_BYTES = 120   # a removed Task kept for restore, minus its text
+
+
+class _Cmd:
+    __slots__ = ("kind", "slot", "old", "new", "extra", "size", "at")
+
+    def __init__(self, kind, slot=None, old=None, new=None, extra=None, size=_ENTRY_BYTES):
+        self.kind = kind
+        self.slot = slot
+        self.old = old
+        self.new = new
+        self.extra = extra
+        self.size = size
+        self.at = time.monotonic()
+
+
+def _text_bytes(*texts) -> int:
+    return sum(len(t) for t in texts if t)
+
+
+class UndoLog:
+    """Undo and redo stacks of deltas, never list snapshots.
+
+      add      slot, text            undo removes the row, redo puts the text back
+      edit     slot, old -> new      extra = old done flag (a blank edit deletes the row)
+      toggle   slot                  its own inverse
+      clear    removed tasks + (start, olds) from TaskList.compact()
+      title    old -> new
+
+    Consecutive edits of the same row (or the title) within MERGE_S collapse
+    into one entry. The oldest entries are dropped once the log goes over
+    max_bytes / max_entries; the newest one is always kept.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, max_entries: int = MAX_ENTRIES,
+                 merge_s: float = MERGE_S):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.merge_s = merge_s
+        self._undo: deque[_Cmd] = deque()
+        self._redo: list[_Cmd] = []
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def undo_kind(self) -> str | None:
+        return self._undo[-1].kind if self._undo else None
+
+    @property
+    def redo_kind(self) -> str | None:
+        return self._redo[-1].kind if self._redo else None
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes_used = 0
+
+    def trim(self, max_bytes: int):
+        """Drop the oldest undo entries until at most max_bytes are kept (the newest always stays)."""
+        while len(self._undo) > 1 and self.bytes_used > max_bytes:
+            self.bytes_used -= self._undo.popleft().size
+
+    # ---------- recording ----------
+    def record_add(self, slot: int, text: str):
+        self._push(_Cmd("add", slot, None, text, size=_ENTRY_BYTES + _text_bytes(text)))
+
+    def record_edit(self, slot: int, old: str, new: str, old_done: bool = False):
+        if old == new:
+            return
+        if self._merge("edit", slot, new):
+            return
+        self._push(_Cmd("edit", slot, old, new, old_done, _ENTRY_BYTES + _text_bytes(old, new)))
+
+    def record_toggle(self, slot: int):
+        top = self._undo[-1] if self._undo else None
+        if top is not None and top.kind == "toggle" and top.slot == slot and not self._redo:
+            # toggled straight back: the two cancel out
+            self._pop_top()
+            return
+        self._push(_Cmd("toggle", slot))
+
+    def record_clear(self, removed: list, start: int, olds):
+        size = (_ENTRY_BYTES + olds.itemsize * len(olds)
+                + sum(_TASK_BYTES + len(t.text) for t in removed))
+        self._push(_Cmd("clear", None, removed, None, (start, olds), size))
+
+    def record_title(self, old: str, new: str):
+        if old == new or self._merge("title", None, new):
+            return
+        self._push(_Cmd("title", None, old, new, size=_ENTRY_BYTES + _text_bytes(old, new)))
+
+    # ---------- replay ----------
+    def undo(self, tasks):
+        """Revert the newest entry; returns the slot it touched (None for title / bulk)."""
+        if not self._undo:
+            return None
+        cmd = self._pop_top()
+        k = cmd.kind
+        if k == "add":
+            if tasks.get(cmd.slot) is not None:
+                tasks.remove(cmd.slot)
+        elif k == "edit":
+            tasks.put(cmd.slot, cmd.old)
+            if cmd.extra and tasks.get(cmd.slot) is not None:
+                tasks.set_done(cmd.slot, True)
+        elif k == "toggle":
+            if tasks.get(cmd.slot) is not None:
+                tasks.toggle(cmd.slot)
+        elif k == "clear":
+            start, olds = cmd.extra
+            tasks.restore(cmd.old, start, olds)
+        elif k == "title":
+            tasks.title = cmd.old
+        self._redo.append(cmd)
+        return cmd.slot
+
+    def redo(self, tasks):
+        if not self._redo:
+            return None
+        cmd = self._redo.pop()
+        k = cmd.kind
+        if k in ("add", "edit"):
+            tasks.put(cmd.slot, cmd.new)
+        elif k == "toggle":
+            if tasks.get(cmd.slot) is not None:
+                tasks.toggle(cmd.slot)
+        elif k == "clear":
+            cmd.old = tasks.clear_completed()
+            cmd.extra = tasks.compact()
+        elif k == "title":
+            tasks.title = cmd.new
+        self._push(cmd, keep_redo=True)
+        return cmd.slot
+
+    # ---------- internals ----------
+    def _merge(self, kind: str, slot, new: str) -> bool:
+        top = self._undo[-1] if self._undo else None
+        if (top is None or self._redo or top.kind != kind or top.slot != slot
+                or time.monotonic() - top.at > self.merge_s):
+            return False
+        self.bytes_used -= top.size
+        top.new = new
+        top.at = time.monotonic()
+        top.size = _ENTRY_BYTES + _text_bytes(top.old, new)
+        self.bytes_used += top.size
+        return True
+
+    def _push(self, cmd: _Cmd, keep_redo: bool = False):
+        if not keep_redo and self._redo:
+            self._redo.clear()
+        cmd.at = time.monotonic()
+        self._undo.append(cmd)
+        self.bytes_used += cmd.size
+        # oldest first, but never the entry just pushed
+        while len(self._undo) > 1 and (
+            self.bytes_used > self.max_bytes or len(self._undo) > self.max_entries
+        ):
+            self.bytes_used -= self._undo.popleft().size
+
+    def _pop_top(self) -> _Cmd:
+        cmd = self._undo.pop()
+        self.bytes_used -= cmd.size
+        return cmd
@@ -0,0 +1,191 @@
+# workspace.py
+# Lists open side by side (File -> Open Lists): tab order, lazy loading, LRU of per-list caches
+
+import secrets
+from pathlib import Path
+
+from file_manager import read_json, write_json
+from sqlite_store import DB_EXT
+
+STATE_VERSION = 2  # 2: lists are [path, list id] (a database holds several)
+CACHE_BUDGET = 64 * 1024 * 1024  # search indexes + undo logs kept for lists not on screen
+INDEX_BYTES_PER_TASK = 400       # rough: a task's token set plus its postings entries
+EVICTED_UNDO_BYTES = 256 * 1024  # undo history an evicted list keeps (newest entries)
+
+
+class ListEntry:
+    """One open list.
+
+    `files` / `tasks` are None until the list is first shown (lists restored
+    from a previous session are only paths until then). Under memory
+    pressure `index` is dropped (it is rebuilt on the next show) and
+    `history` is trimmed to its newest entries; `view` and `timers` are the
+    small bits of screen state that come back when the list does.
+    """
+
+    __slots__ = ("_path", "_list_id", "files", "tasks", "index", "history", "view", "timers", "uid")
+
+    def __init__(self, path=None, files=None, tasks=None, list_id=None):
+        self._path = Path(path) if path is not None else None
+        self._list_id = list_id  # which list of a database file
+        self.files = files
+        self.tasks = tasks
+        self.index = None     # TaskIndex
+        self.history = None   # UndoLog
+        self.view = {}        # scroll position, filter text
+        self.timers = None    # TaskTimer.checkpoint() while inactive
+        self.uid = secrets.token_hex(6)  # names the list while it has no file
+
+    @property
+    def loaded(self) -> bool:
+        return self.tasks is not None
+
+    @property
+    def path(self) -> Path | None:
+        # follows Save As once the list is loaded
+        return self.files.path if self.files is not None else self._path
+
+    @property
+    def list_id(self) -> int | None:
+        # a database list gets its id on first save
+        if self.files is not None:
+            return getattr(self.files, "list_id", None)
+        return self._list_id
+
+    @property
+    def key(self) -> str | None:
+        """Names the list in saved state (timers, XP); None while it has nowhere to come back from."""
+        path = self.path
+        if path is None:
+            return None
+        if path.suffix.lower() != DB_EXT:
+            return str(path)
+        list_id = self.list_id
+        return f"{path}#{list_id}" if list_id is not None else None
+
+    @property
+    def title(self) -> str:
+        if self.tasks is not None:
+            return self.tasks.title
+        return self._path.stem if self._path is not None else "Untitled"
+
+    def cache_bytes(self) -> int:
+        n = 0
+        if self.index is not None and self.tasks is not None:
+            n += len(self.tasks) * INDEX_BYTES_PER_TASK
+        if self.history is not None:
+            n += self.history.bytes_used
+        return n
+
+    def drop_cache(self) -> int:
+        """Free what can be freed; returns roughly how many bytes that was."""
+        before = self.cache_bytes()
+        if self.index is not None:
+            self.index.on_change = None
+            self.index.detach()
+            self.index = None
+        if self.history is not None:
+            self.history.trim(EVICTED_UNDO_BYTES)  # undo can't be rebuilt, only shortened
+        return before - self.cache_bytes()
+
+
+class Workspace:
+    """Open lists in tab order plus a most-recently-shown order for eviction.
+
+    Only the active list has live widgets; the canvas rows are shared and
+    just get rebound on a switch. Inactive lists keep their TaskList, and
+    their caches stay warm until the total goes over `budget`, at which
+    point the least recently shown lists drop their search index (rebuilt
+    on next show) and keep only recent undo history.
+    """
+
+    def __init__(self, budget: int = CACHE_BUDGET):
+        self.budget = budget
+        self.entries: list[ListEntry] = []  # tab order
+        self.active: ListEntry | None = None
+        self._recent: list[ListEntry] = []  # least recently shown first
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def add(self, entry: ListEntry, at_end: bool = False) -> ListEntry:
+        # new tabs open next to the current one
+        if at_end or self.active not in self.entries:
+            self.entries.append(entry)
+        else:
+            self.entries.insert(self.entries.index(self.active) + 1, entry)
+        return entry
+
+    def remove(self, entry: ListEntry):
+        self.entries.remove(entry)
+        if entry in self._recent:
+            self._recent.remove(entry)
+        if entry is self.active:
+            self.active = None
+        entry.drop_cache()
+
+    def fallback(self) -> ListEntry | None:
+        """What to show after the active list goes away: the last one shown, else the first tab."""
+        if self._recent:
+            return self._recent[-1]
+        return self.entries[0] if self.entries else None
+
+    def find(self, path, list_id: int | None = None) -> ListEntry | None:
+        path = Path(path).resolve()
+        for entry in self.entries:
+            if (entry.path is not None and Path(entry.path).resolve() == path
+                    and entry.list_id == list_id):
+                return entry
+        return None
+
+    def step(self, n: int) -> ListEntry | None:
+        if not self.entries:
+            return None
+        at = self.entries.index(self.active) if self.active in self.entries else 0
+        return self.entries[(at + n) % len(self.entries)]
+
+    def touch(self, entry: ListEntry) -> list[ListEntry]:
+        """Make `entry` active; returns the lists whose caches were evicted to stay in budget."""
+        self.active = entry
+        if entry in self._recent:
+            self._recent.remove(entry)
+        self._recent.append(entry)
+        evicted = []
+        total = sum(e.cache_bytes() for e in self._recent)
+        for old in self._recent[:-1]:
+            if total <= self.budget:
+                break
+            freed = old.drop_cache()
+            if freed:
+                total -= freed
+                evicted.append(old)
+        return evicted
+
+    # ---------- session ----------
+    def state(self) -> dict:
+        # only lists with a file can come back; unsaved ones live as long as the window
+        lists = [[str(e.path), e.list_id] for e in self.entries if e.key is not None]
+        active = self.active
+        active = [str(active.path), active.list_id] if active is not None and active.key else None
+        return {"version": STATE_VERSION, "lists": lists, "active": active}
+
+
+def load_state(path) -> dict:
+    data = read_json(path)
+    if data is None:
+        return {"version": STATE_VERSION, "lists": [], "active": None}
+    if data.get("version") == 1:
+        # plain paths: one list per file
+        active = data.get("active")
+        return {"version": STATE_VERSION, "lists": [[p, None] for p in data.get("lists", ())],
+                "active": [active, None] if active else None}
+    if data.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "lists": [], "active": None}
+    return data
+
+
+def save_state(path, data: dict):
+    write_json(path, data)
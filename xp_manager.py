@@ -0,0 +1,233 @@
+# xp_manager.py
+# XP, lists finished, streaks and sticker unlocks, kept as running totals over an event log
+
+import datetime
+import json
+import math
+import time
+from pathlib import Path
+
+from file_manager import SavePlan, atomic_write
+
+SNAPSHOT_EVERY = 500   # events between snapshots (the log is cut back after each)
+DAILY_DAYS = 366       # per-day completion counts kept for the Progress view
+
+XP_ADD = 1
+XP_DONE = 10
+XP_LIST = 50
+
+# name, metric, threshold; checked only when that metric moves
+STICKERS = (
+    ("First Step", "tasks_completed", 1),
+    ("Busy Bee", "tasks_completed", 50),
+    ("Centurion", "tasks_completed", 100),
+    ("Task Titan", "tasks_completed", 1000),
+    ("List Slayer", "lists_finished", 1),
+    ("Serial Finisher", "lists_finished", 10),
+    ("Three in a Row", "best_streak", 3),
+    ("Week Warrior", "best_streak", 7),
+    ("Monthly Legend", "best_streak", 30),
+    ("Planner", "tasks_added", 100),
+)
+
+
+def level_for(xp: int) -> tuple[int, int, int]:
+    """(level, xp where it started, xp where the next one starts); level n starts at 100*(n-1)^2."""
+    level = math.isqrt(max(0, xp) // 100) + 1
+    return level, 100 * (level - 1) ** 2, 100 * level ** 2
+
+
+def _today() -> int:
+    return datetime.date.today().toordinal()
+
+
+class XPManager:
+    """Event-sourced progress: every event updates the totals in O(1) and is appended to a log.
+
+    Events (one JSON line each): add / add_undone, done / undone (with a
+    count), clear, list_done. The totals are snapshotted every
+    SNAPSHOT_EVERY events and the log is cut back, so start-up replays at
+    most that many lines no matter how many years of history the totals
+    cover. Lines carry a sequence number, so a crash between snapshot and
+    cut never counts twice.
+
+    record() only touches memory. Like FileManager, checkpoint() hands the
+    unwritten events over as a SavePlan on the Tk thread and write() does
+    the I/O, so the autosave writer thread can run it.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.snapshot_path = self.data_dir / "xp_snapshot.json"
+        self.log_path = self.data_dir / "xp_events.jsonl"
+        self.stats = self._blank()
+        self._by_metric: dict[str, list[tuple[int, str]]] = {}
+        for name, metric, threshold in STICKERS:
+            self._by_metric.setdefault(metric, []).append((threshold, name))
+        self._log = None          # writer thread only
+        self._pending: list[dict] = []
+        self._since_snapshot = 0  # events logged (or handed over) since the last snapshot
+        self._load()
+
+    @staticmethod
+    def _blank() -> dict:
+        return {
+            "seq": 0,
+            "xp": 0,
+            "tasks_added": 0,
+            "tasks_completed": 0,
+            "tasks_cleared": 0,
+            "lists_finished": 0,
+            "streak": 0,
+            "best_streak": 0,
+            "last_day": 0,
+            "daily": {},      # day ordinal (str, for JSON) -> completions
+            "stickers": {},   # name -> unix time unlocked
+            "finished": {},   # list key -> 1 while the list stays finished
+        }
+
+    # ---------- events ----------
+    def record(self, kind: str, list_key=None, n: int = 1) -> list[str]:
+        """Apply one event and queue it for the log; returns stickers it unlocked."""
+        event = {"seq": self.stats["seq"] + 1, "op": kind, "list": list_key, "n": n,
+                 "day": _today(), "at": round(time.time(), 1)}
+        unlocked = self._apply(event)
+        self._pending.append(event)
+        return unlocked
+
+    def _apply(self, ev: dict) -> list[str]:
+        st = self.stats
+        st["seq"] = ev["seq"]
+        kind, n, key = ev["op"], ev.get("n", 1), ev.get("list")
+        moved = []
+        if kind == "add":
+            st["tasks_added"] += n
+            st["xp"] += XP_ADD * n
+            if key is not None:
+                st["finished"].pop(str(key), None)  # new work reopens the list
+            moved.append("tasks_added")
+        elif kind == "add_undone":
+            # undoing an add takes its XP back, so add + Ctrl+Z can't farm it
+            st["tasks_added"] = max(0, st["tasks_added"] - n)
+            st["xp"] = max(0, st["xp"] - XP_ADD * n)
+        elif kind == "done":
+            st["tasks_completed"] += n
+            st["xp"] += XP_DONE * n
+            day = ev.get("day", _today())
+            daily = st["daily"]
+            daily[str(day)] = daily.get(str(day), 0) + n
+            if len(daily) > DAILY_DAYS:
+                del daily[min(daily, key=int)]  # at most once a day
+            if day != st["last_day"]:
+                st["streak"] = st["streak"] + 1 if day == st["last_day"] + 1 else 1
+                st["last_day"] = day
+                if st["streak"] > st["best_streak"]:
+                    st["best_streak"] = st["streak"]
+                    moved.append("best_streak")
+            moved.append("tasks_completed")
+        elif kind == "undone":
+            # un-checking takes the XP back, so toggling can't farm it
+            st["tasks_completed"] = max(0, st["tasks_completed"] - n)
+            st["xp"] = max(0, st["xp"] - XP_DONE * n)
+            day = str(ev.get("day", _today()))
+            if st["daily"].get(day):
+                st["daily"][day] = max(0, st["daily"][day] - n)
+        elif kind == "clear":
+            st["tasks_cleared"] += n
+        elif kind == "list_done":
+            if key is not None and str(key) not in st["finished"]:
+                st["finished"][str(key)] = 1
+                st["lists_finished"] += 1
+                st["xp"] += XP_LIST
+                moved.append("lists_finished")
+
+        unlocked = []
+        for metric in moved:
+            value = st[metric]
+            for threshold, name in self._by_metric.get(metric, ()):
+                if value >= threshold and name not in st["stickers"]:
+                    st["stickers"][name] = ev.get("at", time.time())
+                    unlocked.append(name)
+        return unlocked
+
+    # ---------- views ----------
+    def level(self) -> tuple[int, int, int]:
+        return level_for(self.stats["xp"])
+
+    def completed_last(self, days: int = 7) -> int:
+        today = _today()
+        daily = self.stats["daily"]
+        return sum(daily.get(str(today - i), 0) for i in range(days))
+
+    def current_streak(self) -> int:
+        # a streak survives today until the day is over
+        st = self.stats
+        return st["streak"] if _today() - st["last_day"] <= 1 else 0
+
+    def stickers(self) -> list[tuple[str, str, int, float | None]]:
+        """(name, metric, threshold, unlocked at or None) for every sticker."""
+        got = self.stats["stickers"]
+        return [(name, metric, threshold, got.get(name)) for name, metric, threshold in STICKERS]
+
+    # ---------- persistence ----------
+    def _load(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            self.stats.update(snap)
+        except (OSError, ValueError):
+            pass
+        # replay only what came after the snapshot
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ev = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    if ev.get("seq", 0) > self.stats["seq"]:
+                        self._apply(ev)
+                        self._since_snapshot += 1
+        except OSError:
+            pass
+
+    def checkpoint(self, snapshot: bool = False) -> SavePlan | None:
+        """Take what needs writing (Tk thread): the new events, or the totals once enough piled up."""
+        if not self._pending and not (snapshot and self._since_snapshot):
+            return None
+        events, self._pending = self._pending, []
+        self._since_snapshot += len(events)
+        if snapshot or self._since_snapshot >= SNAPSHOT_EVERY:
+            # serialized here: the totals keep changing on this thread
+            self._since_snapshot = 0
+            return SavePlan("snapshot", self.log_path, "xp",
+                            rows=json.dumps(self.stats, separators=(",", ":")))
+        return SavePlan("journal", self.log_path, "xp", ops=events)
+
+    def write(self, plan: SavePlan, fsync: bool = False):
+        """Do the I/O for a plan (any one thread at a time). Errors are swallowed: the totals still count."""
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            if plan.kind == "snapshot":
+                atomic_write(self.snapshot_path, [plan.rows], fsync=fsync)
+                if self._log is not None:
+                    self._log.close()
+                    self._log = None
+                # everything in the log is now inside the snapshot (seq guards a crash right here)
+                open(self.log_path, "w").close()
+                return
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8", newline="\n")
+            self._log.write("".join(json.dumps(ev, separators=(",", ":")) + "\n" for ev in plan.ops))
+            self._log.flush()
+        except OSError:
+            pass
+
+    def close(self):
+        """Write out everything left; call once nothing else is writing."""
+        plan = self.checkpoint(snapshot=True)
+        if plan is not None:
+            self.write(plan)
+        if self._log is not None:
+            self._log.close()
+            self._log = None